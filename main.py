@@ -16,4 +16,13 @@ if os.environ.get("WRANGLES_CUSTOM_FUNCTIONS"):
     functions = [getattr(module, method) for method in dir(module) if not method.startswith('_')]
 
 
-wrangles.recipe.run(os.environ["WRANGLES_RECIPE"], functions=functions)
\ No newline at end of file
+if os.environ.get("WRANGLES_WORKER"):
+    # Keep running and serve recipes sent to the worker
+    wrangles.worker.serve(
+        host=os.environ.get("WRANGLES_WORKER_HOST", "127.0.0.1"),
+        port=int(os.environ.get("WRANGLES_WORKER_PORT", 8080)),
+        socket_path=os.environ.get("WRANGLES_WORKER_SOCKET"),
+        functions=functions
+    )
+else:
+    wrangles.recipe.run(os.environ["WRANGLES_RECIPE"], functions=functions)
\ No newline at end of file
@@ -169,8 +169,9 @@ for wrangle in schema['wrangles']:
         "$ref": f"#/$defs/wrangles/commonProperties/if"
     }
 
-    if wrangle not in wrangles.config.where_not_implemented:
-        if wrangle in wrangles.config.where_overwrite_output:
+    capabilities = wrangles.capabilities.get(wrangle)
+    if capabilities.where != 'unsupported':
+        if capabilities.where == 'overwrite':
             wrangle_properties['where'] = {
                 "$ref": "#/$defs/wrangles/commonProperties/where_special"
             }
@@ -183,6 +184,11 @@ for wrangle in schema['wrangles']:
             "$ref": f"#/$defs/wrangles/commonProperties/where_params"
         }
 
+    if capabilities.supports_unique:
+        wrangle_properties["unique"] = {
+            "$ref": f"#/$defs/wrangles/commonProperties/unique"
+        }
+
 # Add common write properties
 for write in schema['write']:
     if "properties" in schema['write'][write]:
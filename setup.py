@@ -40,7 +40,11 @@ setup(
     keywords = ['data','wrangling'],
     install_requires = requirements,
     entry_points ={
-        'console_scripts': ['wrangles.recipe = wrangles.console:recipe']
+        'console_scripts': [
+            'wrangles.recipe = wrangles.console:recipe',
+            'wrangles.worker = wrangles.console:worker',
+            'wrangles.run_many = wrangles.console:run_many'
+        ]
     },
     project_urls = {
         'Bug Tracker': 'https://github.com/wrangleworks/WranglesPy/issues',
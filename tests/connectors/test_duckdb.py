@@ -70,3 +70,38 @@ def test_run(tmp_path):
     )
 
     assert df.equals(df_copy)
+
+
+def test_read_needed_columns(tmp_path):
+    database = tmp_path / 'projection.duckdb'
+    duckdb.write(
+        df=pd.DataFrame({'Col1': ['Data1', 'Data2'], 'Col 2': ['a', 'b']}),
+        database=str(database),
+        table='test_table'
+    )
+
+    df = duckdb.read(
+        database=str(database),
+        command='SELECT * FROM test_table WHERE Col1 = ?',
+        params=['Data2'],
+        needed_columns=['Col 2']
+    )
+
+    assert df.equals(pd.DataFrame({'Col 2': ['b']}))
+
+
+def test_read_row_filters(tmp_path):
+    database = tmp_path / 'filters.duckdb'
+    duckdb.write(
+        df=pd.DataFrame({'Col1': ['Data1', 'Data2', 'Data3'], 'Col2': [1, 2, 3]}),
+        database=str(database),
+        table='test_table'
+    )
+
+    df = duckdb.read(
+        database=str(database),
+        command='SELECT * FROM test_table',
+        row_filters=[('Col2', 'in', [2, 3]), ('Col1', 'in', ['Data3'])]
+    )
+
+    assert df['Col1'].tolist() == ['Data3']
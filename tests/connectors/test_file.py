@@ -1092,3 +1092,110 @@ class TestPathObjects:
         wrangles.connectors.file.write(df, dest)
         result = wrangles.connectors.file.read(dest)
         assert result['col1'][0] == 'a'
+
+
+class TestChunks:
+    """
+    Test reading and writing files in chunks
+    """
+    @pytest.mark.parametrize("extension", ["csv", "jsonl", "parquet"])
+    def test_round_trip(self, tmp_path, extension):
+        """
+        Test writing a file in chunks then reading it back in chunks
+        """
+        dest = tmp_path / f'out.{extension}'
+        writer = wrangles.connectors.file.chunk_writer(dest)
+        for start in range(0, 25, 10):
+            writer.write(_pd.DataFrame({
+                'col1': [f'a{i}' for i in range(start, min(start + 10, 25))]
+            }))
+        writer.close()
+
+        chunks = list(wrangles.connectors.file.read_chunks(dest, 8))
+        assert [len(x) for x in chunks] == [8, 8, 8, 1]
+        assert _pd.concat(chunks)['col1'].tolist() == [f'a{i}' for i in range(25)]
+
+    def test_write_inconsistent_columns(self, tmp_path):
+        """
+        Test that a chunk with columns that weren't in
+        the first chunk raises an error
+        """
+        writer = wrangles.connectors.file.chunk_writer(tmp_path / 'out.csv')
+        writer.write(_pd.DataFrame({'col1': ['a']}))
+        with pytest.raises(ValueError, match="not present in the first chunk"):
+            writer.write(_pd.DataFrame({'col1': ['b'], 'col2': ['c']}))
+
+    def test_unsupported(self):
+        """
+        Test that file types that can't be split into chunks
+        raise NotImplementedError
+        """
+        with pytest.raises(NotImplementedError):
+            next(wrangles.connectors.file.read_chunks('tests/samples/data.xlsx', 10))
+        with pytest.raises(NotImplementedError):
+            wrangles.connectors.file.chunk_writer('tests/temp/out.xlsx')
+
+
+class TestNeededColumns:
+    """
+    Test only reading the columns a recipe needs
+    """
+    @pytest.mark.parametrize("extension", ["csv", "xlsx", "parquet"])
+    def test_read(self, tmp_path, extension):
+        """
+        Test that other columns are not read
+        """
+        dest = tmp_path / f'data.{extension}'
+        wrangles.connectors.file.write(
+            _pd.DataFrame({'col1': ['a'], 'col2': ['b'], 'col3': ['c']}),
+            str(dest)
+        )
+        df = wrangles.connectors.file.read(str(dest), needed_columns=['col3', 'missing'])
+        assert df.to_dict('records') == [{'col3': 'c'}]
+
+    def test_read_keeps_requested_columns(self):
+        """
+        Test that columns requested directly are still read
+        """
+        df = wrangles.connectors.file.read(
+            'tests/samples/data.csv',
+            columns=['Find'],
+            needed_columns=['Replace']
+        )
+        assert df.columns.tolist() == ['Find']
+
+    def test_read_none_found(self):
+        """
+        Test that a column is kept to preserve the rows
+        if none of the needed columns exist
+        """
+        df = wrangles.connectors.file.read('tests/samples/data.csv', needed_columns=['missing'])
+        full = wrangles.connectors.file.read('tests/samples/data.csv')
+        assert df.columns.tolist() == ['Find']
+        assert len(df) == len(full)
+
+    @pytest.mark.parametrize("extension", ["csv", "parquet"])
+    def test_read_chunks(self, tmp_path, extension):
+        """
+        Test that other columns are not read in chunks
+        """
+        dest = tmp_path / f'data.{extension}'
+        wrangles.connectors.file.write(
+            _pd.DataFrame({'col1': ['a', 'b'], 'col2': ['c', 'd']}),
+            str(dest)
+        )
+        chunks = list(wrangles.connectors.file.read_chunks(dest, 1, needed_columns=['col2']))
+        assert [x.to_dict('records') for x in chunks] == [[{'col2': 'c'}], [{'col2': 'd'}]]
+
+    def test_read_row_filters_parquet(self, tmp_path):
+        """
+        Test that parquet files are filtered as they are read
+        and filters that don't match the column types are ignored
+        """
+        dest = tmp_path / 'data.parquet'
+        _pd.DataFrame({'col1': ['a', 'b', 'c'], 'col2': [1, 2, 3]}).to_parquet(dest)
+        df = wrangles.connectors.file.read(
+            str(dest),
+            row_filters=[('col1', 'in', ['a', 'c']), ('col2', 'in', ['3']), ('missing', 'in', ['x'])]
+        )
+        assert df['col1'].tolist() == ['a', 'c']
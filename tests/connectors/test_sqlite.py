@@ -58,3 +58,61 @@ def test_run():
 
     # assert that the two tables are the same
     assert df.equals(df_copy)
+
+def test_read_needed_columns():
+    """
+    Test that a SELECT only returns the needed columns
+    """
+    df = sqlite.read(
+        database = './tests/samples/test.db',
+        command = 'SELECT * from df_mock;',
+        needed_columns = ['Col2', 'Missing']
+    )
+    assert df.equals(pd.DataFrame({'Col2': [1, 2]}))
+
+def test_read_needed_columns_none_found():
+    """
+    Test that a column is kept to preserve
+    the rows if none of the needed columns exist
+    """
+    df = sqlite.read(
+        database = './tests/samples/test.db',
+        command = 'SELECT * from df_mock',
+        needed_columns = ['Missing']
+    )
+    assert df.equals(pd.DataFrame({'Col1': ['Data1', 'Data2']}))
+
+def test_read_needed_columns_not_select():
+    """
+    Test that commands not starting with SELECT are unchanged
+    """
+    df = sqlite.read(
+        database = './tests/samples/test.db',
+        command = 'WITH x AS (SELECT * FROM df_mock) SELECT * FROM x',
+        needed_columns = ['Col2']
+    )
+    assert list(df.columns) == ['Col1', 'Col2']
+
+def test_read_row_filters():
+    """
+    Test that rows are filtered by the database
+    """
+    df = sqlite.read(
+        database = './tests/samples/test.db',
+        command = 'SELECT * from df_mock WHERE Col2 > ?',
+        params = [0],
+        row_filters = [('Col1', 'in', ['Data2', 'Other'])],
+        needed_columns = ['Col2']
+    )
+    assert df.equals(pd.DataFrame({'Col2': [2]}))
+
+def test_read_row_filters_invalid():
+    """
+    Test that filters the database can't apply are ignored
+    """
+    df = sqlite.read(
+        database = './tests/samples/test.db',
+        command = 'SELECT * from df_mock',
+        row_filters = [('Missing', 'in', ['Data2'])]
+    )
+    assert len(df) == 2
@@ -0,0 +1,213 @@
+"""
+Test saving checkpoints and resuming recipes
+"""
+import os
+import pandas as pd
+import pytest
+import wrangles
+
+
+def _recipe(path, wrangles_filter=None):
+    return f"""
+    checkpoint:
+      path: {path}
+      {'wrangles: ' + wrangles_filter if wrangles_filter else ''}
+    wrangles:
+      - custom.step_one:
+          output: one
+      - custom.step_two:
+          output: two
+      - custom.step_three:
+          output: three
+    """
+
+
+def _functions(calls, fail=False):
+    def step_one(df, output):
+        calls.append('one')
+        df[output] = 1
+        return df
+
+    def step_two(df, output):
+        calls.append('two')
+        df[output] = 2
+        return df
+
+    def step_three(df, output):
+        calls.append('three')
+        if fail:
+            raise RuntimeError('transient error')
+        df[output] = 3
+        return df
+
+    return [step_one, step_two, step_three]
+
+
+def test_resume(tmp_path):
+    """
+    Test that a failed recipe resumes from the latest checkpoint
+    """
+    calls = []
+    with pytest.raises(RuntimeError, match='transient error'):
+        wrangles.recipe.run(
+            _recipe(tmp_path),
+            dataframe=pd.DataFrame({'col1': ['a', 'b']}),
+            functions=_functions(calls, fail=True)
+        )
+    assert calls == ['one', 'two', 'three']
+    assert len(os.listdir(tmp_path)) == 2
+
+    calls.clear()
+    df = wrangles.recipe.run(
+        _recipe(tmp_path),
+        dataframe=pd.DataFrame({'col1': ['a', 'b']}),
+        functions=_functions(calls),
+        resume=True
+    )
+    assert calls == ['three']
+    assert df.to_dict('records') == [
+        {'col1': 'a', 'one': 1, 'two': 2, 'three': 3},
+        {'col1': 'b', 'one': 1, 'two': 2, 'three': 3},
+    ]
+
+
+def test_no_resume(tmp_path):
+    """
+    Test that checkpoints are only used when resuming
+    and not used for different input data
+    """
+    calls = []
+    wrangles.recipe.run(
+        _recipe(tmp_path),
+        dataframe=pd.DataFrame({'col1': ['a']}),
+        functions=_functions(calls)
+    )
+    wrangles.recipe.run(
+        _recipe(tmp_path),
+        dataframe=pd.DataFrame({'col1': ['a']}),
+        functions=_functions(calls)
+    )
+    assert calls == ['one', 'two', 'three'] * 2
+
+    calls.clear()
+    wrangles.recipe.run(
+        _recipe(tmp_path),
+        dataframe=pd.DataFrame({'col1': ['b']}),
+        functions=_functions(calls),
+        resume=True
+    )
+    assert calls == ['one', 'two', 'three']
+
+    calls.clear()
+    wrangles.recipe.run(
+        _recipe(tmp_path),
+        dataframe=pd.DataFrame({'col1': ['b']}),
+        functions=_functions(calls),
+        resume=True
+    )
+    assert calls == []
+
+
+def test_selected_wrangles(tmp_path):
+    """
+    Test only saving after the selected wrangles
+    """
+    calls = []
+    with pytest.raises(RuntimeError):
+        wrangles.recipe.run(
+            _recipe(tmp_path, '[custom.step_one]'),
+            dataframe=pd.DataFrame({'col1': ['a']}),
+            functions=_functions(calls, fail=True)
+        )
+    assert len(os.listdir(tmp_path)) == 1
+
+    calls.clear()
+    wrangles.recipe.run(
+        _recipe(tmp_path, '[custom.step_one]'),
+        dataframe=pd.DataFrame({'col1': ['a']}),
+        functions=_functions(calls),
+        resume=True
+    )
+    assert calls == ['two', 'three']
+
+
+def test_batch(tmp_path):
+    """
+    Test that only the batches that failed are run again
+    """
+    calls = []
+    fail = {'value': True}
+
+    def step(df):
+        calls.append(df['col1'].tolist())
+        if fail['value'] and 'c' in df['col1'].tolist():
+            raise RuntimeError('transient error')
+        df['out'] = df['col1'].str.upper()
+        return df
+
+    recipe = f"""
+    checkpoint:
+      path: {tmp_path}
+      wrangles: [custom.step]
+    wrangles:
+      - batch:
+          batch_size: 2
+          wrangles:
+            - custom.step: {{}}
+    """
+    df = pd.DataFrame({'col1': ['a', 'b', 'c', 'd']})
+    with pytest.raises(RuntimeError):
+        wrangles.recipe.run(recipe, dataframe=df, functions=[step])
+    assert sorted(calls) == [['a', 'b'], ['c', 'd']]
+
+    calls.clear()
+    fail['value'] = False
+    result = wrangles.recipe.run(recipe, dataframe=df, functions=[step], resume=True)
+    assert calls == [['c', 'd']]
+    assert result['out'].tolist() == ['A', 'B', 'C', 'D']
+
+
+def test_batch_variables(tmp_path):
+    """
+    Test that batches saved with different
+    variables are not used when resuming
+    """
+    recipe = f"""
+    checkpoint:
+      path: {tmp_path}
+    wrangles:
+      - batch:
+          batch_size: 2
+          wrangles:
+            - convert.case:
+                input: col1
+                output: out
+                case: upper
+                if: mode == 'upper'
+    """
+    df = pd.DataFrame({'col1': ['a', 'b', 'c']})
+    result = wrangles.recipe.run(recipe, dataframe=df, variables={'mode': 'upper'})
+    assert result['out'].tolist() == ['A', 'B', 'C']
+
+    result = wrangles.recipe.run(recipe, dataframe=df, variables={'mode': 'lower'}, resume=True)
+    assert 'out' not in result.columns
+
+
+def test_streaming(tmp_path):
+    """
+    Test that checkpoints can't be used with streaming
+    """
+    with pytest.raises(ValueError, match='not supported with streaming'):
+        wrangles.recipe.run(
+            f"""
+            checkpoint:
+              path: {tmp_path}
+            streaming:
+              chunk_size: 10
+            wrangles:
+              - convert.case:
+                  input: col1
+                  case: upper
+            """,
+            dataframe=pd.DataFrame({'col1': ['a']})
+        )
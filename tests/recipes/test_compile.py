@@ -0,0 +1,155 @@
+"""
+Test compiled recipes that can be run repeatedly
+without reloading the recipe
+"""
+import wrangles
+import pandas as pd
+import pytest
+
+
+def test_compile_run():
+    """
+    Test that a compiled recipe can be run
+    """
+    plan = wrangles.recipe.compile("""
+    wrangles:
+      - convert.case:
+          input: col1
+          output: out1
+          case: upper
+    """)
+    df = plan.run(dataframe=pd.DataFrame({'col1': ['hello world']}))
+    assert df['out1'][0] == 'HELLO WORLD'
+
+
+def test_compile_run_repeatedly():
+    """
+    Test that a compiled recipe gives the same
+    result when run multiple times
+    """
+    plan = wrangles.recipe.compile("""
+    wrangles:
+      - convert.case:
+          input: col1
+          output: out1
+          case: upper
+          where: col2 > 1
+    """)
+    for _ in range(3):
+        df = plan.run(dataframe=pd.DataFrame({
+            'col1': ['a', 'b', 'c'],
+            'col2': [1, 2, 3]
+        }))
+        assert df['out1'].tolist() == ['', 'B', 'C']
+
+
+def test_compile_variables_change():
+    """
+    Test that changing the variables between runs
+    is reflected in the result
+    """
+    plan = wrangles.recipe.compile("""
+    wrangles:
+      - convert.case:
+          input: ${column}
+          output: out
+          case: ${case}
+    """)
+    data = pd.DataFrame({'col1': ['Hello'], 'col2': ['World']})
+
+    df = plan.run(dataframe=data.copy(), variables={'column': 'col1', 'case': 'upper'})
+    assert df['out'][0] == 'HELLO'
+
+    df = plan.run(dataframe=data.copy(), variables={'column': 'col2', 'case': 'lower'})
+    assert df['out'][0] == 'world'
+
+    df = plan.run(dataframe=data.copy(), variables={'column': 'col1', 'case': 'upper'})
+    assert df['out'][0] == 'HELLO'
+    assert len(plan._cache) == 2
+
+
+def test_compile_nested_variables_change():
+    """
+    Test that a change to a variable that is only referenced
+    by another variable is detected
+    """
+    plan = wrangles.recipe.compile("""
+    wrangles:
+      - convert.case:
+          input: col1
+          output: ${output}
+          case: upper
+    """)
+    data = pd.DataFrame({'col1': ['Hello']})
+
+    df = plan.run(dataframe=data.copy(), variables={'output': 'out_${suffix}', 'suffix': 'a'})
+    assert df.columns.tolist() == ['col1', 'out_a']
+
+    df = plan.run(dataframe=data.copy(), variables={'output': 'out_${suffix}', 'suffix': 'b'})
+    assert df.columns.tolist() == ['col1', 'out_b']
+
+
+def test_compile_missing_variable():
+    """
+    Test that a missing variable raises an error when run
+    """
+    plan = wrangles.recipe.compile("""
+    wrangles:
+      - convert.case:
+          input: ${column}
+          output: out
+          case: upper
+    """)
+    with pytest.raises(ValueError, match="Variable \\${column} was not found"):
+        plan.run(dataframe=pd.DataFrame({'col1': ['Hello']}))
+
+
+def test_compile_custom_function():
+    """
+    Test that a compiled recipe can use custom functions
+    """
+    def add_one(col1):
+        return col1 + 1
+
+    plan = wrangles.recipe.compile(
+        """
+        wrangles:
+          - custom.add_one:
+              input: col1
+              output: out1
+        """,
+        functions=add_one
+    )
+    for _ in range(2):
+        df = plan.run(dataframe=pd.DataFrame({'col1': [1, 2]}))
+        assert df['out1'].tolist() == [2, 3]
+
+
+def test_compile_from_file():
+    """
+    Test compiling a recipe from a file
+    """
+    plan = wrangles.recipe.compile('tests/samples/recipe_sample.wrgl.yaml')
+    for _ in range(2):
+        df = plan.run(variables={'inputFile': 'tests/samples/data.csv'})
+        assert df.columns.tolist() == ['ID', 'Find2']
+        assert df['ID'][0] == 1
+
+
+def test_compile_unhashable_variable():
+    """
+    Test that a variable that can't be used as a cache key
+    still runs correctly, without being cached
+    """
+    plan = wrangles.recipe.compile("""
+    wrangles:
+      - create.column:
+          output: out
+          value: value ${value}
+    """)
+    df = plan.run(
+        dataframe=pd.DataFrame({'col1': [1]}),
+        variables={'value': {1}}
+    )
+    assert df['out'][0] == 'value {1}'
+    assert len(plan._cache) == 0
@@ -1782,4 +1782,60 @@ def test_complete_error_reporting_flow():
                     case: title
             """,
             functions=batch_error
-        )
\ No newline at end of file
+        )
+def test_stock_functions_with_custom_functions():
+    """
+    Test that stock connectors and wrangles are still
+    found when custom functions are also provided
+    """
+    def func(header1):
+        return header1 + '!'
+
+    df = wrangles.recipe.run(
+        """
+        read:
+          - test:
+              rows: 2
+              values:
+                header1: value1
+        wrangles:
+          - convert.case:
+              input: header1
+              case: upper
+          - custom.func:
+              output: header2
+        """,
+        functions=func
+    )
+    assert df['header2'].tolist() == ['VALUE1!', 'VALUE1!']
+
+    with pytest.raises(ValueError, match="does_not_exist not recognized"):
+        wrangles.recipe.run(
+            """
+            read:
+              - does_not_exist: {}
+            """,
+            functions=func
+        )
+
+def test_function_redefined_between_runs():
+    """
+    Test that a custom function redefined with the same
+    name but different arguments uses the new arguments
+    """
+    recipe = """
+    wrangles:
+      - custom.func:
+          output: out
+    """
+    data = pd.DataFrame({'a': ['x'], 'b': ['y']})
+
+    def func(a):
+        return a
+    df = wrangles.recipe.run(recipe, dataframe=data.copy(), functions=func)
+    assert df['out'][0] == 'x'
+
+    def func(b):
+        return b
+    df = wrangles.recipe.run(recipe, dataframe=data.copy(), functions=func)
+    assert df['out'][0] == 'y'
@@ -0,0 +1,119 @@
+"""
+Test only processing new or changed rows
+"""
+import pandas as pd
+import pytest
+import wrangles
+
+
+@pytest.fixture(autouse=True)
+def row_local_function():
+    """
+    Declare that the custom function works row by row
+    """
+    wrangles.capabilities.register('custom.upper', wrangles.capabilities.Capabilities())
+    yield
+    wrangles.capabilities._REGISTRY.pop('custom.upper')
+
+
+def _run(path, df, calls, extra=''):
+    def upper(df):
+        calls.extend(df['id'].tolist())
+        df['out'] = df['name'].str.upper()
+        return df
+
+    return wrangles.recipe.run(
+        f"""
+        incremental:
+          key: id
+          path: {path}
+        wrangles:
+          - custom.upper: {{}}
+        """ + extra,
+        dataframe=df,
+        functions=[upper]
+    )
+
+
+def test_incremental(tmp_path):
+    """
+    Test that only new and changed rows are processed
+    and the results are in the order of the input
+    """
+    calls = []
+    df = _run(tmp_path, pd.DataFrame({'id': [1, 2, 3], 'name': ['a', 'b', 'c']}), calls)
+    assert calls == [1, 2, 3]
+    assert df['out'].tolist() == ['A', 'B', 'C']
+
+    calls.clear()
+    df = _run(tmp_path, pd.DataFrame({'id': [4, 3, 1], 'name': ['d', 'c', 'z']}), calls)
+    assert calls == [4, 1]
+    assert df.to_dict('records') == [
+        {'id': 4, 'name': 'd', 'out': 'D'},
+        {'id': 3, 'name': 'c', 'out': 'C'},
+        {'id': 1, 'name': 'z', 'out': 'Z'},
+    ]
+
+    calls.clear()
+    df = _run(tmp_path, pd.DataFrame({'id': [4, 3, 1], 'name': ['d', 'c', 'z']}), calls)
+    assert calls == []
+    assert df['out'].tolist() == ['D', 'C', 'Z']
+
+
+def test_recipe_changed(tmp_path):
+    """
+    Test that all rows are processed if the wrangles change
+    """
+    calls = []
+    df = pd.DataFrame({'id': [1, 2], 'name': ['a', 'b']})
+    _run(tmp_path, df, calls)
+    calls.clear()
+    _run(tmp_path, df, calls, extra="""
+          - convert.case:
+              input: name
+              case: upper
+    """)
+    assert calls == [1, 2]
+
+
+def test_whole_frame_wrangles(tmp_path):
+    """
+    Test that wrangles that need all rows run on the merged data
+    """
+    calls = []
+    extra = """
+          - sort:
+              by: out
+              ascending: false
+    """
+    _run(tmp_path, pd.DataFrame({'id': [1, 2], 'name': ['a', 'b']}), calls, extra)
+    calls.clear()
+    df = _run(tmp_path, pd.DataFrame({'id': [1, 2, 3], 'name': ['a', 'b', 'c']}), calls, extra)
+    assert calls == [3]
+    assert df['out'].tolist() == ['C', 'B', 'A']
+
+
+def test_filter(tmp_path):
+    """
+    Test wrangles that remove rows
+    """
+    recipe = f"""
+    incremental:
+      key: id
+      path: {tmp_path}
+    wrangles:
+      - filter:
+          input: name
+          not_equal: b
+    """
+    wrangles.recipe.run(recipe, dataframe=pd.DataFrame({'id': [1, 2], 'name': ['a', 'b']}))
+    df = wrangles.recipe.run(recipe, dataframe=pd.DataFrame({'id': [1, 2, 3], 'name': ['a', 'b', 'c']}))
+    assert df['id'].tolist() == [1, 3]
+
+
+def test_key_not_unique(tmp_path):
+    """
+    Test that the key must be unique
+    """
+    with pytest.raises(ValueError, match='not unique'):
+        _run(tmp_path, pd.DataFrame({'id': [1, 1], 'name': ['a', 'b']}), [])
@@ -0,0 +1,210 @@
+"""
+Test running independent wrangles in parallel
+"""
+import threading
+import time
+import pandas as pd
+import wrangles
+from wrangles.capabilities import Capabilities
+import pytest
+
+
+@pytest.fixture
+def slow_functions():
+    """
+    Custom functions declared as row local that record
+    how many are running at the same time
+    """
+    state = {'running': 0, 'max': 0}
+    lock = threading.Lock()
+
+    def _slow(value):
+        with lock:
+            state['running'] += 1
+            state['max'] = max(state['max'], state['running'])
+        time.sleep(0.2)
+        with lock:
+            state['running'] -= 1
+        return value.upper()
+
+    def slow_a(col1):
+        return _slow(col1)
+
+    def slow_b(col2):
+        return _slow(col2)
+
+    def slow_c(col3):
+        return _slow(col3)
+
+    for name in ['slow_a', 'slow_b', 'slow_c']:
+        wrangles.capabilities.register(f'custom.{name}', Capabilities())
+    yield state, [slow_a, slow_b, slow_c]
+    for name in ['slow_a', 'slow_b', 'slow_c']:
+        wrangles.capabilities._REGISTRY.pop(f'custom.{name}')
+
+
+@pytest.mark.filterwarnings('error::pandas.errors.SettingWithCopyWarning')
+def test_parallel_independent(slow_functions):
+    """
+    Test that wrangles on different columns run at the same time
+    """
+    state, functions = slow_functions
+    df = wrangles.recipe.run(
+        """
+        parallel:
+          max_workers: 3
+        wrangles:
+          - custom.slow_a:
+              input: col1
+              output: out1
+          - custom.slow_b:
+              input: col2
+              output: out2
+          - custom.slow_c:
+              input: col3
+              output: out3
+        """,
+        dataframe=pd.DataFrame({'col1': ['a'], 'col2': ['b'], 'col3': ['c']}),
+        functions=functions
+    )
+    assert state['max'] == 3
+    assert df.columns.tolist() == ['col1', 'col2', 'col3', 'out1', 'out2', 'out3']
+    assert df.iloc[0].tolist() == ['a', 'b', 'c', 'A', 'B', 'C']
+
+
+def test_parallel_max_workers(slow_functions):
+    """
+    Test that max_workers limits the number run at once
+    """
+    state, functions = slow_functions
+    wrangles.recipe.run(
+        """
+        parallel:
+          max_workers: 2
+        wrangles:
+          - custom.slow_a:
+              input: col1
+              output: out1
+          - custom.slow_b:
+              input: col2
+              output: out2
+          - custom.slow_c:
+              input: col3
+              output: out3
+        """,
+        dataframe=pd.DataFrame({'col1': ['a'], 'col2': ['b'], 'col3': ['c']}),
+        functions=functions
+    )
+    assert state['max'] == 2
+
+
+def test_parallel_dependent(slow_functions):
+    """
+    Test that a wrangle that reads the output
+    of another waits for it to finish
+    """
+    state, functions = slow_functions
+    df = wrangles.recipe.run(
+        """
+        parallel: {}
+        wrangles:
+          - custom.slow_a:
+              input: col1
+              output: col2
+          - custom.slow_b:
+              input: col2
+              output: out2
+        """,
+        dataframe=pd.DataFrame({'col1': ['a'], 'col2': ['b']}),
+        functions=functions
+    )
+    assert state['max'] == 1
+    assert df['out2'][0] == 'A'
+
+
+def test_parallel_same_result():
+    """
+    Test that a recipe gives the same result with and without parallel
+    """
+    recipe = """
+    wrangles:
+      - convert.case:
+          input: col1
+          output: out1
+          case: upper
+      - create.column:
+          output: new
+          value: x
+      - format.prefix:
+          input: col2
+          value: pre_
+      - split.text:
+          input: col3
+          output: [a, b]
+          char: ','
+      - sort:
+          by: col1
+      - merge.concatenate:
+          input: [out1, a]
+          output: joined
+          char: '-'
+      - convert.case:
+          input: col1
+          case: upper
+    """
+    data = pd.DataFrame({
+        'col1': ['b', 'a', None],
+        'col2': ['x', 'y', 'z'],
+        'col3': ['1,2', '3,4', '5,6']
+    })
+    expected = wrangles.recipe.run(recipe, dataframe=data.copy())
+    result = wrangles.recipe.run(recipe.replace("wrangles:", "parallel: {}\n    wrangles:", 1), dataframe=data.copy())
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_parallel_group():
+    """
+    Test how wrangles are grouped
+    """
+    group = wrangles.recipe._parallel_group(
+        [
+            {'convert.case': {'input': 'col1', 'output': 'out1'}},
+            {'convert.case': {'input': 'col2', 'output': 'out2'}},
+            {'convert.case': {'input': 'out1', 'output': 'out3'}},
+        ],
+        ['col1', 'col2']
+    )
+    assert len(group) == 2
+
+    # Wrangles using where need more than their input columns
+    group = wrangles.recipe._parallel_group(
+        [
+            {'convert.case': {'input': 'col1', 'output': 'out1', 'where': 'col2 = 1'}},
+            {'convert.case': {'input': 'col2', 'output': 'out2'}},
+        ],
+        ['col1', 'col2']
+    )
+    assert len(group) == 1
+
+
+def test_parallel_error():
+    """
+    Test that an error in a parallel wrangle
+    reports the correct wrangle
+    """
+    with pytest.raises(AttributeError, match="line 8"):
+        wrangles.recipe.run(
+            """
+            parallel: {}
+            wrangles:
+              - convert.case:
+                  input: col1
+                  output: out1
+                  case: upper
+              - convert.case:
+                  input: col2
+                  output: out2
+                  case: not_a_case
+            """,
+            dataframe=pd.DataFrame({'col1': ['a'], 'col2': ['b']})
+        )
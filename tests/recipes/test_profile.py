@@ -0,0 +1,190 @@
+"""
+Test profiling recipe runs
+"""
+import json
+import pandas as pd
+import wrangles
+import pytest
+
+
+def test_profile_steps():
+    """
+    Test that each wrangle and write is recorded
+    with the rows and columns in and out
+    """
+    profiler = wrangles.profiling.Profiler()
+    wrangles.recipe.run(
+        """
+        wrangles:
+          - convert.case:
+              input: col1
+              output: out1
+              case: upper
+          - filter:
+              input: col1
+              equal: a
+        write:
+          - dataframe:
+              columns: [out1]
+        """,
+        dataframe=pd.DataFrame({'col1': ['a', 'b', 'c']}),
+        profile=profiler
+    )
+    steps = profiler.report()['steps']
+    assert [(x['section'], x['name']) for x in steps] == [
+        ('recipe', 'recipe'),
+        ('wrangle', 'convert.case'),
+        ('wrangle', 'filter'),
+        ('write', 'dataframe'),
+    ]
+    assert steps[1]['index'] == 1
+    assert (steps[1]['columns_in'], steps[1]['columns_out']) == (1, 2)
+    assert (steps[2]['rows_in'], steps[2]['rows_out']) == (3, 1)
+    assert steps[3]['rows_in'] == 1
+    assert all(x['wall_time'] >= 0 and x['cpu_time'] >= 0 for x in steps)
+    assert all(x['peak_memory'] is not None for x in steps)
+    assert steps[0]['memory_out'] > 0
+
+
+def test_profile_read():
+    """
+    Test that reads are recorded
+    """
+    profiler = wrangles.profiling.Profiler(trace_memory=False)
+    wrangles.recipe.run(
+        """
+        read:
+          - file:
+              name: tests/samples/data.csv
+        """,
+        profile=profiler
+    )
+    read = profiler.report()['steps'][1]
+    assert read['section'] == 'read'
+    assert read['name'] == 'file'
+    assert read['rows_out'] > 0
+    assert read['peak_memory'] is None
+
+
+def test_profile_nested():
+    """
+    Test that wrangles within nested recipes are
+    recorded as children of the wrangle that ran them
+    """
+    profiler = wrangles.profiling.Profiler()
+    wrangles.recipe.run(
+        """
+        wrangles:
+          - batch:
+              batch_size: 1
+              wrangles:
+                - convert.case:
+                    input: col1
+                    output: out1
+                    case: upper
+        """,
+        dataframe=pd.DataFrame({'col1': ['a', 'b']}),
+        profile=profiler
+    )
+    steps = {x['id']: x for x in profiler.report()['steps']}
+    batch = [x for x in steps.values() if x['name'] == 'batch'][0]
+    nested = [x for x in steps.values() if x['name'] == 'convert.case']
+    assert len(nested) == 2
+    for step in nested:
+        # convert.case -> recipe -> batch
+        assert steps[step['parent']]['parent'] == batch['id']
+        assert step['rows_in'] == 1
+
+
+def test_profile_error():
+    """
+    Test that a failing step is recorded with the error
+    """
+    profiler = wrangles.profiling.Profiler()
+    with pytest.raises(KeyError):
+        wrangles.recipe.run(
+            """
+            wrangles:
+              - convert.case:
+                  input: missing
+                  output: out1
+                  case: upper
+            """,
+            dataframe=pd.DataFrame({'col1': ['a']}),
+            profile=profiler
+        )
+    step = profiler.report()['steps'][1]
+    assert step['name'] == 'convert.case'
+    assert step['error'].startswith('KeyError')
+    assert step['rows_out'] is None
+
+
+def test_profile_file(tmp_path):
+    """
+    Test writing the report to a JSON file
+    """
+    path = tmp_path / 'profile.json'
+    df = wrangles.recipe.run(
+        """
+        wrangles:
+          - convert.case:
+              input: col1
+              output: out1
+              case: upper
+        """,
+        dataframe=pd.DataFrame({'col1': ['a']}),
+        profile=str(path)
+    )
+    assert df['out1'][0] == 'A'
+    report = json.loads(path.read_text())
+    assert report['total_time'] > 0
+    assert report['steps'][1]['name'] == 'convert.case'
+
+
+def test_profile_environment_variables(tmp_path, monkeypatch):
+    """
+    Test enabling profiling with environment variables
+    including writing a chrome trace
+    """
+    path = tmp_path / 'profile.json'
+    trace_path = tmp_path / 'trace.json'
+    monkeypatch.setenv('WRANGLES_PROFILE', str(path))
+    monkeypatch.setenv('WRANGLES_PROFILE_TRACE', str(trace_path))
+    wrangles.recipe.run(
+        """
+        wrangles:
+          - convert.case:
+              input: col1
+              output: out1
+              case: upper
+        """,
+        dataframe=pd.DataFrame({'col1': ['a']})
+    )
+    assert json.loads(path.read_text())['steps'][1]['name'] == 'convert.case'
+    events = json.loads(trace_path.read_text())['traceEvents']
+    assert [x['name'] for x in events] == ['recipe', 'convert.case']
+    assert all(x['ph'] == 'X' for x in events)
+
+
+def test_profile_disabled():
+    """
+    Test that nothing is recorded when not profiling
+    """
+    assert wrangles.profiling.active() is None
+    assert wrangles.profiling.start('wrangle', 'convert.case') is None
+
+
+def test_profile_compiled():
+    """
+    Test profiling a compiled recipe
+    """
+    profiler = wrangles.profiling.Profiler()
+    plan = wrangles.recipe.compile("""
+    wrangles:
+      - convert.case:
+          input: col1
+          output: out1
+          case: upper
+    """)
+    plan.run(dataframe=pd.DataFrame({'col1': ['a']}), profile=profiler)
+    assert [x['name'] for x in profiler.report()['steps']] == ['recipe', 'convert.case']
@@ -0,0 +1,388 @@
+"""
+Test reducing the rows and columns read to those the recipe needs
+"""
+import pandas as pd
+import yaml
+import wrangles
+from wrangles.recipe import _needed_columns
+
+
+def _recipe(recipe: str) -> dict:
+    return yaml.safe_load(recipe)
+
+
+def test_needed_columns_from_write_and_wrangles():
+    """
+    Test that the columns written and read by wrangles are needed
+    """
+    recipe = _recipe("""
+    wrangles:
+      - convert.case:
+          input: col1
+          output: out1
+          case: upper
+      - merge.concatenate:
+          input: [col2, col3]
+          output: out2
+          char: ' '
+    write:
+      - dataframe:
+          columns: [out1, out2, col4]
+          where: col5 = 'x'
+    """)
+    assert _needed_columns(recipe) == ['col1', 'col2', 'col3', 'col4', 'col5', 'out1', 'out2']
+
+
+def test_needed_columns_all():
+    """
+    Test that all columns are needed whenever
+    the columns used can't be known in advance
+    """
+    recipes = [
+        # No write section
+        "wrangles:\n  - convert.case:\n      input: col1\n      case: upper",
+        # Write without columns
+        "write:\n  - dataframe: {}",
+        # Wildcard in the write
+        "write:\n  - dataframe:\n      columns: [col*]",
+        # Wrangle that may read any column
+        "wrangles:\n  - sql:\n      command: SELECT * FROM df\nwrite:\n  - dataframe:\n      columns: [a]",
+        # Wildcard input
+        "wrangles:\n  - convert.case:\n      input: col*\n      case: upper\nwrite:\n  - dataframe:\n      columns: [a]",
+        # Condition that inspects the columns
+        "wrangles:\n  - convert.case:\n      input: a\n      case: upper\n      if: \"'b' in columns\"\nwrite:\n  - dataframe:\n      columns: [a]",
+        # Custom function
+        "wrangles:\n  - custom.fn:\n      output: a\nwrite:\n  - dataframe:\n      columns: [a]",
+    ]
+    for recipe in recipes:
+        assert _needed_columns(_recipe(recipe)) is None, recipe
+
+
+def test_projection_custom_read():
+    """
+    Test that a read function that accepts needed_columns
+    receives the columns used by the recipe
+    """
+    received = {}
+
+    def read(needed_columns=None):
+        received['needed_columns'] = needed_columns
+        return pd.DataFrame({'a': ['x'], 'b': ['y'], 'c': ['z']})
+
+    df = wrangles.recipe.run(
+        """
+        read:
+          - custom.read:
+              columns: [a, b, c]
+              where: c = 'z'
+        wrangles:
+          - convert.case:
+              input: a
+              output: a_upper
+              case: upper
+        write:
+          - dataframe:
+              columns: [a_upper]
+        """,
+        functions=[read]
+    )
+    assert received['needed_columns'] == ['a', 'a_upper', 'b', 'c']
+    assert df.to_dict('records') == [{'a_upper': 'X'}]
+
+
+def test_projection_csv(tmp_path):
+    """
+    Test that only the needed columns are read from a CSV file
+    and the result matches reading all of them
+    """
+    path = tmp_path / 'data.csv'
+    pd.DataFrame({
+        'a': ['x', 'y'],
+        'b': ['1', '2'],
+        'unused': ['u', 'v']
+    }).to_csv(path, index=False)
+
+    recipe = f"""
+    read:
+      - file:
+          name: {path}
+    wrangles:
+      - convert.case:
+          input: a
+          case: upper
+      - custom.check: {{}}
+    write:
+      - dataframe:
+          columns: [a]
+          where: b = '2'
+    """
+    columns_seen = []
+
+    def check(df):
+        columns_seen.extend(df.columns)
+        return df
+
+    df = wrangles.recipe.run(recipe, functions=[check])
+    # A custom function could use any column, so all are read
+    assert 'unused' in columns_seen
+    assert df.to_dict('records') == [{'a': 'Y'}]
+
+    columns_seen.clear()
+    wrangles.capabilities.register('custom.check', wrangles.capabilities.Capabilities(reads='none'))
+    try:
+        df = wrangles.recipe.run(recipe, functions=[check])
+    finally:
+        wrangles.capabilities._REGISTRY.pop('custom.check')
+    assert columns_seen == ['a', 'b']
+    assert df.to_dict('records') == [{'a': 'Y'}]
+
+
+def test_projection_case_insensitive_where(tmp_path):
+    """
+    Test that columns matched case-insensitively
+    by where are still read
+    """
+    path = tmp_path / 'data.csv'
+    pd.DataFrame({
+        'Price': [3, 10],
+        'name': ['x', 'y'],
+        'unused': ['u', 'v']
+    }).to_csv(path, index=False)
+
+    df = wrangles.recipe.run(
+        f"""
+        read:
+          - file:
+              name: {path}
+        wrangles:
+          - convert.case:
+              input: name
+              output: Upper
+              case: upper
+              where: price > 5
+        write:
+          - dataframe:
+              columns: [Upper]
+        """
+    )
+    assert df.to_dict('records') == [{'Upper': ''}, {'Upper': 'Y'}]
+
+
+def test_projection_case_insensitive_sqlite(tmp_path):
+    """
+    Test that a SELECT is not reduced if a needed
+    column only matches with different case
+    """
+    database = str(tmp_path / 'test.db')
+    wrangles.connectors.sqlite.write(
+        pd.DataFrame({'Price': [3, 10], 'name': ['x', 'y'], 'unused': ['u', 'v']}),
+        database=database,
+        table='data'
+    )
+    df = wrangles.recipe.run(
+        f"""
+        read:
+          - sqlite:
+              database: {database}
+              command: SELECT * FROM data
+        wrangles:
+          - convert.case:
+              input: name
+              output: Upper
+              case: upper
+              where: price > 5
+        write:
+          - dataframe:
+              columns: [Upper]
+        """
+    )
+    assert df.to_dict('records') == [{'Upper': ''}, {'Upper': 'Y'}]
+
+
+def test_projection_select_element(tmp_path):
+    """
+    Test that the column used by select.element is read
+    when it isn't the first column of the file
+    """
+    path = tmp_path / 'data.csv'
+    pd.DataFrame({
+        'first': ['a', 'b'],
+        'Col': ['["x", "y"]', '["z", "w"]'],
+        'unused': ['u', 'v']
+    }).to_csv(path, index=False)
+
+    df = wrangles.recipe.run(
+        f"""
+        read:
+          - file:
+              name: {path}
+        wrangles:
+          - select.element:
+              input: Col[1]
+              output: out
+        write:
+          - dataframe:
+              columns: [out]
+        """
+    )
+    assert df.to_dict('records') == [{'out': 'y'}, {'out': 'w'}]
+
+
+def test_projection_sqlite(tmp_path):
+    """
+    Test that a SELECT is reduced to the needed columns
+    """
+    database = str(tmp_path / 'test.db')
+    wrangles.connectors.sqlite.write(
+        pd.DataFrame({'a': ['x', 'y'], 'b': [1, 2], 'unused': ['u', 'v']}),
+        database=database,
+        table='data'
+    )
+    df = wrangles.recipe.run(
+        f"""
+        read:
+          - sqlite:
+              database: {database}
+              command: SELECT * FROM data
+        wrangles:
+          - convert.case:
+              input: a
+              case: upper
+        write:
+          - dataframe:
+              columns: [a, b]
+        """
+    )
+    assert df.to_dict('records') == [{'a': 'X', 'b': 1}, {'a': 'Y', 'b': 2}]
+
+
+def test_row_filters_from_leading_filters():
+    """
+    Test that filters at the start of the recipe are
+    used to filter rows and later wrangles are not
+    """
+    recipe = _recipe("""
+    wrangles:
+      - filter:
+          input: [a, b]
+          equal: x
+      - filter:
+          input: c
+          is_in: [1, 2]
+          where: d = 'y' AND e > 1
+      - filter:
+          input: f
+          not_equal: z
+      - convert.case:
+          input: g
+          case: upper
+      - filter:
+          input: h
+          equal: x
+    """)
+    assert wrangles.recipe._row_filters(recipe) == [
+        ('a', 'in', ['x']),
+        ('b', 'in', ['x']),
+        ('d', 'in', ['y']),
+        ('c', 'in', [1, 2]),
+    ]
+
+
+def test_row_filters_custom_read():
+    """
+    Test that a read function that accepts row_filters receives
+    filters from the read where and leading filter wrangles
+    """
+    received = {}
+
+    def read(row_filters=None):
+        received['row_filters'] = row_filters
+        return pd.DataFrame({'a': ['x', 'y', 'x'], 'b': ['1', '1', '2']})
+
+    df = wrangles.recipe.run(
+        """
+        read:
+          - custom.read:
+              where: b = '1'
+        wrangles:
+          - filter:
+              input: a
+              equal: x
+        """,
+        functions=[read]
+    )
+    assert received['row_filters'] == [('a', 'in', ['x']), ('b', 'in', ['1'])]
+    assert df.to_dict('records') == [{'a': 'x', 'b': '1'}]
+
+
+def test_row_filters_parquet(tmp_path):
+    """
+    Test that a parquet file is filtered as it is read,
+    giving the same result as filtering afterwards
+    """
+    path = tmp_path / 'data.parquet'
+    pd.DataFrame({
+        'a': ['x', 'y', None, 'x'],
+        'b': [1, 2, 3, 4]
+    }).to_parquet(path, row_group_size=1)
+
+    df = wrangles.recipe.run(
+        f"""
+        read:
+          - file:
+              name: {path}
+              where: b < 4
+        wrangles:
+          - filter:
+              input: a
+              equal: x
+          - filter:
+              input: b
+              equal: '1'
+        """
+    )
+    assert df.to_dict('records') == []
+
+    df = wrangles.recipe.run(
+        f"""
+        read:
+          - file:
+              name: {path}
+              where: b < 4
+        wrangles:
+          - filter:
+              input: a
+              equal: x
+        """
+    )
+    assert df.to_dict('records') == [{'a': 'x', 'b': 1}]
+
+
+def test_row_filters_sqlite(tmp_path):
+    """
+    Test that a SELECT is filtered at the source
+    """
+    database = str(tmp_path / 'test.db')
+    wrangles.connectors.sqlite.write(
+        pd.DataFrame({'a': ['x', 'y', '%'], 'b': [1, 2, 3]}),
+        database=database,
+        table='data'
+    )
+    df = wrangles.recipe.run(
+        f"""
+        read:
+          - sqlite:
+              database: {database}
+              command: SELECT * FROM data WHERE a LIKE '%' AND b > ?
+              params: [0]
+              where: a IN ('x', '%')
+        wrangles:
+          - filter:
+              input: b
+              equal: 3
+        write:
+          - dataframe:
+              columns: [a]
+        """
+    )
+    assert df.to_dict('records') == [{'a': '%'}]
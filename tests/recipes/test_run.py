@@ -5,6 +5,7 @@ Tests specific to an individual connector should go
 in a test file for the respective connectors
 e.g. tests/connectors/test_notifications.py
 """
+import copy
 import pathlib
 import pandas as pd
 import wrangles
@@ -183,3 +184,34 @@ def test_run_pure_posix_path():
     """
     df = wrangles.recipe.run(pathlib.PurePosixPath('tests/samples/recipe-basic.wrgl.yml'))
     assert list(df.columns) == ['header1', 'header2']
+
+
+def test_run_dict_not_modified():
+    """
+    Test that a recipe passed in as a dict
+    can be reused and isn't modified by running it
+    """
+    recipe = {
+        'read': [{'test': {'rows': 2, 'values': {'header1': '${value}'}}}],
+        'wrangles': [
+            {'python': {'command': 'header1 + "!"', 'output': 'header2'}},
+            {'convert.case': {'input': 'header2', 'case': 'upper'}}
+        ]
+    }
+    original = copy.deepcopy(recipe)
+    for value in ['a', 'b']:
+        df = wrangles.recipe.run(recipe, variables={'value': value})
+        assert list(df['header2']) == [f'{value.upper()}!'] * 2
+    assert recipe == original
+
+
+def test_run_dict_error_line():
+    """
+    Test that errors in a recipe passed in as
+    a dict still report the line of the wrangle
+    """
+    with pytest.raises(Exception, match=r"convert\.case \(line 7\)"):
+        wrangles.recipe.run({
+            'read': [{'test': {'rows': 1, 'values': {'header1': 'a'}}}],
+            'wrangles': [{'convert.case': {'input': 'missing', 'case': 'upper'}}]
+        })
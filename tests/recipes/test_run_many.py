@@ -0,0 +1,219 @@
+"""
+Test running many recipes from a manifest
+"""
+import json
+import wrangles
+import pytest
+
+
+_recipe = """
+read:
+  - test:
+      rows: ${rows}
+      values:
+        header1: value1
+write:
+  - file:
+      name: ${file}
+"""
+
+
+def test_run_many_processes(tmp_path):
+    """
+    Test running the same recipe with different
+    variables using a pool of processes
+    """
+    summary = wrangles.recipe.run_many(
+        {
+            'recipe': _recipe,
+            'jobs': [
+                {'name': f'job{i}', 'variables': {'rows': i, 'file': str(tmp_path / f'{i}.csv')}}
+                for i in range(1, 5)
+            ]
+        },
+        processes=2
+    )
+    assert list(summary['name']) == ['job1', 'job2', 'job3', 'job4']
+    assert list(summary['status']) == ['succeeded'] * 4
+    assert list(summary['rows']) == [1, 2, 3, 4]
+    for i in range(1, 5):
+        assert len(wrangles.recipe.run(f"read:\n  - file:\n      name: {tmp_path / f'{i}.csv'}")) == i
+
+
+def test_run_many_inline_functions():
+    """
+    Test running jobs in this process with custom functions
+    and that each job is reported as it finishes
+    """
+    def add(header1, value):
+        return header1 + value
+
+    reported = []
+    summary = wrangles.recipe.run_many(
+        [
+            {
+                'name': name,
+                'recipe': """
+                    read:
+                      - test:
+                          rows: 1
+                          values:
+                            header1: a
+                    wrangles:
+                      - custom.add:
+                          output: out
+                          value: ${value}
+                """,
+                'variables': {'value': name}
+            }
+            for name in ['x', 'y']
+        ],
+        processes=1,
+        functions=add,
+        on_result=reported.append
+    )
+    assert [r['name'] for r in reported] == ['x', 'y']
+    assert list(summary['status']) == ['succeeded', 'succeeded']
+
+
+def test_run_many_retries(tmp_path):
+    """
+    Test that failed jobs are retried and reported
+    """
+    attempts = []
+
+    def flaky(df):
+        attempts.append(True)
+        if len(attempts) < 2:
+            raise ValueError('Temporary failure')
+        return df
+
+    def broken(df):
+        raise ValueError('Permanent failure')
+
+    summary = wrangles.recipe.run_many(
+        {
+            'recipe': "read:\n  - test:\n      rows: 1\n      values:\n        header1: a\n",
+            'jobs': [
+                {'name': 'flaky', 'recipe': "wrangles:\n  - custom.flaky: {}\nread:\n  - test:\n      rows: 1\n      values:\n        header1: a\n"},
+                {'name': 'broken', 'recipe': "wrangles:\n  - custom.broken: {}\nread:\n  - test:\n      rows: 1\n      values:\n        header1: a\n"}
+            ]
+        },
+        processes=1,
+        functions=[flaky, broken],
+        retries=1,
+        report=str(tmp_path / 'report.json')
+    )
+    assert list(summary['status']) == ['succeeded', 'failed']
+    assert list(summary['attempts']) == [2, 2]
+    assert 'Permanent failure' in summary['error'][1]
+
+    with open(tmp_path / 'report.json') as f:
+        report = json.load(f)
+    assert [r['status'] for r in report] == ['succeeded', 'failed']
+
+
+def test_run_many_manifest_file(tmp_path):
+    """
+    Test reading the manifest from a file
+    """
+    manifest = tmp_path / 'manifest.yml'
+    manifest.write_text(
+        "recipe: |\n"
+        "  read:\n"
+        "    - test:\n"
+        "        rows: ${rows}\n"
+        "        values:\n"
+        "          header1: value1\n"
+        "jobs:\n"
+        "  - variables:\n"
+        "      rows: 3\n"
+    )
+    summary = wrangles.recipe.run_many(str(manifest), report=str(tmp_path / 'report.csv'))
+    assert summary['name'][0] == 'Job #1'
+    assert summary['rows'][0] == 3
+    assert (tmp_path / 'report.csv').exists()
+
+
+def test_run_many_invalid_manifest():
+    """
+    Test that a job without a recipe is rejected
+    """
+    with pytest.raises(ValueError, match='Job #1 in the manifest does not have a recipe'):
+        wrangles.recipe.run_many([{'variables': {}}])
+
+
+def test_run_many_process_exits(tmp_path):
+    """
+    Test that only the job that made its process exit
+    is reported as failed, not the others in the pool
+    """
+    functions = tmp_path / 'functions.py'
+    functions.write_text(
+        "import os\n"
+        "import time\n"
+        "def crash(df):\n"
+        "    time.sleep(0.2)\n"
+        "    os._exit(1)\n"
+        "def slow(df):\n"
+        "    time.sleep(1)\n"
+        "    return df\n"
+    )
+    recipe = "read:\n  - test:\n      rows: 1\n      values:\n        header1: a\nwrangles:\n  - custom.${fn}: {}\n"
+    summary = wrangles.recipe.run_many(
+        {
+            'recipe': recipe,
+            'jobs': [
+                {'name': name, 'variables': {'fn': name}}
+                for name in ['slow', 'crash', 'slow']
+            ]
+        },
+        processes=3,
+        functions=str(functions)
+    )
+    assert list(summary['status']) == ['succeeded', 'failed', 'succeeded']
+    assert list(summary['attempts']) == [1, 1, 1]
+    assert 'BrokenProcessPool' in summary['error'][1]
+
+
+def test_run_many_process_exits_limited(tmp_path, monkeypatch):
+    """
+    Test that after a process exits, the jobs are retried
+    without starting a process for every job still to run
+    """
+    executors = []
+
+    class ProcessPoolExecutor(wrangles.recipe._futures.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            executors.append(kwargs['max_workers'])
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(wrangles.recipe._futures, 'ProcessPoolExecutor', ProcessPoolExecutor)
+
+    functions = tmp_path / 'functions.py'
+    functions.write_text(
+        "import os\n"
+        "import time\n"
+        "def crash(df):\n"
+        "    time.sleep(0.2)\n"
+        "    os._exit(1)\n"
+        "def slow(df):\n"
+        "    time.sleep(0.5)\n"
+        "    return df\n"
+    )
+    recipe = "read:\n  - test:\n      rows: 1\n      values:\n        header1: a\nwrangles:\n  - custom.${fn}: {}\n"
+    names = ['crash'] + ['slow'] * 7
+    summary = wrangles.recipe.run_many(
+        {
+            'recipe': recipe,
+            'jobs': [
+                {'name': name, 'variables': {'fn': name}}
+                for name in names
+            ]
+        },
+        processes=2,
+        functions=str(functions)
+    )
+    assert list(summary['status']) == ['failed'] + ['succeeded'] * 7
+    # The pool, its replacement and one for each job that was running
+    assert len(executors) <= 4
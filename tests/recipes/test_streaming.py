@@ -0,0 +1,205 @@
+"""
+Test running recipes in streaming mode, where
+data is processed in chunks of rows
+"""
+import pandas as pd
+import wrangles
+import pytest
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / 'source.csv'
+    pd.DataFrame({
+        'col1': [f'value {i}' for i in range(25)],
+        'num': range(25)
+    }).to_csv(path, index=False)
+    return path
+
+
+def test_streaming_file(source, tmp_path, mocker):
+    """
+    Test that a file is read, wrangled and
+    written in chunks with the same result as a normal run
+    """
+    spy = mocker.spy(wrangles.recipe, '_execute_wrangles')
+    wrangles.recipe.run(
+        f"""
+        streaming:
+          chunk_size: 10
+        read:
+          - file:
+              name: {source}
+              where: num >= 3
+        wrangles:
+          - convert.case:
+              input: col1
+              output: out1
+              case: upper
+        write:
+          - file:
+              name: {tmp_path / 'out.csv'}
+          - file:
+              name: {tmp_path / 'out.parquet'}
+              columns: [out1]
+        """
+    )
+    assert [len(x.args[0]) for x in spy.call_args_list] == [7, 10, 5]
+
+    df = pd.read_csv(tmp_path / 'out.csv')
+    assert len(df) == 22
+    assert df['out1'].tolist()[:2] == ['VALUE 3', 'VALUE 4']
+    assert df.columns.tolist() == ['col1', 'num', 'out1']
+
+    df = pd.read_parquet(tmp_path / 'out.parquet')
+    assert df.columns.tolist() == ['out1']
+    assert df['out1'].tolist()[-1] == 'VALUE 24'
+
+
+def test_streaming_file_object(tmp_path):
+    """
+    Test streaming a file passed in as an object
+    """
+    wrangles.recipe.run(
+        f"""
+        streaming:
+          chunk_size: 2
+        read:
+          - file:
+              name: ${{file}}
+        write:
+          - file:
+              name: {tmp_path / 'out.csv'}
+        """,
+        variables={
+            "file": {
+                "name": "example.csv",
+                "mimeType": "text/csv",
+                "data": "Q29sMSxDb2wyCmEseApiLHkKYyx6Cg=="
+            }
+        }
+    )
+    df = pd.read_csv(tmp_path / 'out.csv')
+    assert df['Col1'].tolist() == ['a', 'b', 'c']
+
+
+def test_streaming_dataframe(source):
+    """
+    Test that a dataframe write combines the chunks
+    """
+    df = wrangles.recipe.run(
+        f"""
+        streaming:
+          chunk_size: 7
+        read:
+          - file:
+              name: {source}
+        wrangles:
+          - filter:
+              input: num
+              greater_than: 19
+        write:
+          - dataframe:
+              columns: [col1]
+        """
+    )
+    assert df['col1'].tolist() == [f'value {i}' for i in range(20, 25)]
+
+
+def test_streaming_input_dataframe():
+    """
+    Test streaming with a dataframe passed in
+    that is divided into chunks
+    """
+    df = wrangles.recipe.run(
+        """
+        streaming:
+          chunk_size: 2
+        wrangles:
+          - convert.case:
+              input: col1
+              output: out1
+              case: upper
+        """,
+        dataframe=pd.DataFrame({'col1': ['a', 'b', 'c']})
+    )
+    assert df['out1'].tolist() == ['A', 'B', 'C']
+
+
+def test_streaming_global_wrangle(source, tmp_path):
+    """
+    Test that wrangles that need all rows
+    run on the combined chunks
+    """
+    df = wrangles.recipe.run(
+        f"""
+        streaming:
+          chunk_size: 10
+        read:
+          - file:
+              name: {source}
+        wrangles:
+          - convert.case:
+              input: col1
+              output: out1
+              case: upper
+          - sort:
+              by: num
+              ascending: false
+          - create.index:
+              output: idx
+        write:
+          - file:
+              name: {tmp_path / 'out.csv'}
+          - dataframe: {{}}
+        """
+    )
+    assert df['num'].tolist()[:2] == [24, 23]
+    assert df['idx'].tolist() == list(range(1, 26))
+    assert pd.read_csv(tmp_path / 'out.csv')['out1'][0] == 'VALUE 24'
+
+
+def test_streaming_nested_global_wrangle():
+    """
+    Test that a global wrangle inside a batch is detected
+    """
+    assert not wrangles.capabilities.is_row_local(
+        'batch',
+        {'wrangles': [{'convert.case': {}}, {'select.group_by': {}}]},
+        {}
+    )
+    assert wrangles.capabilities.is_row_local(
+        'batch',
+        {'wrangles': [{'convert.case': {}}]},
+        {}
+    )
+
+
+def test_streaming_custom_function():
+    """
+    Test that row level custom functions are streamed
+    but those that use the whole dataframe are not
+    """
+    def row_func(col1):
+        return col1
+
+    def df_func(df):
+        return df
+
+    functions = {'row_func': row_func, 'df_func': df_func}
+    assert wrangles.capabilities.is_row_local('custom.row_func', {}, functions)
+    assert not wrangles.capabilities.is_row_local('custom.df_func', {}, functions)
+
+
+def test_streaming_invalid_chunk_size():
+    """
+    Test that an invalid chunk size raises an error
+    """
+    with pytest.raises(ValueError, match="chunk_size"):
+        wrangles.recipe.run(
+            """
+            streaming:
+              chunk_size: 0
+            """,
+            dataframe=pd.DataFrame({'col1': ['a']})
+        )
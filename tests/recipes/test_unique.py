@@ -0,0 +1,216 @@
+"""
+Test running wrangles on only the distinct values using unique
+"""
+import wrangles
+from wrangles.capabilities import Capabilities
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def pure():
+    """
+    Declare custom functions as pure for the duration of a test
+    """
+    names = []
+
+    def register(name):
+        wrangles.capabilities.register(f'custom.{name}', Capabilities())
+        names.append(f'custom.{name}')
+
+    yield register
+    for name in names:
+        wrangles.capabilities._REGISTRY.pop(name)
+
+
+def test_unique_custom_function(pure):
+    """
+    Test that a custom function is only called
+    once for each distinct value
+    """
+    pure('shout')
+    calls = []
+
+    def shout(col1):
+        calls.append(col1)
+        return col1 + '!'
+
+    df = wrangles.recipe.run(
+        """
+        wrangles:
+          - custom.shout:
+              input: col1
+              output: out
+              unique: true
+        """,
+        dataframe=pd.DataFrame({
+            'col1': ['a', 'b', 'a', 'a', 'b'],
+            'col2': [1, 2, 3, 4, 5]
+        }),
+        functions=shout
+    )
+    assert calls == ['a', 'b']
+    assert list(df['out']) == ['a!', 'b!', 'a!', 'a!', 'b!']
+    assert list(df['col2']) == [1, 2, 3, 4, 5]
+
+
+def test_unique_overwrite_input():
+    """
+    Test a wrangle that overwrites its input
+    """
+    df = wrangles.recipe.run(
+        """
+        wrangles:
+          - convert.case:
+              input: col1
+              case: upper
+              unique: true
+        """,
+        dataframe=pd.DataFrame({
+            'col1': ['a', 'b', 'a'],
+            'col2': ['x', 'y', 'z']
+        })
+    )
+    assert list(df['col1']) == ['A', 'B', 'A']
+    assert list(df.columns) == ['col1', 'col2']
+
+
+def test_unique_multiple_inputs():
+    """
+    Test that rows are only treated as the same
+    if all of the input columns match
+    """
+    df = wrangles.recipe.run(
+        """
+        wrangles:
+          - merge.concatenate:
+              input: [col1, col2]
+              output: out
+              char: '-'
+              unique: true
+        """,
+        dataframe=pd.DataFrame({
+            'col1': ['a', 'a', 'b', 'a'],
+            'col2': ['x', 'y', 'x', 'x'],
+            'col3': [1, 2, 3, 4]
+        })
+    )
+    assert list(df['out']) == ['a-x', 'a-y', 'b-x', 'a-x']
+
+
+def test_unique_with_where():
+    """
+    Test unique combined with where
+    """
+    df = wrangles.recipe.run(
+        """
+        wrangles:
+          - convert.case:
+              input: col1
+              output: out
+              case: upper
+              where: col2 > 1
+              unique: true
+        """,
+        dataframe=pd.DataFrame({
+            'col1': ['a', 'b', 'a', 'a'],
+            'col2': [1, 2, 3, 4]
+        })
+    )
+    assert list(df['out']) == ['', 'B', 'A', 'A']
+
+
+def test_unique_not_pure():
+    """
+    Test that unique is rejected for wrangles that may give
+    a different result each time, including custom functions
+    that haven't been declared pure
+    """
+    def shout(col1):
+        return col1 + '!'
+
+    with pytest.raises(NotImplementedError, match='Declare it as pure'):
+        wrangles.recipe.run(
+            """
+            wrangles:
+              - custom.shout:
+                  input: col1
+                  output: out
+                  unique: true
+            """,
+            dataframe=pd.DataFrame({'col1': ['a', 'b', 'a']}),
+            functions=shout
+        )
+
+    with pytest.raises(NotImplementedError, match='unique parameter is not implemented for python'):
+        wrangles.recipe.run(
+            """
+            wrangles:
+              - python:
+                  command: col1 * 2
+                  input: col1
+                  output: out
+                  unique: true
+            """,
+            dataframe=pd.DataFrame({'col1': ['a', 'b', 'a']})
+        )
+
+
+def test_unique_mixed_types(pure):
+    """
+    Test that values that are equal but of
+    different types are treated as distinct
+    """
+    pure('show')
+
+    def show(a):
+        return repr(a)
+
+    df = wrangles.recipe.run(
+        """
+        wrangles:
+          - custom.show:
+              input: a
+              output: out
+              unique: true
+        """,
+        dataframe=pd.DataFrame({'a': [1, True, 1.0, 1]}, dtype=object),
+        functions=show
+    )
+    assert list(df['out']) == ['1', 'True', '1.0', '1']
+
+
+def test_unique_unhashable_values():
+    """
+    Test that values that can't be compared
+    fall back to running on every row
+    """
+    df = wrangles.recipe.run(
+        """
+        wrangles:
+          - select.list_element:
+              input: col1
+              output: out
+              element: 0
+              unique: true
+        """,
+        dataframe=pd.DataFrame({'col1': [['a', 'b'], ['c'], ['a', 'b']]})
+    )
+    assert list(df['out']) == ['a', 'c', 'a']
+
+
+def test_unique_unsupported():
+    """
+    Test that unique is rejected for wrangles
+    that need all of the rows
+    """
+    with pytest.raises(NotImplementedError, match='unique parameter is not implemented for sort'):
+        wrangles.recipe.run(
+            """
+            wrangles:
+              - sort:
+                  by: col1
+                  unique: true
+            """,
+            dataframe=pd.DataFrame({'col1': ['b', 'a', 'b']})
+        )
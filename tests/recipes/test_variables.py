@@ -365,3 +365,132 @@ def test_variables_variable_overwrite():
         variables={'recipe_variables': 'This is a string'}
     )
     assert isinstance(df['vars'][0], dict)
+
+def test_environment_variable_in_variable(monkeypatch):
+    """
+    Test that an environment variable referenced
+    by the value of another variable is found
+    """
+    monkeypatch.setenv('WRANGLES_TEST_ENV', 'from env')
+    df = wrangles.recipe.run(
+        """
+        read:
+        - test:
+            rows: 1
+            values:
+                header: ${var}
+        """,
+        variables={'var': 'value ${WRANGLES_TEST_ENV}'}
+    )
+    assert df['header'][0] == 'value from env'
+
+def test_environment_variable_in_if(monkeypatch):
+    """
+    Test that environment variables can be used
+    by name within an if condition
+    """
+    monkeypatch.setenv('WRANGLES_TEST_ENV', 'yes')
+    df = wrangles.recipe.run(
+        """
+        read:
+        - test:
+            rows: 1
+            values:
+                header: value
+        wrangles:
+          - convert.case:
+              input: header
+              case: upper
+              if: WRANGLES_TEST_ENV == 'yes'
+        """
+    )
+    assert df['header'][0] == 'VALUE'
+
+def test_environment_variable_in_custom_variable(monkeypatch):
+    """
+    Test that a variable defined by a custom function
+    receives environment variables as arguments
+    """
+    monkeypatch.setenv('WRANGLES_TEST_TOKEN', 'secret')
+
+    def make(WRANGLES_TEST_TOKEN):
+        return f'token {WRANGLES_TEST_TOKEN}'
+
+    df = wrangles.recipe.run(
+        """
+        read:
+        - test:
+            rows: 1
+            values:
+                header: ${tok}
+        """,
+        variables={'tok': 'custom.make'},
+        functions=make
+    )
+    assert df['header'][0] == 'token secret'
+
+def test_unreferenced_environment_variables(monkeypatch):
+    """
+    Test that only the environment variables a
+    recipe references are added to its variables
+    """
+    monkeypatch.setenv('WRANGLES_TEST_USED', 'used')
+    monkeypatch.setenv('WRANGLES_TEST_UNUSED', 'unused')
+
+    def func(df):
+        return df
+
+    variables = wrangles.recipe._resolve_variables(
+        {},
+        {'func': func},
+        wrangles.recipe._environment_references({
+            'read': [{'test': {'rows': 1, 'values': {'header': '${WRANGLES_TEST_USED}'}}}],
+            'wrangles': [{'custom.func': {}}]
+        })
+    )
+    assert variables['WRANGLES_TEST_USED'] == 'used'
+    assert 'WRANGLES_TEST_UNUSED' not in variables
+
+def test_environment_variables_custom_function(monkeypatch):
+    """
+    Test that a custom function with a variables argument
+    can read environment variables the recipe doesn't reference
+    """
+    monkeypatch.setenv('WRANGLES_TEST_API_KEY', 'secret')
+
+    def func(df, variables):
+        df['key'] = variables['WRANGLES_TEST_API_KEY']
+        return df
+
+    df = wrangles.recipe.run(
+        """
+        read:
+        - test:
+            rows: 1
+            values:
+                header: value
+        wrangles:
+          - custom.func: {}
+        """,
+        functions=func
+    )
+    assert df['key'][0] == 'secret'
+
+def test_nested_variables_scoped():
+    """
+    Test that variables overridden at one level of the
+    recipe don't affect the levels outside of it
+    """
+    result = wrangles.utils.replace_templated_values(
+        {
+            'a': '${var}',
+            'b': {'variables': {'var': 'inner'}, 'c': '${var}'},
+            'd': '${var}'
+        },
+        {'var': 'outer'}
+    )
+    assert result == {
+        'a': 'outer',
+        'b': {'variables': {'var': 'inner'}, 'c': 'inner'},
+        'd': 'outer'
+    }
@@ -301,6 +301,61 @@ class TestWhere:
         )
 
 
+    def test_where_original_dataframe_unchanged(self):
+        """
+        Test that assigning results back to the rows
+        selected by where doesn't change the dataframe passed in
+        """
+        original = pd.DataFrame({
+            'col1': ['a', 'b', 'c'],
+            'col2': [1, 2, 3],
+            'col3': ['x', 'y', 'z']
+        })
+        df = wrangles.recipe.run(
+            """
+            wrangles:
+            - convert.case:
+                input: col1
+                case: upper
+                where: col2 > 1
+            - format.prefix:
+                input: col3
+                output: col4
+                value: _
+                where: col2 < 3
+            """,
+            dataframe=original
+        )
+        assert df['col1'].values.tolist() == ['a', 'B', 'C']
+        assert df['col4'].values.tolist() == ['_x', '_y', '']
+        assert df['col2'].values.tolist() == [1, 2, 3]
+        assert list(df.columns) == ['col1', 'col2', 'col3', 'col4']
+        assert original['col1'].values.tolist() == ['a', 'b', 'c']
+        assert list(original.columns) == ['col1', 'col2', 'col3']
+
+    def test_where_reads_other_columns(self):
+        """
+        Test where with a wrangle that reads columns
+        other than its input
+        """
+        df = wrangles.recipe.run(
+            """
+            wrangles:
+            - remove_words:
+                input: col1
+                to_remove: col2
+                output: out
+                where: col3 = 1
+            """,
+            dataframe=pd.DataFrame({
+                'col1': [['a', 'b'], ['a', 'b']],
+                'col2': [['a'], ['b']],
+                'col3': [1, 2]
+            })
+        )
+        assert df['out'].values.tolist() == ['b', '']
+
+
 class TestIf:
     """
     Test using if with wrangles
@@ -947,3 +1002,111 @@ class TestPositionInput:
             """
         )
         assert df.iloc[0].tolist() == ['value2', 'value1', 'value0']
+
+
+class TestNaNCleanup:
+    """
+    Test that NaN values are replaced after wrangles run
+    """
+    def test_untouched_columns(self):
+        """
+        Test that NaN values in columns a wrangle
+        doesn't use are still cleaned
+        """
+        df = wrangles.recipe.run(
+            """
+            wrangles:
+              - convert.case:
+                  input: col1
+                  output: out1
+                  case: upper
+              - convert.case:
+                  input: col1
+                  output: out2
+                  case: lower
+            """,
+            dataframe=pd.DataFrame({
+                'col1': ['a', 'b'],
+                'col2': [np.nan, 'x']
+            })
+        )
+        assert df['col2'].tolist() == ['', 'x']
+
+    def test_later_wrangle_output(self):
+        """
+        Test that NaN values created by a wrangle
+        after the first are cleaned
+        """
+        df = wrangles.recipe.run(
+            """
+            wrangles:
+              - convert.case:
+                  input: col1
+                  output: out1
+                  case: upper
+              - convert.case:
+                  input: col1
+                  output: out2
+                  case: lower
+                  where: col2 = 'x'
+            """,
+            dataframe=pd.DataFrame({
+                'col1': ['A', 'B'],
+                'col2': ['y', 'x']
+            })
+        )
+        assert df['out2'].tolist() == ['', 'b']
+
+    def test_undeclared_columns(self):
+        """
+        Test that NaN values in columns modified
+        by a wrangle without declaring them are cleaned
+        """
+        def blank(df):
+            df['col2'] = np.nan
+            return df
+
+        df = wrangles.recipe.run(
+            """
+            wrangles:
+              - convert.case:
+                  input: col1
+                  output: out1
+                  case: upper
+              - custom.blank: {}
+            """,
+            dataframe=pd.DataFrame({
+                'col1': ['a'],
+                'col2': ['b']
+            }),
+            functions=blank
+        )
+        assert df['col2'].tolist() == ['']
+
+    def test_deferred(self, monkeypatch):
+        """
+        Test that NaN cleanup can be deferred
+        until all wrangles have run
+        """
+        monkeypatch.setattr(wrangles.config, 'nan_cleanup', 'write')
+
+        df = wrangles.recipe.run(
+            """
+            wrangles:
+              - python:
+                  output: is_nan
+                  command: col2 != col2
+              - convert.case:
+                  input: col1
+                  output: out1
+                  case: upper
+                  where: col1 = 'b'
+            """,
+            dataframe=pd.DataFrame({
+                'col1': ['a', 'b'],
+                'col2': [np.nan, 'x']
+            })
+        )
+        assert df['is_nan'].tolist() == [True, False]
+        assert df['col2'].tolist() == ['', 'x']
+        assert df['out1'].tolist() == ['', 'B']
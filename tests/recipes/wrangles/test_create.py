@@ -1594,7 +1594,7 @@ class TestCreateEmbeddings:
             mock_response.json.return_value = {
                 "data": [{"embedding": [0.1] * 1024, "index": 0}]
             }
-            with patch("wrangles.openai._requests.post", return_value=mock_response):
+            with patch("wrangles.openai._http_request", return_value=mock_response):
                 df = wrangles.recipe.run(
                     """
                     wrangles:
@@ -1622,7 +1622,7 @@ class TestCreateEmbeddings:
         mock_response.json.return_value = {
             "data": [{"embedding": [0.1, 0.2, 0.3], "index": 0}]
         }
-        with patch("wrangles.openai._requests.post", return_value=mock_response) as mock_post:
+        with patch("wrangles.openai._http_request", return_value=mock_response) as mock_post:
             result = wrangles.openai.embeddings(
                 ["test text"],
                 api_key="fake-key",
@@ -1670,7 +1670,7 @@ class TestCreateEmbeddings:
             mock_response.json.return_value = {
                 "data": [{"embedding": [0.1, 0.2, 0.3], "index": 0}]
             }
-            with patch("wrangles.openai._requests.post", return_value=mock_response):
+            with patch("wrangles.openai._http_request", return_value=mock_response):
                 result = wrangles.openai.embeddings(
                     ["test text"],
                     api_key="fake-key",
@@ -1691,7 +1691,7 @@ class TestCreateEmbeddings:
         mock_response.json.return_value = {
             "data": [{"embedding": [0.1, 0.2, 0.3], "index": 0}]
         }
-        with patch("wrangles.openai._requests.post", return_value=mock_response) as mock_post:
+        with patch("wrangles.openai._http_request", return_value=mock_response) as mock_post:
             df = wrangles.recipe.run(
                 """
                 wrangles:
@@ -1727,7 +1727,7 @@ class TestCreateEmbeddings:
             "data": [{"embedding": encoded, "index": 0}]
         }
 
-        with patch("wrangles.openai._requests.post", return_value=mock_response) as mock_post:
+        with patch("wrangles.openai._http_request", return_value=mock_response) as mock_post:
             wrangles.openai.embeddings(
                 ["test"],
                 api_key="fake-key",
@@ -1746,7 +1746,7 @@ class TestCreateEmbeddings:
         mock_response.json.return_value = {
             "data": [{"embedding": [0.1, 0.2, 0.3], "index": 0}]
         }
-        with patch("wrangles.openai._requests.post", return_value=mock_response) as mock_post:
+        with patch("wrangles.openai._http_request", return_value=mock_response) as mock_post:
             result = wrangles.openai.embeddings(
                 ["test text"],
                 api_key="fake-key",
@@ -1769,7 +1769,7 @@ class TestCreateEmbeddings:
         mock_response.json.return_value = {
             "data": [{"embedding": [0.1, 0.2, 0.3], "index": 0}]
         }
-        with patch("wrangles.openai._requests.post", return_value=mock_response) as mock_post:
+        with patch("wrangles.openai._http_request", return_value=mock_response) as mock_post:
             df = wrangles.recipe.run(
                 """
                 wrangles:
@@ -1799,7 +1799,7 @@ class TestCreateEmbeddings:
         mock_response.json.return_value = {
             "data": [{"embedding": [0.1, 0.2, 0.3], "index": 0}]
         }
-        with patch("wrangles.openai._requests.post", return_value=mock_response) as mock_post:
+        with patch("wrangles.openai._http_request", return_value=mock_response) as mock_post:
             result = wrangles.openai.embeddings(
                 ["test text"],
                 api_key="fake-key",
@@ -1837,7 +1837,7 @@ class TestCreateEmbeddings:
             "data": [{"embedding": encoded, "index": 0}]
         }
 
-        with patch("wrangles.openai._requests.post", return_value=mock_response):
+        with patch("wrangles.openai._http_request", return_value=mock_response):
             with pytest.warns(UserWarning, match="task parameter is only supported for the Jina provider"):
                 wrangles.openai.embeddings(
                     ["test text"],
@@ -1870,7 +1870,7 @@ class TestCreateEmbeddings:
             mock_response.json.return_value = {
                 "data": [{"embedding": [0.1, 0.2, 0.3], "index": 0}]
             }
-            with patch("wrangles.openai._requests.post", return_value=mock_response):
+            with patch("wrangles.openai._http_request", return_value=mock_response):
                 result = wrangles.openai.embeddings(
                     ["hello"],
                     api_key="fake-key",
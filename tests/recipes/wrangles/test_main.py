@@ -3956,6 +3956,101 @@ class TestSQL:
         )
         assert df.empty and df.columns.to_list() == ['header1']
 
+    def test_sql_duckdb(self):
+        """
+        Test sql using the duckdb engine
+        """
+        df = wrangles.recipe.run(
+            """
+            wrangles:
+              - sql:
+                  command: |
+                    SELECT header1, header2
+                    FROM df
+                    WHERE header1 >= 2
+                    ORDER BY header1 DESC
+                  engine: duckdb
+            """,
+            dataframe=pd.DataFrame({
+                'header1': [1, 2, 3],
+                'header2': ['a', 'b', 'c'],
+                'header3': ['x', 'y', 'z'],
+            })
+        )
+        assert df.columns.tolist() == ['header1', 'header2']
+        assert df['header1'].tolist() == [3, 2]
+
+    def test_sql_duckdb_params(self):
+        """
+        Test sql using the duckdb engine with parameters
+        """
+        df = wrangles.recipe.run(
+            """
+            wrangles:
+              - sql:
+                  command: SELECT * FROM df WHERE header2 = $value
+                  params:
+                    value: b
+                  engine: duckdb
+            """,
+            dataframe=pd.DataFrame({
+                'header1': [1, 2, 3],
+                'header2': ['a', 'b', 'c'],
+            })
+        )
+        assert df['header1'].tolist() == [2]
+
+    def test_sql_duckdb_objects(self):
+        """
+        Test that nested objects are preserved using the duckdb engine
+        """
+        data = pd.DataFrame({
+            'header1': [1, 2],
+            'header2': [{'key': 'a'}, {'key': ['b', 'c']}],
+        })
+        df = wrangles.recipe.run(
+            """
+            wrangles:
+              - sql:
+                  command: |
+                    SELECT header2, json_extract_string(header2, '$.key') AS key
+                    FROM df
+                  engine: duckdb
+            """,
+            dataframe=data
+        )
+        assert df['header2'].tolist() == [{'key': 'a'}, {'key': ['b', 'c']}]
+        assert df['key'][0] == 'a'
+        assert data['header2'][0] == {'key': 'a'}
+
+    def test_sql_duckdb_preserve_index(self):
+        """
+        Test that the index is preserved using the duckdb engine
+        """
+        df = wrangles.recipe_wrangles.sql(
+            pd.DataFrame({'header1': [3, 1, 2]}, index=[10, 20, 30]),
+            "SELECT * FROM df WHERE header1 > 1",
+            preserve_index=True,
+            engine='duckdb'
+        )
+        assert df.index.tolist() == [10, 30]
+        assert df.columns.tolist() == ['header1']
+
+    def test_sql_invalid_engine(self):
+        """
+        Test that an unknown engine raises an error
+        """
+        with pytest.raises(ValueError, match="Unknown SQL engine"):
+            wrangles.recipe.run(
+                """
+                wrangles:
+                  - sql:
+                      command: SELECT * FROM df
+                      engine: oracle
+                """,
+                dataframe=pd.DataFrame({'header1': [1]})
+            )
+
 
 class TestRecipe:
     """
@@ -0,0 +1,239 @@
+"""
+Test sending batches of values to the Wrangles API
+"""
+import threading
+import time
+import wrangles
+import pytest
+
+
+class _Response:
+    def __init__(self, json=None, status_code=200, headers=None):
+        self._json = json
+        self.status_code = status_code
+        self.reason = 'Error'
+        self.text = 'Something went wrong'
+        self.headers = headers or {}
+
+    def json(self):
+        return self._json
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """
+    Replace the API with a function of the values in each batch
+    """
+    state = {'calls': [], 'active': 0, 'max_active': 0}
+    lock = threading.Lock()
+
+    def set_handler(handler):
+        def request_retries(request_type, url, **kwargs):
+            with lock:
+                state['calls'].append(kwargs)
+                state['active'] += 1
+                state['max_active'] = max(state['max_active'], state['active'])
+            try:
+                return handler(kwargs['json'])
+            finally:
+                with lock:
+                    state['active'] -= 1
+        monkeypatch.setattr(wrangles.batching._utils, 'request_retries', request_retries)
+
+    monkeypatch.setattr(wrangles.batching._auth, 'get_access_token', lambda: 'token')
+    state['set_handler'] = set_handler
+    return state
+
+
+def test_results_in_order(api):
+    """
+    Test that batches are sent at once and the
+    results are returned in the same order as the input
+    """
+    def handler(values):
+        # Later batches finish first
+        time.sleep(0.05 / values[0])
+        return _Response([v * 2 for v in values])
+    api['set_handler'](handler)
+
+    results = wrangles.batching.batch_api_calls('url', {}, list(range(1, 21)), 2, concurrency=4)
+    assert results == [v * 2 for v in range(1, 21)]
+    assert len(api['calls']) == 10
+    assert 1 < api['max_active'] <= 4
+
+
+def test_concurrency_param(api):
+    """
+    Test that concurrency passed through the params
+    is used and not sent to the API
+    """
+    api['set_handler'](lambda values: _Response(values))
+
+    results = wrangles.batching.batch_api_calls('url', {'model_id': 'x', 'concurrency': 1}, [1, 2, 3], 1)
+    assert results == [1, 2, 3]
+    assert api['max_active'] == 1
+    assert all(call['params'] == {'model_id': 'x'} for call in api['calls'])
+
+
+def test_dataframe_response(api):
+    """
+    Test combining responses with data and columns
+    """
+    api['set_handler'](lambda values: _Response({'data': [[v] for v in values], 'columns': ['value']}))
+
+    results = wrangles.batching.batch_api_calls('url', {}, [1, 2, 3], 2)
+    assert results == {'data': [[1], [2], [3]], 'columns': ['value']}
+
+
+def test_error_stops_batches(api):
+    """
+    Test that an error from the API stops any further batches
+    """
+    def handler(values):
+        if values[0] == 0:
+            return _Response(status_code=500)
+        time.sleep(0.05)
+        return _Response(values)
+    api['set_handler'](handler)
+
+    with pytest.raises(ValueError, match='Status Code: 500'):
+        wrangles.batching.batch_api_calls('url', {}, list(range(100)), 1, concurrency=2)
+    assert len(api['calls']) < 100
+
+
+def test_rate_limited(api, monkeypatch):
+    """
+    Test that a batch is retried after the time
+    requested by the API and fewer batches are sent at once
+    """
+    waits = []
+    monkeypatch.setattr(wrangles.batching._time, 'sleep', waits.append)
+
+    limited = []
+    def handler(values):
+        if values[0] == 3 and not limited:
+            limited.append(True)
+            return _Response(status_code=429, headers={'Retry-After': '2'})
+        return _Response(values)
+    api['set_handler'](handler)
+
+    results = wrangles.batching.batch_api_calls('url', {}, [1, 2, 3, 4], 1, concurrency=4)
+    assert results == [1, 2, 3, 4]
+    assert waits == [2]
+    assert len(api['calls']) == 5
+
+
+def test_recipe_concurrency(api, monkeypatch):
+    """
+    Test that concurrency can be set for a wrangle in a recipe
+    """
+    monkeypatch.setattr(wrangles.extract._data, 'model', lambda model_id: {
+        'purpose': 'extract', 'batch_size': 1, 'variant': 'pattern'
+    })
+    monkeypatch.setattr(wrangles.extract._data, 'model_content', lambda model_id: {'Data': []})
+    api['set_handler'](lambda values: _Response([[v.upper()] for v in values]))
+
+    df = wrangles.recipe.run(
+        """
+        read:
+          - test:
+              rows: 5
+              values:
+                col1: abc
+        wrangles:
+          - extract.custom:
+              input: col1
+              output: out
+              model_id: 1234abcd-1234-abcd
+              concurrency: 2
+        """
+    )
+    assert list(df['out']) == [['ABC']] * 5
+    assert api['max_active'] <= 2
+    assert all('concurrency' not in call['params'] for call in api['calls'])
+
+
+def test_target_bytes(api, monkeypatch):
+    """
+    Test that batches are kept within the target payload size
+    """
+    monkeypatch.setattr(wrangles.config, 'batch_target_bytes', 25)
+    api['set_handler'](lambda values: _Response(values))
+
+    values = ['a' * 10, 'b' * 10, 'c', 'd', 'e', 'f' * 30]
+    results = wrangles.batching.batch_api_calls('url', {}, values, 100, concurrency=1)
+    assert results == values
+    assert [call['json'] for call in api['calls']] == [
+        ['a' * 10], ['b' * 10, 'c', 'd', 'e'], ['f' * 30]
+    ]
+
+
+def test_split_too_large(api):
+    """
+    Test that a batch the API can't handle
+    is split in half and retried
+    """
+    def handler(values):
+        if len(values) > 2:
+            return _Response(status_code=413)
+        return _Response(values)
+    api['set_handler'](handler)
+
+    results = wrangles.batching.batch_api_calls('url', {}, list(range(10)), 8, concurrency=1)
+    assert results == list(range(10))
+    assert [len(call['json']) for call in api['calls']] == [8, 4, 2, 2, 4, 2, 2, 2]
+
+
+def test_split_single_value_error(api):
+    """
+    Test that the error is raised if a single value fails
+    """
+    api['set_handler'](lambda values: _Response(status_code=413))
+
+    with pytest.raises(ValueError, match='Status Code: 413'):
+        wrangles.batching.batch_api_calls('url', {}, [1, 2], 2, concurrency=1)
+    assert [len(call['json']) for call in api['calls']] == [2, 1]
+
+
+def test_slow_responses(api, monkeypatch):
+    """
+    Test that slow responses reduce the batch size
+    and quick responses increase it again
+    """
+    monkeypatch.setattr(wrangles.config, 'batch_target_seconds', 0.1)
+
+    def handler(values):
+        if len(api['calls']) == 1:
+            time.sleep(0.2)
+        return _Response(values)
+    api['set_handler'](handler)
+
+    results = wrangles.batching.batch_api_calls('url', {}, list(range(30)), 8, concurrency=1)
+    assert results == list(range(30))
+    assert [len(call['json']) for call in api['calls']] == [8, 4, 8, 8, 2]
+
+
+def test_unavailable_not_split(api):
+    """
+    Test that an API that is unavailable raises
+    an error without splitting the batch
+    """
+    api['set_handler'](lambda values: _Response(status_code=503))
+
+    with pytest.raises(ValueError, match='Status Code: 503'):
+        wrangles.batching.batch_api_calls('url', {}, list(range(100)), 50, concurrency=1)
+    assert len(api['calls']) == 1
+
+
+def test_connection_error_not_split(api):
+    """
+    Test that a connection error is raised
+    without splitting the batch
+    """
+    def handler(values):
+        raise wrangles.batching._requests.exceptions.ConnectionError('Connection refused')
+    api['set_handler'](handler)
+
+    with pytest.raises(wrangles.batching._requests.exceptions.ConnectionError):
+        wrangles.batching.batch_api_calls('url', {}, list(range(100)), 50, concurrency=1)
+    assert len(api['calls']) == 1
@@ -0,0 +1,174 @@
+"""
+Test the declared capabilities of wrangles
+"""
+import types
+import pandas
+import wrangles
+from wrangles.capabilities import Capabilities
+import pytest
+
+
+def _recipe_wrangles():
+    """
+    Get the names of all wrangles available to recipes
+    """
+    names = []
+    for name in dir(wrangles.recipe_wrangles):
+        obj = getattr(wrangles.recipe_wrangles, name)
+        if name.startswith('_') or name == 'main':
+            continue
+        if isinstance(obj, types.FunctionType) and obj.__module__.startswith('wrangles.recipe_wrangles'):
+            names.append(name)
+        elif isinstance(obj, types.ModuleType) and obj.__name__.startswith('wrangles.recipe_wrangles.'):
+            names.extend(
+                f"{name}.{fn}"
+                for fn in dir(obj)
+                if not fn.startswith('_')
+                and isinstance(getattr(obj, fn), types.FunctionType)
+                and getattr(obj, fn).__module__ == obj.__name__
+            )
+    return names
+
+
+def test_all_wrangles_declared():
+    """
+    Test that every recipe wrangle has declared capabilities
+    """
+    missing = [
+        name
+        for name in _recipe_wrangles()
+        if name not in wrangles.capabilities._REGISTRY
+        and not name.startswith('pandas.')
+    ]
+    assert missing == []
+
+
+def test_config_lists():
+    """
+    Test that the legacy config lists are derived from the registry
+    """
+    assert 'sort' in wrangles.config.where_overwrite_output
+    assert 'filter' in wrangles.config.where_overwrite_output
+    assert 'convert.case' not in wrangles.config.where_overwrite_output
+    assert sorted(wrangles.config.where_not_implemented) == ['drop', 'reindex', 'rename']
+
+
+def test_config_lists_changed():
+    """
+    Test that wrangles added to the legacy config lists are used
+    """
+    def keep(df):
+        df['out'] = 'x'
+        return df
+
+    recipe = """
+    wrangles:
+      - custom.keep:
+          where: col > 1
+    """
+    df = pandas.DataFrame({'col': [1, 2, 3]})
+    assert len(wrangles.recipe.run(recipe, dataframe=df, functions=keep)) == 3
+
+    wrangles.config.where_overwrite_output.append('custom.keep')
+    try:
+        assert wrangles.capabilities.get('custom.keep').where == 'overwrite'
+        result = wrangles.recipe.run(recipe, dataframe=df, functions=keep)
+        assert list(result['col']) == [2, 3]
+    finally:
+        wrangles.config.where_overwrite_output.remove('custom.keep')
+
+
+def test_get():
+    """
+    Test getting capabilities for known, aliased and unknown wrangles
+    """
+    assert wrangles.capabilities.get('convert.case').row_local
+    assert wrangles.capabilities.get('classify').network
+    assert not wrangles.capabilities.get('extract.ai').pure
+    assert wrangles.capabilities.get('sort').whole_frame
+    assert wrangles.capabilities.get('try').nested
+    # Generic pandas methods
+    assert wrangles.capabilities.get('pandas.cumsum').whole_frame
+    # Unknown wrangles are treated conservatively
+    unknown = wrangles.capabilities.get('custom.anything')
+    assert unknown.whole_frame and not unknown.pure and unknown.writes == 'all'
+
+
+def test_register():
+    """
+    Test declaring the capabilities of a custom function
+    """
+    def my_function(df):
+        return df
+
+    assert not wrangles.capabilities.is_row_local(
+        'custom.my_function', functions={'my_function': my_function}
+    )
+    wrangles.capabilities.register('custom.my_function', Capabilities())
+    try:
+        assert wrangles.capabilities.is_row_local(
+            'custom.my_function', functions={'my_function': my_function}
+        )
+    finally:
+        wrangles.capabilities._REGISTRY.pop('custom.my_function')
+
+
+def test_names():
+    """
+    Test finding wrangles by capability
+    """
+    network = wrangles.capabilities.names(network=True)
+    assert 'classify' in network
+    assert 'convert.case' not in network
+
+
+@pytest.mark.parametrize("wrangle,params,expected", [
+    ('convert.case', {}, True),
+    ('sort', {}, False),
+    ('batch', {'wrangles': [{'convert.case': {}}, 'log']}, True),
+    ('batch', {'wrangles': [{'convert.case': {}}, {'sort': {}}]}, False),
+    ('Try', {'wrangles': [{'batch': {'wrangles': [{'create.index': {}}]}}]}, False),
+    ('accordion', {}, False),
+])
+def test_is_row_local(wrangle, params, expected):
+    """
+    Test checking whether wrangles are row local including nested wrangles
+    """
+    assert wrangles.capabilities.is_row_local(wrangle, params) == expected
+
+
+class TestColumns:
+    """
+    Test identifying the columns read and written by a wrangle
+    """
+    columns = ['col1', 'col2', 'other']
+
+    def test_input_output(self):
+        params = {'input': 'col*', 'output': 'out'}
+        assert wrangles.capabilities.columns_read('convert.case', params, self.columns) == {'col1', 'col2'}
+        assert wrangles.capabilities.columns_written('convert.case', params, self.columns) == {'out'}
+
+    def test_in_place(self):
+        params = {'input': ['col1', 'col2']}
+        assert wrangles.capabilities.columns_written('convert.case', params, self.columns) == {'col1', 'col2'}
+
+    def test_dict_output(self):
+        params = {'input': 'col1', 'output': [{'a': 'x'}, 'b']}
+        assert wrangles.capabilities.columns_written('split.text', params, self.columns) == {'a', 'x', 'b'}
+
+    def test_wildcard_output(self):
+        params = {'input': 'col1', 'output': 'out*'}
+        assert wrangles.capabilities.columns_written('split.text', params, self.columns) is None
+
+    def test_read_all(self):
+        assert wrangles.capabilities.columns_read('python', {'command': 'col1'}, self.columns) is None
+        assert wrangles.capabilities.columns_read('create.column', {'output': 'x'}, self.columns) == set()
+
+    def test_where_reads_unknown(self):
+        params = {'input': 'col1', 'output': 'out', 'where': 'other = 1'}
+        assert wrangles.capabilities.columns_read('convert.case', params, self.columns) is None
+
+    def test_structural(self):
+        assert wrangles.capabilities.columns_written('sort', {'by': 'col1'}, self.columns) is None
+        assert wrangles.capabilities.columns_written('filter', {'input': 'col1'}, self.columns) is None
+        assert wrangles.capabilities.columns_written('log', {}, self.columns) == set()
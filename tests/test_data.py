@@ -1,5 +1,9 @@
+import threading
+import time
+
 import pytest
 
+import wrangles
 import wrangles.data as data
 
 
@@ -16,6 +20,13 @@ class FakeResponse:
 MODEL_ID = "93d92b4c-9f49-4ff5"
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    data.clear_cache()
+    yield
+    data.clear_cache()
+
+
 def _mock_model_response(monkeypatch, response):
     monkeypatch.setattr(data._auth, "get_access_token", lambda: "token")
     monkeypatch.setattr(data._utils, "request_retries", lambda **kwargs: response)
@@ -80,3 +91,101 @@ def test_model_content_success_returns_content(monkeypatch):
     _mock_model_response(monkeypatch, FakeResponse(200, content))
 
     assert data.model_content(MODEL_ID) == content
+
+
+def _count_requests(monkeypatch, response, delay=0):
+    calls = []
+
+    def request_retries(**kwargs):
+        calls.append(kwargs)
+        time.sleep(delay)
+        return response
+
+    monkeypatch.setattr(data._auth, "get_access_token", lambda: "token")
+    monkeypatch.setattr(data._utils, "request_retries", request_retries)
+    return calls
+
+
+def test_model_cached(monkeypatch):
+    calls = _count_requests(monkeypatch, FakeResponse(200, {"id": MODEL_ID, "purpose": "extract"}))
+
+    first = data.model(MODEL_ID)
+    first["purpose"] = "changed"
+    assert data.model(MODEL_ID) == {"id": MODEL_ID, "purpose": "extract"}
+    assert len(calls) == 1
+
+
+def test_model_content_cached_by_version(monkeypatch):
+    calls = _count_requests(monkeypatch, FakeResponse(200, {"Data": [["A"]]}))
+
+    data.model_content(MODEL_ID)
+    data.model_content(MODEL_ID)
+    data.model_content(MODEL_ID, "version1")
+    assert [call["params"] for call in calls] == [
+        {"model_id": MODEL_ID},
+        {"model_id": MODEL_ID, "version_id": "version1"}
+    ]
+
+
+def test_model_cache_single_fetch(monkeypatch):
+    calls = _count_requests(monkeypatch, FakeResponse(200, {"id": MODEL_ID}), delay=0.1)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(data.model(MODEL_ID)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [{"id": MODEL_ID}] * 5
+    assert len(calls) == 1
+
+
+def test_model_cache_expires(monkeypatch):
+    calls = _count_requests(monkeypatch, FakeResponse(200, {"id": MODEL_ID}))
+    monkeypatch.setattr(wrangles.config, "model_cache_seconds", 0.05)
+
+    data.model(MODEL_ID)
+    time.sleep(0.1)
+    data.model(MODEL_ID)
+    assert len(calls) == 2
+
+
+def test_model_cache_disabled(monkeypatch):
+    calls = _count_requests(monkeypatch, FakeResponse(200, {"id": MODEL_ID}))
+    monkeypatch.setattr(wrangles.config, "model_cache_seconds", 0)
+
+    data.model(MODEL_ID)
+    data.model(MODEL_ID)
+    assert len(calls) == 2
+
+
+def test_model_errors_not_cached(monkeypatch):
+    calls = _count_requests(monkeypatch, FakeResponse(401))
+
+    for _ in range(2):
+        with pytest.raises(data.AuthenticationError):
+            data.model(MODEL_ID)
+    assert len(calls) == 2
+
+
+def test_model_cache_cleared_by_train(monkeypatch):
+    calls = _count_requests(monkeypatch, FakeResponse(200, {"id": MODEL_ID}))
+
+    data.model(MODEL_ID)
+    data.model_content(MODEL_ID)
+    wrangles.train.standardize([["a", "b", ""]], model_id=MODEL_ID)
+    data.model(MODEL_ID)
+    data.model_content(MODEL_ID)
+    assert [call["request_type"] for call in calls] == ["GET", "GET", "PUT", "GET", "GET"]
+
+
+def test_model_cache_cleared_by_update(monkeypatch):
+    calls = _count_requests(monkeypatch, FakeResponse(200, {"id": MODEL_ID}))
+
+    data.model(MODEL_ID)
+    data.model_update(MODEL_ID, {"name": "Updated model"})
+    data.model(MODEL_ID)
+    assert [call["request_type"] for call in calls] == ["GET", "PATCH", "GET"]
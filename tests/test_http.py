@@ -0,0 +1,74 @@
+"""
+Test the shared HTTP connections
+"""
+import http.server
+import json
+import threading
+import wrangles
+import pytest
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = json.dumps({
+            'port': self.client_address[1],
+            'cookie': self.headers.get('Cookie')
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Set-Cookie', 'session=abc')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def url():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_connection_reused(url):
+    """
+    Test that repeated requests reuse the same connection
+    """
+    ports = {
+        wrangles.utils.http_request('GET', url).json()['port']
+        for _ in range(3)
+    }
+    assert len(ports) == 1
+
+
+def test_cookies_not_kept(url):
+    """
+    Test that cookies from one request aren't sent with the next,
+    the same as calling requests directly
+    """
+    wrangles.utils.http_request('GET', url)
+    assert wrangles.utils.http_request('GET', url).json()['cookie'] is None
+    assert wrangles.utils.http_request('GET', url, cookies={'a': '1'}).json()['cookie'] == 'a=1'
+
+
+def test_session_per_thread():
+    """
+    Test that each thread has its own session
+    sharing the same connection pools
+    """
+    sessions = []
+    thread = threading.Thread(target=lambda: sessions.append(wrangles.utils.http_session()))
+    thread.start()
+    thread.join()
+
+    session = wrangles.utils.http_session()
+    assert session is wrangles.utils.http_session()
+    assert session is not sessions[0]
+    assert session.get_adapter('https://') is sessions[0].get_adapter('https://')
+    assert wrangles.utils.http_session(retries=True).get_adapter('https://').max_retries.total == 3
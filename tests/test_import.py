@@ -0,0 +1,98 @@
+"""
+Test that importing wrangles stays fast by only
+importing modules when they are first used
+"""
+import json
+import os
+import subprocess
+import sys
+import wrangles
+import pytest
+
+
+def _cold_import() -> dict:
+    """
+    Import wrangles in a new interpreter and
+    get the time taken and the modules loaded
+    """
+    result = subprocess.run(
+        [
+            sys.executable,
+            '-c',
+            'import json, sys, time\n'
+            't = time.perf_counter()\n'
+            'import wrangles\n'
+            't = time.perf_counter() - t\n'
+            'print(json.dumps({"seconds": t, "modules": sorted(sys.modules)}))'
+        ],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_cold_import_modules():
+    """
+    Test that heavy dependencies and the recipe
+    engine are not imported by import wrangles
+    """
+    modules = _cold_import()['modules']
+    for module in [
+        'pandas',
+        'polars',
+        'openpyxl',
+        'wrangles.recipe',
+        'wrangles.recipe_wrangles',
+        'wrangles.connectors.file',
+        'wrangles.openai',
+    ]:
+        assert module not in modules, module
+    assert len(modules) < 600
+
+
+@pytest.mark.skipif(
+    "WRANGLES_TEST_IMPORT_TIME" not in os.environ,
+    reason="Timing depends on the machine. Set WRANGLES_TEST_IMPORT_TIME to run."
+)
+def test_cold_import_time():
+    """
+    Test the time to import wrangles in a new interpreter
+    """
+    assert _cold_import()['seconds'] < 1.5
+
+
+def test_lazy_attributes():
+    """
+    Test that lazily imported modules are
+    available as attributes and listed by dir
+    """
+    assert 'recipe' in dir(wrangles)
+    assert 'memory' in dir(wrangles.connectors)
+    assert callable(wrangles.recipe.run)
+    assert callable(wrangles.connectors.memory.read)
+    assert wrangles.DataFrame.__name__ == 'DataFrame'
+    assert callable(wrangles.search.SerpApiWranglesClient)
+    assert callable(wrangles.train.classify)
+
+    with pytest.raises(AttributeError):
+        wrangles.does_not_exist
+    with pytest.raises(AttributeError):
+        wrangles.connectors.does_not_exist
+
+
+def test_lazy_submodules():
+    """
+    Test that submodules available before imports were made
+    lazy can still be used straight after import wrangles
+    """
+    subprocess.run(
+        [
+            sys.executable,
+            '-c',
+            'import wrangles\n'
+            'for name in ["recipe_wrangles", "where", "compute", "dataframe", "openai_responses"]:\n'
+            '    getattr(wrangles, name)'
+        ],
+        check=True
+    )
@@ -46,7 +46,7 @@ def test_extract_ai_uses_responses_structured_outputs(monkeypatch, caplog):
         calls.append(kwargs)
         return _Response(body)
 
-    monkeypatch.setattr(extract._openai_responses._requests, "post", post)
+    monkeypatch.setattr(extract._openai_responses, "_http_request", post)
 
     with caplog.at_level(logging.WARNING, logger="wrangles.openai_responses"):
         result = extract.ai(
@@ -94,8 +94,8 @@ def test_examples_are_stable_instructions_and_part_of_the_result_cache_key(monke
         }]
     }
     monkeypatch.setattr(
-        extract._openai_responses._requests,
-        "post",
+        extract._openai_responses,
+        "_http_request",
         lambda **kwargs: calls.append(kwargs) or _Response(body),
     )
     common = {
@@ -137,8 +137,8 @@ def test_field_examples_are_stable_system_content_for_legacy_protocol(monkeypatc
         }]
     }
     monkeypatch.setattr(
-        extract._openai._requests,
-        "post",
+        extract._openai,
+        "_http_request",
         lambda **kwargs: calls.append(kwargs) or _Response(body),
     )
 
@@ -185,7 +185,7 @@ def test_extract_ai_omits_default_reasoning_for_non_reasoning_models(monkeypatch
         calls.append(kwargs)
         return _Response(body)
 
-    monkeypatch.setattr(extract._openai_responses._requests, "post", post)
+    monkeypatch.setattr(extract._openai_responses, "_http_request", post)
 
     result = extract.ai(
         "I had 3 strawberries, 5 bananas and 2 lemons",
@@ -237,8 +237,8 @@ def test_extract_ai_scalar_output_returns_scalar_with_responses(monkeypatch):
     }
 
     monkeypatch.setattr(
-        extract._openai_responses._requests,
-        "post",
+        extract._openai_responses,
+        "_http_request",
         lambda **kwargs: _Response(body),
     )
 
@@ -295,8 +295,8 @@ def test_extract_ai_validates_responses_output_with_pydantic(monkeypatch):
     }
 
     monkeypatch.setattr(
-        extract._openai_responses._requests,
-        "post",
+        extract._openai_responses,
+        "_http_request",
         lambda **kwargs: _Response(body),
     )
 
@@ -332,8 +332,8 @@ def test_extract_ai_reports_rate_limit_diagnostics(monkeypatch):
     }
 
     monkeypatch.setattr(
-        extract._openai_responses._requests,
-        "post",
+        extract._openai_responses,
+        "_http_request",
         lambda **kwargs: _Response(body, ok=False, status_code=429, headers=headers),
     )
 
@@ -390,7 +390,7 @@ def test_extract_ai_respects_retry_after_on_rate_limit(monkeypatch):
         calls.append(kwargs)
         return responses.pop(0)
 
-    monkeypatch.setattr(extract._openai_responses._requests, "post", post)
+    monkeypatch.setattr(extract._openai_responses, "_http_request", post)
     monkeypatch.setattr(
         extract._openai_responses._time,
         "sleep",
@@ -457,8 +457,8 @@ def test_extract_ai_logs_success_rate_limit_header_summary(monkeypatch, caplog):
     monkeypatch.setenv("WRANGLES_OPENAI_LOG_RATE_LIMITS", "true")
     monkeypatch.setenv("WRANGLES_OPENAI_LOG_EVERY", "2")
     monkeypatch.setattr(
-        extract._openai_responses._requests,
-        "post",
+        extract._openai_responses,
+        "_http_request",
         lambda **kwargs: responses.pop(0),
     )
 
@@ -610,8 +610,8 @@ def test_extract_ai_retries_real_falsey_requests_response(monkeypatch):
     ]
 
     monkeypatch.setattr(
-        extract._openai_responses._requests,
-        "post",
+        extract._openai_responses,
+        "_http_request",
         lambda **kwargs: responses.pop(0),
     )
     monkeypatch.setattr(
@@ -645,7 +645,7 @@ def test_extract_ai_does_not_retry_past_total_deadline(monkeypatch):
         calls.append(kwargs)
         return rate_limit
 
-    monkeypatch.setattr(extract._openai_responses._requests, "post", post)
+    monkeypatch.setattr(extract._openai_responses, "_http_request", post)
 
     result = extract.ai(
         "wrench 25mm",
@@ -682,8 +682,8 @@ def test_legacy_chat_transport_retries_real_falsey_response(monkeypatch):
     ]
 
     monkeypatch.setattr(
-        extract._openai._requests,
-        "post",
+        extract._openai,
+        "_http_request",
         lambda **kwargs: calls.append(kwargs) or responses.pop(0),
     )
     monkeypatch.setattr(
@@ -746,8 +746,8 @@ def test_saved_model_and_call_instructions_use_shared_compiler(monkeypatch):
 
     monkeypatch.setattr(extract._data, "model_content", lambda model_id: saved)
     monkeypatch.setattr(
-        extract._openai_responses._requests,
-        "post",
+        extract._openai_responses,
+        "_http_request",
         lambda **kwargs: calls.append(kwargs) or _Response(body),
     )
 
@@ -782,8 +782,8 @@ def test_dynamic_recipe_output_relaxes_only_nested_dictionary(monkeypatch):
     }
 
     monkeypatch.setattr(
-        extract._openai_responses._requests,
-        "post",
+        extract._openai_responses,
+        "_http_request",
         lambda **kwargs: calls.append(kwargs) or _Response(body),
     )
 
@@ -824,8 +824,8 @@ def test_extract_ai_deduplicates_batch_and_reuses_warm_result_cache(monkeypatch)
         }]
     }
     monkeypatch.setattr(
-        extract._openai_responses._requests,
-        "post",
+        extract._openai_responses,
+        "_http_request",
         lambda **kwargs: calls.append(kwargs) or _Response(body),
     )
 
@@ -857,8 +857,8 @@ def test_extract_ai_cache_is_tenant_scoped_and_bypassable(monkeypatch):
         }]
     }
     monkeypatch.setattr(
-        extract._openai_responses._requests,
-        "post",
+        extract._openai_responses,
+        "_http_request",
         lambda **kwargs: calls.append(kwargs) or _Response(body),
     )
     common = {
@@ -881,8 +881,8 @@ def test_extract_ai_does_not_cache_failures(monkeypatch):
         status_code=429,
     )
     monkeypatch.setattr(
-        extract._openai_responses._requests,
-        "post",
+        extract._openai_responses,
+        "_http_request",
         lambda **kwargs: calls.append(kwargs) or rate_limit,
     )
     arguments = {
@@ -915,8 +915,8 @@ def test_prompt_cache_key_covers_complete_static_prefix(monkeypatch):
         }]
     }
     monkeypatch.setattr(
-        extract._openai_responses._requests,
-        "post",
+        extract._openai_responses,
+        "_http_request",
         lambda **kwargs: payloads.append(kwargs["json"]) or _Response(body),
     )
     common = {
@@ -948,8 +948,8 @@ def test_legacy_chat_completions_uses_same_result_cache(monkeypatch):
         }]
     }
     monkeypatch.setattr(
-        extract._openai._requests,
-        "post",
+        extract._openai,
+        "_http_request",
         lambda **kwargs: calls.append(kwargs) or _Response(body),
     )
 
@@ -0,0 +1,191 @@
+"""
+Test the shared threads and cancellation of recipe runs
+"""
+import threading
+import time
+import wrangles
+import pandas as pd
+import pytest
+
+
+def test_map_order():
+    """
+    Test that map returns the results in the order of the arguments
+    """
+    def slow_square(x):
+        time.sleep(0.01 * (5 - x))
+        return x * x
+
+    assert wrangles.scheduler.map(slow_square, range(5), max_workers=3) == [0, 1, 4, 9, 16]
+
+
+def test_map_max_workers():
+    """
+    Test that map doesn't run more than max_workers at once
+    """
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def task(_):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+
+    wrangles.scheduler.map(task, range(10), max_workers=3)
+    assert 1 < peak[0] <= 3
+
+
+def test_map_error():
+    """
+    Test that map raises the first error
+    and doesn't start any further calls
+    """
+    calls = []
+
+    def task(x):
+        calls.append(x)
+        if x == 1:
+            raise ValueError('Failed on 1')
+        return x
+
+    with pytest.raises(ValueError, match='Failed on 1'):
+        wrangles.scheduler.map(task, range(10), max_workers=1)
+    assert calls == [0, 1]
+
+
+def test_saturated_threads_run_in_caller(monkeypatch):
+    """
+    Test that nested work runs in the calling thread
+    rather than waiting when all the shared threads are busy
+    """
+    monkeypatch.setattr(wrangles.config, 'max_threads', 2)
+
+    def outer(x):
+        return sum(wrangles.scheduler.map(inner, range(4), [x] * 4, max_workers=4))
+
+    def inner(y, x):
+        time.sleep(0.01)
+        return x * y
+
+    assert wrangles.scheduler.map(outer, range(4), max_workers=4) == [0, 6, 12, 18]
+
+
+def test_token_nested():
+    """
+    Test that cancelling a token also cancels nested tokens
+    """
+    with wrangles.scheduler.cancellable() as parent:
+        with wrangles.scheduler.cancellable() as child:
+            assert not child.cancelled
+            parent.cancel()
+            assert child.cancelled
+            with pytest.raises(wrangles.scheduler.CancelledError):
+                wrangles.scheduler.check()
+    # Outside of a run, check does nothing
+    wrangles.scheduler.check()
+
+
+def test_token_timeout():
+    """
+    Test that a token with a timeout is cancelled once it expires
+    """
+    with wrangles.scheduler.cancellable(0.05) as token:
+        assert not token.cancelled
+        time.sleep(0.1)
+        with pytest.raises(TimeoutError, match='Limit: 0.05s'):
+            token.check()
+
+
+def test_timeout_stops_remaining_wrangles():
+    """
+    Test that once a recipe times out, the
+    wrangles after the current one are not run
+    """
+    calls = []
+
+    def sleep(df):
+        time.sleep(1)
+        return df
+
+    def after(df):
+        calls.append(True)
+        return df
+
+    with pytest.raises(TimeoutError):
+        wrangles.recipe.run(
+            """
+            wrangles:
+              - custom.sleep: {}
+              - custom.after: {}
+            """,
+            dataframe=pd.DataFrame({'header1': ['value1']}),
+            functions=[sleep, after],
+            timeout=0.2
+        )
+
+    # Allow the sleep to finish
+    time.sleep(1.5)
+    assert calls == []
+
+
+def test_timeout_custom_function_check():
+    """
+    Test that long running custom functions
+    can check whether the recipe has timed out
+    """
+    iterations = []
+
+    def long_running(df):
+        while True:
+            wrangles.scheduler.check()
+            iterations.append(True)
+            time.sleep(0.01)
+
+    start = time.time()
+    with pytest.raises(TimeoutError):
+        wrangles.recipe.run(
+            """
+            wrangles:
+              - custom.long_running: {}
+            """,
+            dataframe=pd.DataFrame({'header1': ['value1']}),
+            functions=long_running,
+            timeout=0.2
+        )
+    time.sleep(0.1)
+    count = len(iterations)
+    time.sleep(0.1)
+    assert len(iterations) == count
+    assert time.time() - start < 2
+
+
+def test_batch_timeout():
+    """
+    Test that nested runs with a timeout time out
+    """
+    def sleep(df):
+        time.sleep(1)
+        return df
+
+    with pytest.raises(TimeoutError, match='Batch #1'):
+        wrangles.recipe.run(
+            """
+            read:
+              - test:
+                  rows: 4
+                  values:
+                    header1: value1
+            wrangles:
+              - batch:
+                  batch_size: 2
+                  threads: 2
+                  timeout: 0.2
+                  wrangles:
+                    - custom.sleep: {}
+            """,
+            functions=sleep
+        )
@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from wrangles import where
+from wrangles.recipe_wrangles import sql
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'text': ['a', 'B', 'abc', '10', '9', '', None, 'a_c', 'é'],
+        'number': [1, 2, 5, 9, 10, -3, 1, 2, 5],
+        'decimal': [1.5, 2.0, np.nan, 5.0, -0.5, 10.0, 1.5, 2.0, np.nan],
+        'mixed': [1, 'a', '', 5, '5', None, True, 'b', 2],
+        'Col Space': ['x', 'y', None, 'x', 'y', None, 'x', 'y', None],
+    })
+
+
+def _sqlite_mask(df, criteria, params=None):
+    index = sql(
+        df,
+        f"SELECT * FROM df WHERE {criteria};",
+        params,
+        preserve_index=True,
+        preserve_data_types=False
+    ).index
+    return df.index.isin(index)
+
+
+@pytest.mark.parametrize('criteria', [
+    "text = 'a'",
+    "text == 'a' OR number > 5",
+    "text <> 'a' AND NOT number <= 2",
+    "text > '5'",
+    "text = 10",
+    "'abc' = text",
+    "number = '5'",
+    "number >= -3 AND decimal < 2",
+    "decimal != 1.5",
+    "mixed = 5",
+    "mixed = '1'",
+    "mixed > 'a'",
+    "text IN ('a', 'B', 10)",
+    "text NOT IN ('a', NULL)",
+    "number IN (1, 5)",
+    "number BETWEEN 2 AND 9",
+    "decimal NOT BETWEEN 1 AND 5",
+    "text LIKE 'A%'",
+    "text NOT LIKE '_'",
+    "text LIKE 'a_c'",
+    "text LIKE 'É'",
+    "text IS NULL",
+    "decimal IS NOT NULL",
+    "\"Col Space\" = 'x' OR [Col Space] IS NULL",
+    "NOT (text = 'a' OR decimal > 1)",
+    "(number > 1 AND (text = 'B' OR text = '9')) OR mixed = ''",
+    "TEXT = 'a'",
+    "number = TRUE",
+    "1 = 1",
+    "text = NULL",
+])
+def test_matches_sqlite(df, criteria):
+    """
+    Test that criteria evaluate the same as they do using SQLite
+    """
+    mask = where.mask(df, criteria)
+    assert mask is not None
+    assert mask.tolist() == _sqlite_mask(df, criteria).tolist()
+
+
+@pytest.mark.parametrize('criteria, params', [
+    ("text = ? OR number > ?", ['a', 5]),
+    ("text = :value OR number IN (:low, :high)", {'value': 'B', 'low': 1, 'high': 10}),
+    ("decimal > @value", {'value': 1.5}),
+])
+def test_params(df, criteria, params):
+    """
+    Test parameterized criteria
+    """
+    mask = where.mask(df, criteria, params)
+    assert mask is not None
+    assert mask.tolist() == _sqlite_mask(df, criteria, params).tolist()
+
+
+@pytest.mark.parametrize('criteria, params', [
+    ("LOWER(text) = 'a'", None),
+    ("number + 1 > 2", None),
+    ("text GLOB 'a*'", None),
+    ("text LIKE 'a!%' ESCAPE '!'", None),
+    ("not_a_column = 1", None),
+    ("number > 1 ORDER BY number", None),
+    ("text = ?", None),
+    ("text = ?", ['a', 'b']),
+    ("mixed = 1e20", None),
+    ("text = 'a';", None),
+])
+def test_unsupported(df, criteria, params):
+    """
+    Test that unsupported criteria return None
+    to fall back to evaluating with SQLite
+    """
+    assert where.mask(df, criteria, params) is None
+
+
+def test_dates_unsupported():
+    """
+    Test that datetime columns fall back to SQLite
+    """
+    df = pd.DataFrame({'date': pd.to_datetime(['2024-01-01', '2024-06-01'])})
+    assert where.mask(df, "date > '2024-03-01'") is None
+
+
+def test_empty_dataframe():
+    """
+    Test criteria against an empty dataframe
+    """
+    df = pd.DataFrame({"text": pd.Series([], dtype=object)})
+    assert where.mask(df, "text = 'a'").tolist() == []
+
+
+@pytest.mark.parametrize("criteria,params,expected", [
+    ("a = 1 AND b IN ('x', 'y')", None, [('a', 'in', [1]), ('b', 'in', ['x', 'y'])]),
+    ("'x' = a AND (b = ? AND c > 2)", [3], [('a', 'in', ['x']), ('b', 'in', [3])]),
+    ("a = :value", {'value': 'x'}, [('a', 'in', ['x'])]),
+    ("a = 1 OR b = 2", None, []),
+    ("NOT a = 1", None, []),
+    ("a = '' AND b IN ('x', NULL)", None, []),
+    ("upper(a) = 'X'", None, []),
+])
+def test_row_filters(criteria, params, expected):
+    """
+    Test getting the equality filters a row must match
+    """
+    assert where.row_filters(criteria, params) == expected
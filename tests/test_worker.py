@@ -0,0 +1,209 @@
+"""
+Test running recipes using a worker
+"""
+import http.client
+import json
+import socket
+import sys
+import threading
+import time
+import wrangles
+import pytest
+
+
+@pytest.fixture
+def serve():
+    """
+    Start a worker in a background thread
+    and stop it at the end of the test
+    """
+    servers = []
+
+    def start(worker=None, **kwargs):
+        server = wrangles.worker.server(worker or wrangles.worker.Worker(), port=0, **kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _request(server, method, path, body=None):
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=30)
+    connection.request(method, path, body=json.dumps(body) if body is not None else None)
+    response = connection.getresponse()
+    result = response.status, json.loads(response.read())
+    connection.close()
+    return result
+
+
+def test_health(serve):
+    """
+    Test the health endpoint
+    """
+    status, body = _request(serve(), 'GET', '/health')
+    assert status == 200
+    assert body['status'] == 'ok'
+
+
+def test_run_with_data(serve):
+    """
+    Test running a recipe with data and variables
+    """
+    status, body = _request(serve(), 'POST', '/run', {
+        'recipe': """
+            wrangles:
+              - convert.case:
+                  input: col1
+                  output: out
+                  case: ${case}
+        """,
+        'variables': {'case': 'upper'},
+        'data': {'columns': ['col1'], 'data': [['a'], ['b']]}
+    })
+    assert status == 200
+    assert body == {'columns': ['col1', 'out'], 'data': [['a', 'A'], ['b', 'B']]}
+
+
+def test_run_reuses_compiled_recipe(serve):
+    """
+    Test that running the same recipe again
+    reuses the compiled recipe
+    """
+    worker = wrangles.worker.Worker()
+    server = serve(worker)
+    recipe = """
+        read:
+          - test:
+              rows: 2
+              values:
+                header: ${value}
+    """
+    for value in ['x', 'y']:
+        status, body = _request(server, 'POST', '/run', {'recipe': recipe, 'variables': {'value': value}})
+        assert status == 200
+        assert body['data'] == [[value], [value]]
+
+    assert len(worker._cache) == 1
+    assert worker.jobs_run == 2
+
+
+def test_custom_functions(serve):
+    """
+    Test that custom functions given to
+    the worker are available to recipes
+    """
+    def shout(col1):
+        return col1 + '!'
+
+    status, body = _request(serve(wrangles.worker.Worker(functions=shout)), 'POST', '/run', {
+        'recipe': """
+            wrangles:
+              - custom.shout:
+                  output: out
+        """,
+        'data': {'columns': ['col1'], 'data': [['a']]}
+    })
+    assert status == 200
+    assert body['data'] == [['a', 'a!']]
+
+
+def test_invalid_request(serve):
+    """
+    Test that invalid requests are rejected
+    """
+    server = serve()
+    status, body = _request(server, 'POST', '/run', {'variables': {}})
+    assert status == 400
+    assert body['error'] == 'A recipe is required'
+
+    status, body = _request(server, 'POST', '/run', {'recipe': 'read:\n  - test: {}\n', 'data': [1, 2]})
+    assert status == 400
+
+
+def test_recipe_error(serve):
+    """
+    Test that errors from the recipe are returned
+    """
+    status, body = _request(serve(), 'POST', '/run', {
+        'recipe': """
+            wrangles:
+              - convert.case:
+                  input: does_not_exist
+                  case: upper
+        """,
+        'data': {'columns': ['col1'], 'data': [['a']]}
+    })
+    assert status == 500
+    assert 'does_not_exist' in body['error']
+
+
+def test_busy(serve):
+    """
+    Test that requests are rejected when
+    all of the job slots are in use
+    """
+    started = threading.Event()
+
+    def wait(df):
+        started.set()
+        time.sleep(1)
+        return df
+
+    server = serve(wrangles.worker.Worker(functions=wait, max_jobs=1, queue_seconds=0))
+    job = {
+        'recipe': "wrangles:\n  - custom.wait: {}\n",
+        'data': {'columns': ['col1'], 'data': [['a']]}
+    }
+    first = threading.Thread(target=_request, args=(server, 'POST', '/run', job))
+    first.start()
+    started.wait(10)
+
+    status, body = _request(server, 'POST', '/run', job)
+    first.join()
+    assert status == 503
+    assert body['type'] == 'WorkerBusyError'
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="Unix sockets only")
+def test_unix_socket(serve, tmp_path):
+    """
+    Test serving a worker on a Unix socket
+    """
+    path = str(tmp_path / 'worker.sock')
+    serve(socket_path=path)
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(path)
+    client.sendall(b'GET /health HTTP/1.0\r\n\r\n')
+    response = b''
+    while chunk := client.recv(4096):
+        response += chunk
+    client.close()
+
+    assert response.startswith(b'HTTP/1.0 200')
+    assert json.loads(response.split(b'\r\n\r\n', 1)[1])['status'] == 'ok'
+
+
+def test_unix_socket_unsupported(monkeypatch, tmp_path):
+    """
+    Test that a clear error is raised for a Unix
+    socket on platforms that don't support them
+    """
+    monkeypatch.delattr(wrangles.worker._socketserver, 'UnixStreamServer', raising=False)
+    with pytest.raises(NotImplementedError, match='Unix sockets are not supported'):
+        wrangles.worker.server(wrangles.worker.Worker(), socket_path=str(tmp_path / 'worker.sock'))
+
+
+def test_functions_file(tmp_path):
+    """
+    Test loading custom functions from a file
+    """
+    path = tmp_path / 'functions.py'
+    path.write_text("def shout(col1):\n    return col1 + '!'\n")
+    worker = wrangles.worker.Worker(functions=str(path))
+    assert list(worker.functions) == ['shout']
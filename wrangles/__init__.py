@@ -10,29 +10,61 @@ Wrangle your data into shape with machine learning.
 ['ABC123ZZ']
 """
 
-from .config import authenticate
+import importlib as _importlib
 
-from . import connectors
-from . import recipe
-from .dataframe import DataFrame
+from .config import authenticate
 
+# These share their name with a module of this package, so they must
+# be imported up front. Otherwise importing the module elsewhere
+# would replace them with the module.
 from .classify import classify
-from . import extract
 from .lookup import lookup
 from .translate import translate
 from .standardize import standardize
-from . import format
-from . import openai
-from . import ai_config
-from . import ai_definition
-from . import ai_cache
+from .train import train
 from .clients import serp_api as search
 
-from . import data
-from .train import train
-from . import select
-from . import compare
-from . import generate
+# Everything else is imported when it is first accessed so that
+# importing wrangles stays fast e.g. for command line use.
+# Name: (module, attribute or None for the module itself)
+_LAZY = {
+    'connectors': ('.connectors', None),
+    'recipe': ('.recipe', None),
+    'recipe_wrangles': ('.recipe_wrangles', None),
+    'where': ('.where', None),
+    'compute': ('.compute', None),
+    'profiling': ('.profiling', None),
+    'capabilities': ('.capabilities', None),
+    'checkpoint': ('.checkpoint', None),
+    'incremental': ('.incremental', None),
+    'scheduler': ('.scheduler', None),
+    'worker': ('.worker', None),
+    'dataframe': ('.dataframe', None),
+    'DataFrame': ('.dataframe', 'DataFrame'),
+    'extract': ('.extract', None),
+    'format': ('.format', None),
+    'openai': ('.openai', None),
+    'openai_responses': ('.openai_responses', None),
+    'ai_config': ('.ai_config', None),
+    'ai_definition': ('.ai_definition', None),
+    'ai_cache': ('.ai_cache', None),
+    'data': ('.data', None),
+    'select': ('.select', None),
+    'compare': ('.compare', None),
+    'generate': ('.generate', None),
+}
+
 
+def __getattr__(name: str):
+    if name in _LAZY:
+        module_name, attribute = _LAZY[name]
+        value = _importlib.import_module(module_name, __name__)
+        if attribute is not None:
+            value = getattr(value, attribute)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_LAZY))
@@ -4,12 +4,15 @@ Functions for interacting with Keycloak Server
 from datetime import datetime as _datetime, timedelta as _timedelta
 from . import config as _config
 import urllib.parse as _urlparse
+import threading as _threading
 import jwt as _jwt
 from . import utils as _utils
 
 
 _access_token = None
 _access_token_expiry = _datetime.now()
+# Batches may be sent from several threads at once
+_access_token_lock = _threading.Lock()
 
 refresh_token = None
 
@@ -66,21 +69,22 @@ def get_access_token():
     """
     global _access_token, _access_token_expiry
 
-    if _access_token == None or _access_token_expiry < _datetime.now():
-        # If refresh token is provided use it to get a new access token
-        # Otherwise use username and password
-        if refresh_token:
-            response = _refresh_access_token_from_refresh_token()
-        else:
-            response = _refresh_access_token()
-
-        if response.status_code == 200:
-            _access_token = response.json()['access_token']
-        elif response.status_code == 401:
-            raise RuntimeError('Invalid login details provided')
-        else:
-            raise RuntimeError('Unexpected error when authenticating')
-
-        _access_token_expiry = _datetime.now() + _timedelta(0, response.json()['expires_in'] - 30)
+    with _access_token_lock:
+        if _access_token == None or _access_token_expiry < _datetime.now():
+            # If refresh token is provided use it to get a new access token
+            # Otherwise use username and password
+            if refresh_token:
+                response = _refresh_access_token_from_refresh_token()
+            else:
+                response = _refresh_access_token()
+
+            if response.status_code == 200:
+                _access_token = response.json()['access_token']
+            elif response.status_code == 401:
+                raise RuntimeError('Invalid login details provided')
+            else:
+                raise RuntimeError('Unexpected error when authenticating')
+
+            _access_token_expiry = _datetime.now() + _timedelta(0, response.json()['expires_in'] - 30)
 
     return _access_token
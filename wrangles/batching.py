@@ -4,58 +4,276 @@ are unable to be processed in a single request
 """
 
 import logging as _logging
+import threading as _threading
+import time as _time
+import json as _json
+import requests as _requests
 from . import auth as _auth
+from . import config as _config
 from . import utils as _utils
+from . import scheduler as _scheduler
 
 
-def batch_api_calls(url, params, input_list, batch_size):
+# Maximum number of times a batch is retried when the API asks us to slow down
+_MAX_RATE_LIMIT_RETRIES = 5
+
+# Responses that suggest a batch was too large for the API to handle
+# Batches that fail with these are split in half and retried.
+# Other errors, such as the API being unavailable, are raised straight away.
+_SPLIT_STATUS_CODES = {408, 413}
+_SPLIT_ERRORS = (_requests.exceptions.ReadTimeout,)
+
+
+class _ConcurrencyLimit:
+    """
+    Limits the number of batches in flight at once.
+    The limit is reduced if the API responds that
+    too many requests are being made.
+    """
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._active = 0
+        self._condition = _threading.Condition()
+
+    def __enter__(self):
+        with self._condition:
+            while self._active >= self.limit:
+                self._condition.wait()
+            self._active += 1
+
+    def __exit__(self, *args):
+        with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+    def reduce(self):
+        """
+        Halve the number of batches allowed in flight
+        """
+        with self._condition:
+            self.limit = max(1, self.limit // 2)
+
+
+def _retry_after(response) -> float:
+    """
+    Get the number of seconds to wait from the Retry-After header
+    of a response. Defaults to 1 second if not provided as seconds.
+    """
+    try:
+        return min(max(float(response.headers.get('Retry-After')), 0), 60)
+    except (TypeError, ValueError):
+        return 1
+
+
+def _payload_size(value) -> int:
+    """
+    Approximate number of bytes a value adds to a request
+    """
+    if isinstance(value, str):
+        return len(value) + 3
+    return len(_json.dumps(value, default=str)) + 1
+
+
+class _BatchSizer:
+    """
+    Splits the input into batches as they are sent.
+
+    Batches are kept within the target payload size. The number of
+    values per batch is halved if responses are slower than the
+    target time or fail, and doubled again up to the maximum
+    if responses are quick.
+    """
+    def __init__(self, input_list: list, max_size: int, target_bytes: int, target_seconds: float):
+        self.input_list = input_list
+        self.max_size = max_size
+        self.size = max_size
+        self.target_bytes = target_bytes
+        self.target_seconds = target_seconds
+        self._next = 0
+        self._lock = _threading.Lock()
+
+    def next(self):
+        """
+        Take the next batch
+
+        :return: Start and end of the batch within the input, or None once all values are taken
+        """
+        with self._lock:
+            start = end = self._next
+            if start >= len(self.input_list):
+                return None
+
+            payload = 0
+            while end < len(self.input_list) and end - start < self.size:
+                payload += _payload_size(self.input_list[end])
+                if payload > self.target_bytes and end > start:
+                    break
+                end += 1
+
+            self._next = end
+            return start, end
+
+    def record(self, count: int, seconds: float):
+        """
+        Adjust the batch size after a batch of count values was sent successfully
+        """
+        with self._lock:
+            if seconds > self.target_seconds:
+                self.size = max(1, min(self.size, count) // 2)
+            elif seconds < self.target_seconds / 4 and count >= self.size:
+                self.size = min(self.max_size, self.size * 2)
+
+    def shrink(self, count: int):
+        """
+        Reduce the batch size after a batch of count values failed
+        """
+        with self._lock:
+            self.size = max(1, min(self.size, count // 2))
+
+
+def batch_api_calls(url, params, input_list, batch_size, concurrency=None):
     """
-    Batch API calls into multiple of set batch size
+    Batch API calls into multiple of set batch size.
+
+    Batches are made smaller to stay within WRANGLES_BATCH_TARGET_BYTES
+    and WRANGLES_BATCH_TARGET_SECONDS per request. A batch that fails
+    in a way that suggests it was too large is split in half and retried.
+
+    :param url: API endpoint to POST each batch to
+    :param params: Query parameters for each request. \
+        May include concurrency as passed to a recipe wrangle.
+    :param input_list: List of values to send
+    :param batch_size: Maximum number of values to send per request
+    :param concurrency: (Optional) Number of batches to send at once. \
+        Defaults to WRANGLES_BATCH_CONCURRENCY or 4.
+    :return: The combined results in the same order as input_list
     """
     if input_list == []:
-        # If input list is empty, shortcut and 
+        # If input list is empty, shortcut and
         # immediately return an empty list
         return []
 
-    total_batches = (len(input_list) + batch_size - 1) // batch_size
-    _logging.info(f": Starting batch API calls :: url :: {url}, batch_size :: {batch_size}, total_records :: {len(input_list)}")
-
-    results = None
-    for i in range(0, len(input_list), batch_size):
-        batch_num = i // batch_size + 1
-        _logging.debug(f": Processing batch {batch_num} of {total_batches}")
-        headers = {'Authorization': f'Bearer {_auth.get_access_token()}'}
-        response = _utils.request_retries(
-                    request_type='POST',
-                    url=url,
-                    **{
-                        'params': params,
-                        'headers': headers,
-                        'json': input_list[i:i + batch_size]
-                    }
-                )
-        
+    # Concurrency may be passed through the params from a recipe
+    params = dict(params)
+    concurrency = params.pop('concurrency', None) or concurrency
+    if concurrency is None:
+        concurrency = _config.batch_concurrency
+    concurrency = int(concurrency)
+    if concurrency < 1:
+        raise ValueError('concurrency must be at least 1')
+
+    _logging.info(f": Starting batch API calls :: url :: {url}, batch_size :: {batch_size}, total_records :: {len(input_list)}, concurrency :: {concurrency}")
+
+    limit = _ConcurrencyLimit(concurrency)
+    sizer = _BatchSizer(
+        input_list,
+        batch_size,
+        _config.batch_target_bytes,
+        _config.batch_target_seconds
+    )
+
+    def _post(start, end):
+        """
+        Send the values from start to end, waiting and
+        trying again if the API asks us to slow down
+
+        :return: The response and the time it took in seconds
+        """
+        for attempt in range(_MAX_RATE_LIMIT_RETRIES + 1):
+            with limit:
+                began = _time.perf_counter()
+                headers = {'Authorization': f'Bearer {_auth.get_access_token()}'}
+                response = _utils.request_retries(
+                            request_type='POST',
+                            url=url,
+                            **{
+                                'params': params,
+                                'headers': headers,
+                                'json': input_list[start:end]
+                            }
+                        )
+                seconds = _time.perf_counter() - began
+
+            if response.status_code != 429 or attempt == _MAX_RATE_LIMIT_RETRIES:
+                return response, seconds
+
+            # Too many requests - send fewer at once and try again
+            limit.reduce()
+            wait = _retry_after(response)
+            _logging.warning(f": Batch API request rate limited :: values :: {start + 1} to {end}, retrying in {wait}s with concurrency {limit.limit}")
+            _time.sleep(wait)
+            _scheduler.check()
+
+    def _send(start, end):
+        """
+        Send the values from start to end
+
+        :return: List of the responses, more than one if the batch had to be split
+        """
+        # Stop if the recipe has been cancelled or timed out
+        _scheduler.check()
+        _logging.debug(f": Processing values {start + 1} to {end} of {len(input_list)}")
+        try:
+            response, seconds = _post(start, end)
+            too_large = response.status_code in _SPLIT_STATUS_CODES
+        except _SPLIT_ERRORS:
+            if end - start == 1:
+                raise
+            too_large = True
+
+        if too_large and end - start > 1:
+            # Try again with half as many values in each request
+            sizer.shrink(end - start)
+            _logging.warning(f": Batch API request failed :: values :: {start + 1} to {end}, retrying as smaller batches")
+            middle = (start + end) // 2
+            return _send(start, middle) + _send(middle, end)
+
         # Checking status code
         if str(response.status_code)[0] != '2':
-            _logging.error(f": Batch API request failed :: status_code :: {response.status_code}, batch :: {batch_num}")
+            _logging.error(f": Batch API request failed :: status_code :: {response.status_code}, values :: {start + 1} to {end}")
             raise ValueError(f"Status Code: {response.status_code} - {response.reason}. {response.text} \n")
-        
-        response_json = response.json()
 
-        if isinstance(response_json, list):
-            if results is None:
-                results = []
-            results += response_json
-        elif isinstance(response_json, dict):
+        sizer.record(end - start, seconds)
+
+        response_json = response.json()
+        if isinstance(response_json, dict):
             if "data" not in response_json or "columns" not in response_json:
                 raise ValueError(f"API Response did not return an expected format.")
+        elif not isinstance(response_json, list):
+            raise ValueError(f"API Response did not return an expected format.")
+        return [response_json]
 
-            if results is None:
-                results = {}
+    # Responses for each batch by where the batch starts in the input
+    responses = {}
+    stop = _threading.Event()
 
-            results["data"] = results.get("data", []) + response_json["data"]
-            results["columns"] = response_json["columns"]
-        else:
-            raise ValueError(f"API Response did not return an expected format.")
+    def _worker(_):
+        while not stop.is_set():
+            batch = sizer.next()
+            if batch is None:
+                return
+            try:
+                responses[batch[0]] = _send(*batch)
+            except BaseException:
+                # Don't start any more batches after an error
+                stop.set()
+                raise
+
+    _scheduler.map(_worker, range(concurrency), max_workers=concurrency)
+
+    responses = [
+        response
+        for start in sorted(responses)
+        for response in responses[start]
+    ]
+
+    if all(isinstance(response, list) for response in responses):
+        return [row for response in responses for row in response]
+
+    if all(isinstance(response, dict) for response in responses):
+        return {
+            "data": [row for response in responses for row in response["data"]],
+            "columns": responses[-1]["columns"]
+        }
 
-    return results
+    raise ValueError(f"API Response did not return an expected format.")
@@ -0,0 +1,423 @@
+"""
+Capabilities of the wrangles available to recipes
+
+Describes how each wrangle uses the dataframe so that the
+recipe engine can decide when it is safe to split the data
+into chunks, run wrangles in parallel or filter using where.
+
+>>> wrangles.capabilities.get('convert.case').row_local
+True
+"""
+import typing as _typing
+import dataclasses as _dataclasses
+from dataclasses import dataclass as _dataclass
+
+from . import config as _config
+
+from .utils import (
+    function_spec as _function_spec,
+    get_nested_function as _get_nested_function,
+    wildcard_expansion as _wildcard_expansion
+)
+
+
+@_dataclass(frozen=True)
+class Capabilities:
+    """
+    The declared behaviour of a wrangle
+
+    :param row_local: Each output row depends only on the matching input row, \
+        so the wrangle gives the same result when run on any subset of the rows
+    :param changes_row_count: The wrangle may add or remove rows
+    :param pure: The same input always gives the same output, with no side effects
+    :param network: The wrangle calls an external service
+    :param reads: Columns read - 'input' for those in the input parameter, \
+        'all' if any column may be read or 'none'
+    :param writes: Columns written - 'output' for those in the output parameter, \
+        or the input columns if there is no output, 'all' if any column may be \
+        changed, added or removed, or 'none'
+    :param where: How where is handled - 'merge' to merge the result back into \
+        the rows that were not selected, 'overwrite' to use the result as is \
+        or 'unsupported'
+    :param wildcards: Whether wildcards in the input are expanded to column names
+    :param nested: The wrangle runs the wrangles in its wrangles parameter, \
+        so its behaviour also depends on those
+    """
+    row_local: bool = True
+    changes_row_count: bool = False
+    pure: bool = True
+    network: bool = False
+    reads: str = 'input'
+    writes: str = 'output'
+    where: str = 'merge'
+    wildcards: bool = True
+    nested: bool = False
+
+    @property
+    def whole_frame(self) -> bool:
+        """
+        The wrangle needs every row of the data at once
+        """
+        return not self.row_local
+
+    @property
+    def row_wise(self) -> bool:
+        """
+        The wrangle keeps every row and only changes its output columns,
+        so its results can be assigned back to a subset of the rows
+        """
+        return (
+            self.row_local
+            and not self.changes_row_count
+            and not self.nested
+            and self.writes == 'output'
+        )
+
+    @property
+    def supports_unique(self) -> bool:
+        """
+        The wrangle can be run on only the distinct values of the
+        columns it reads, with the results copied to the matching rows
+        """
+        return self.row_wise and self.pure and self.reads != 'none'
+
+
+# Recipe names that use forbidden python keywords
+reserved_word_replacements = {
+    "try": "Try"
+}
+
+_ROW = Capabilities()
+_NETWORK = Capabilities(network=True)
+_AI = Capabilities(network=True, pure=False)
+_NESTED = Capabilities(nested=True)
+_FRAME = Capabilities(row_local=False)
+_RESHAPE = Capabilities(
+    row_local=False,
+    changes_row_count=True,
+    reads='all',
+    writes='all',
+    where='overwrite'
+)
+_UNKNOWN = Capabilities(
+    row_local=False,
+    changes_row_count=True,
+    pure=False,
+    network=True,
+    reads='all',
+    writes='all'
+)
+
+_REGISTRY = {
+    'accordion': _NESTED,
+    'batch': _NESTED,
+    'classify': _NETWORK,
+    'clean_whitespaces': _ROW,
+    'compare.lists': _ROW,
+    'compare.text': _ROW,
+    'compute.case_when': Capabilities(reads='all'),
+    'compute.score_search_results': _ROW,
+    'concurrent': _NESTED,
+    'convert.case': _ROW,
+    'convert.data_type': _ROW,
+    'convert.fraction_to_decimal': _ROW,
+    'convert.from_json': _ROW,
+    'convert.from_yaml': _ROW,
+    'convert.to_json': _ROW,
+    'convert.to_yaml': _ROW,
+    'copy': _ROW,
+    'create.bins': _FRAME,
+    'create.column': Capabilities(reads='none'),
+    'create.embeddings': _NETWORK,
+    'create.guid': Capabilities(pure=False, reads='none'),
+    'create.hash': _ROW,
+    'create.index': Capabilities(row_local=False, reads='all'),
+    'create.jinja': Capabilities(reads='all'),
+    'create.uuid': Capabilities(pure=False, reads='none'),
+    'date_calculator': _ROW,
+    'drop': Capabilities(writes='all', where='unsupported'),
+    'explode': Capabilities(changes_row_count=True),
+    'extract.address': _NETWORK,
+    'extract.ai': _AI,
+    'extract.attributes': _NETWORK,
+    'extract.brackets': _ROW,
+    'extract.codes': _NETWORK,
+    'extract.custom': _NETWORK,
+    'extract.date_properties': _ROW,
+    'extract.date_range': Capabilities(reads='all'),
+    'extract.html': _NETWORK,
+    'extract.properties': _NETWORK,
+    'extract.regex': _ROW,
+    'filter': Capabilities(changes_row_count=True, writes='none', where='overwrite'),
+    'format.dates': _ROW,
+    'format.pad': _ROW,
+    'format.prefix': _ROW,
+    'format.price_breaks': _ROW,
+    'format.remove_duplicates': _ROW,
+    'format.significant_figures': _ROW,
+    'format.suffix': _ROW,
+    'format.trim': _ROW,
+    'generate.ai': _AI,
+    'huggingface': _NETWORK,
+    'log': Capabilities(pure=False, reads='all', writes='none'),
+    # by_matrix also reads the matrix_variables columns
+    'lookup': Capabilities(network=True, reads='all'),
+    'math': Capabilities(reads='all', wildcards=False),
+    'maths': Capabilities(reads='all', wildcards=False),
+    'matrix': Capabilities(row_local=False, changes_row_count=True, pure=False, reads='all', writes='all'),
+    'merge.coalesce': _ROW,
+    'merge.concatenate': _ROW,
+    'merge.dictionaries': _ROW,
+    'merge.key_value_pairs': Capabilities(wildcards=False),
+    'merge.lists': _ROW,
+    'merge.to_dict': _ROW,
+    'merge.to_list': _ROW,
+    'pandas.head': _RESHAPE,
+    'pandas.tail': _RESHAPE,
+    'pandas.transpose': _RESHAPE,
+    'python': Capabilities(pure=False, reads='all'),
+    'recipe': _UNKNOWN,
+    'reindex': Capabilities(row_local=False, changes_row_count=True, writes='all', where='unsupported'),
+    # Also reads the to_remove columns
+    'remove_words': Capabilities(reads='all'),
+    'rename': Capabilities(writes='all', where='unsupported', wildcards=False),
+    'replace': _ROW,
+    'round': _ROW,
+    'search.find_links': Capabilities(network=True, pure=False, reads='all'),
+    'search.retrieve_link_content': _AI,
+    'select.columns': Capabilities(writes='all', where='overwrite'),
+    'select.dictionary_element': _ROW,
+    # Inputs use element syntax such as col[0]['key'] rather than column names
+    'select.element': Capabilities(reads='all', wildcards=False),
+    'select.group_by': _RESHAPE,
+    'select.head': _RESHAPE,
+    'select.highest_confidence': _ROW,
+    'select.left': _ROW,
+    'select.length': _ROW,
+    'select.list_element': _ROW,
+    'select.right': _ROW,
+    'select.sample': Capabilities(
+        row_local=False,
+        changes_row_count=True,
+        pure=False,
+        reads='all',
+        writes='all',
+        where='overwrite'
+    ),
+    'select.substring': _ROW,
+    'select.tail': _RESHAPE,
+    'select.threshold': _ROW,
+    'similarity': _ROW,
+    'sort': Capabilities(row_local=False, reads='all', writes='all', where='overwrite'),
+    'split.dictionary': Capabilities(writes='all'),
+    'split.list': Capabilities(wildcards=False),
+    'split.text': Capabilities(wildcards=False),
+    'split.tokenize': _ROW,
+    'sql': _RESHAPE,
+    'standardize': _NETWORK,
+    'translate': _NETWORK,
+    'transpose': _RESHAPE,
+    'Try': _NESTED,
+}
+
+
+def get(wrangle: str) -> Capabilities:
+    """
+    Get the declared capabilities of a wrangle
+
+    :param wrangle: Name of the wrangle e.g. convert.case
+    :return: Capabilities. Wrangles that aren't known, including custom \
+        functions, are assumed to be able to do anything.
+    """
+    wrangle = reserved_word_replacements.get(wrangle, wrangle)
+    if wrangle in _REGISTRY:
+        capabilities = _REGISTRY[wrangle]
+    elif wrangle.split('.')[0] == 'pandas':
+        # Generic pandas methods e.g. pandas.cumsum
+        capabilities = _FRAME
+    else:
+        capabilities = _UNKNOWN
+
+    # The where lists in config may have been changed by the user
+    if wrangle in _config.where_not_implemented:
+        where = 'unsupported'
+    elif wrangle in _config.where_overwrite_output:
+        where = 'overwrite'
+    else:
+        where = 'merge'
+    if where != capabilities.where:
+        capabilities = _dataclasses.replace(capabilities, where=where)
+    return capabilities
+
+
+def register(wrangle: str, capabilities: Capabilities) -> None:
+    """
+    Declare the capabilities of a wrangle
+
+    :param wrangle: Name of the wrangle e.g. custom.my_function
+    :param capabilities: Capabilities of the wrangle
+    """
+    _REGISTRY[wrangle] = capabilities
+
+    # Keep the where lists in config up to date
+    for where, names in [
+        ('overwrite', _config.where_overwrite_output),
+        ('unsupported', _config.where_not_implemented)
+    ]:
+        if capabilities.where == where and wrangle not in names:
+            names.append(wrangle)
+        elif capabilities.where != where and wrangle in names:
+            names.remove(wrangle)
+
+
+def names(**kwargs) -> list:
+    """
+    Get the names of all wrangles with the given capabilities
+
+    >>> wrangles.capabilities.names(where='overwrite')
+
+    :param kwargs: Capabilities to match
+    :return: List of wrangle names
+    """
+    return [
+        name
+        for name, capabilities in _REGISTRY.items()
+        if all(getattr(capabilities, k) == v for k, v in kwargs.items())
+    ]
+
+
+def _nested_wrangles(params) -> list:
+    """
+    Get (wrangle, params) pairs from the wrangles parameter of a nested wrangle
+    """
+    steps = params.get('wrangles') if isinstance(params, dict) else None
+    if not isinstance(steps, list):
+        return None
+    return [
+        (wrangle, nested_params)
+        for step in steps
+        for wrangle, nested_params in (
+            step.items() if isinstance(step, dict) else [(step, {})]
+        )
+    ]
+
+
+def is_row_local(wrangle: str, params: dict = None, functions: dict = None) -> bool:
+    """
+    Check whether a wrangle, as configured, can be run on any
+    subset of the rows and give the same result for those rows
+
+    :param wrangle: Name of the wrangle
+    :param params: (Optional) Parameters for the wrangle, \
+        used to check any nested wrangles
+    :param functions: (Optional) Dictionary of named custom functions
+    """
+    if wrangle.split('.')[0] == 'custom' and wrangle not in _REGISTRY:
+        # Custom functions that receive the whole dataframe
+        # could do anything with it, others run row by row
+        try:
+            func = _get_nested_function(wrangle, None, functions or {})
+        except Exception:
+            return False
+        return 'df' not in _function_spec(func).arg_set
+
+    capabilities = get(wrangle)
+    if not capabilities.row_local:
+        return False
+
+    if capabilities.nested:
+        nested = _nested_wrangles(params)
+        if nested is None:
+            return False
+        return all(
+            is_row_local(nested_wrangle, nested_params, functions)
+            for nested_wrangle, nested_params in nested
+        )
+
+    return True
+
+
+def _flatten_columns(value) -> list:
+    """
+    Get column names from an input or output parameter
+    which may be a string, list or dict of renamed columns
+    """
+    if not isinstance(value, list):
+        value = [value]
+    columns = []
+    for item in value:
+        if isinstance(item, dict):
+            columns.extend(item.keys())
+            columns.extend(v for v in item.values() if isinstance(v, str))
+        else:
+            columns.append(item)
+    return columns
+
+
+def _expand(value, all_columns: _typing.Optional[list]) -> _typing.Optional[set]:
+    columns = _flatten_columns(value)
+    if not all(isinstance(col, str) for col in columns):
+        return None
+    if all_columns is None:
+        # Without the columns, only names without wildcards are known
+        if any('*' in col or col.lower().startswith('regex:') for col in columns):
+            return None
+        return set(columns)
+    try:
+        return set(_wildcard_expansion(all_columns, columns))
+    except (KeyError, ValueError):
+        return None
+
+
+def columns_read(wrangle: str, params: dict, all_columns: list = None) -> _typing.Optional[set]:
+    """
+    Get the columns a wrangle will read
+
+    :param wrangle: Name of the wrangle
+    :param params: Parameters for the wrangle
+    :param all_columns: (Optional) Columns of the dataframe the wrangle will run on. \
+        If not provided, inputs that use wildcards can't be resolved.
+    :return: Set of column names, or None if any column may be read
+    """
+    capabilities = get(wrangle)
+    params = params or {}
+    if capabilities.reads == 'all' or capabilities.nested or 'where' in params:
+        return None
+    if capabilities.reads == 'none':
+        return set()
+    if 'input' not in params:
+        return None
+    if not capabilities.wildcards:
+        columns = _flatten_columns(params['input'])
+        return set(columns) if all(isinstance(col, str) for col in columns) else None
+    return _expand(params['input'], all_columns)
+
+
+def columns_written(wrangle: str, params: dict, all_columns: list) -> _typing.Optional[set]:
+    """
+    Get the columns a wrangle will create or modify
+
+    :param wrangle: Name of the wrangle
+    :param params: Parameters for the wrangle
+    :param all_columns: Columns of the dataframe the wrangle will run on
+    :return: Set of column names, or None if any column may be written
+    """
+    capabilities = get(wrangle)
+    params = params or {}
+    if capabilities.writes == 'all' or capabilities.nested or capabilities.changes_row_count:
+        return None
+    if capabilities.writes == 'none':
+        return set()
+
+    declared = params.get('output', params.get('input'))
+    if declared is None:
+        return None
+    columns = _flatten_columns(declared)
+    if not all(isinstance(col, str) for col in columns):
+        return None
+    if any('*' in col or col.lower().startswith('regex:') for col in columns):
+        if 'output' in params:
+            # Wildcard outputs are named based on the data
+            return None
+        return _expand(columns, all_columns)
+    return set(columns)
@@ -0,0 +1,180 @@
+"""
+Save the data between wrangles so that a failed recipe can be resumed
+
+Checkpoints are enabled with the checkpoint section of a recipe.
+
+>>> checkpoint:
+>>>   path: ./checkpoints
+>>>   wrangles:
+>>>     - extract.ai
+
+After each selected wrangle, the data is saved to the directory, keyed
+by a hash of the input data and the wrangles run so far. If the recipe
+is then run with resume=True, the data from the latest checkpoint is
+loaded and only the wrangles after it are run.
+
+>>> df = wrangles.recipe.run('recipe.wrgl.yml', resume=True)
+
+Within batch, each batch is saved separately so that only
+the batches that did not complete need to be run again.
+
+Checkpoints are saved as pickle files to preserve the exact data,
+so only resume from directories you trust.
+"""
+import contextvars as _contextvars
+import hashlib as _hashlib
+import json as _json
+import logging as _logging
+import os as _os
+import typing as _typing
+import uuid as _uuid
+
+import pandas as _pd
+
+
+# The checkpoints for the current run. This is a context variable
+# so that it carries into nested recipes run by batch.
+_ACTIVE_CHECKPOINTS = _contextvars.ContextVar('wrangles_checkpoints', default=None)
+
+
+def fingerprint(df: _pd.DataFrame) -> str:
+    """
+    Get a hash identifying the contents of a dataframe
+
+    :param df: Dataframe
+    :return: Hex digest
+    """
+    digest = _hashlib.sha256()
+    digest.update(_json.dumps(
+        [[str(col), str(dtype)] for col, dtype in df.dtypes.items()]
+    ).encode())
+    try:
+        values = _pd.util.hash_pandas_object(df, index=True)
+    except TypeError:
+        # Unhashable values such as lists or dicts
+        values = _pd.util.hash_pandas_object(df.astype(str), index=True)
+    digest.update(values.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _step_name(step) -> str:
+    if isinstance(step, dict) and step:
+        return list(step.keys())[0]
+    return str(step)
+
+
+class Checkpoints:
+    """
+    A directory of saved dataframes, keyed by the input data
+    and the wrangles that have been run on it
+    """
+    def __init__(self, path: str, wrangles: list = None, resume: bool = False):
+        """
+        :param path: Directory to save the checkpoints to
+        :param wrangles: (Optional) Names of the wrangles to save the data after. \
+            If not provided, the data is saved after every wrangle.
+        :param resume: Load existing checkpoints rather than running the wrangles again
+        """
+        self.path = str(path)
+        self.wrangles = None if wrangles is None else list(wrangles)
+        self.resume = resume
+
+    def key(self, previous: str, index: int, step) -> str:
+        """
+        Get the key for the data after a wrangle
+
+        :param previous: Key or fingerprint of the data before the wrangle
+        :param index: Position of the wrangle in the recipe
+        :param step: Definition of the wrangle
+        :return: Hex digest
+        """
+        return _hashlib.sha256(
+            _json.dumps([previous, index, step], sort_keys=True, default=str).encode()
+        ).hexdigest()
+
+    def selected(self, step) -> bool:
+        """
+        Check whether the data should be saved after a wrangle.
+        Wrangles that run other wrangles are selected if any of those are.
+
+        :param step: Definition of the wrangle
+        """
+        if self.wrangles is None:
+            return True
+        if _step_name(step) in self.wrangles:
+            return True
+        params = list(step.values())[0] if isinstance(step, dict) and step else None
+        nested = params.get('wrangles') if isinstance(params, dict) else None
+        return isinstance(nested, list) and any(self.selected(x) for x in nested)
+
+    def _file(self, key: str) -> str:
+        return _os.path.join(self.path, f"{key}.pkl")
+
+    def load(self, key: str) -> _typing.Optional[_pd.DataFrame]:
+        """
+        Load the data saved for a key
+
+        :param key: Key of the checkpoint
+        :return: Dataframe, or None if there is no checkpoint or it can't be read
+        """
+        if not _os.path.exists(self._file(key)):
+            return None
+        try:
+            return _pd.read_pickle(self._file(key))
+        except Exception as e:
+            _logging.warning(f": Checkpoint :: Unable to load {self._file(key)} :: {e}")
+            return None
+
+    def save(self, key: str, df: _pd.DataFrame) -> None:
+        """
+        Save the data for a key
+
+        :param key: Key of the checkpoint
+        :param df: Dataframe to save
+        """
+        _os.makedirs(self.path, exist_ok=True)
+        # Write to a temporary file first so that an interrupted
+        # save can't leave behind a partial checkpoint
+        temp = self._file(f"{key}.{_uuid.uuid4().hex}.tmp")
+        try:
+            df.to_pickle(temp)
+            _os.replace(temp, self._file(key))
+        finally:
+            if _os.path.exists(temp):
+                _os.remove(temp)
+
+    def __enter__(self):
+        self._token = _ACTIVE_CHECKPOINTS.set(self)
+        return self
+
+    def __exit__(self, *_):
+        _ACTIVE_CHECKPOINTS.reset(self._token)
+
+
+def active() -> _typing.Optional[Checkpoints]:
+    """
+    Get the checkpoints for the current recipe run, if any
+    """
+    return _ACTIVE_CHECKPOINTS.get()
+
+
+def from_setting(settings, resume: bool = False) -> _typing.Optional[Checkpoints]:
+    """
+    Get the checkpoints for a recipe from its checkpoint section
+
+    :param settings: The checkpoint section of the recipe
+    :param resume: Load existing checkpoints
+    :return: Checkpoints, or None if not enabled
+    """
+    if not settings:
+        if resume:
+            _logging.warning(": Checkpoint :: resume has no effect without a checkpoint section")
+        return None
+    if isinstance(settings, str):
+        settings = {'path': settings}
+    if not isinstance(settings, dict) or 'path' not in settings:
+        raise ValueError('checkpoint requires a path')
+    wrangles = settings.get('wrangles')
+    if isinstance(wrangles, str):
+        wrangles = [wrangles]
+    return Checkpoints(settings['path'], wrangles, resume)
@@ -25,33 +25,52 @@ class keycloak():
     realm = 'wrwx'
     client_id = 'services'
 
-# When using where, these Wrangles 
-# overwrite the output rather than
-# trying to merge the contents
-# back to the original dataframe 
-where_overwrite_output = [
-    'pandas.transpose',
-    'transpose',
-    'filter',
-    'sql',
-    'select.group_by',
-    'select.sample',
-    'select.columns',
-    'select.head',
-    'pandas.head',
-    'select.tail',
-    'pandas.tail',
-    'sort'
-]
-
-# Wrangles that don't work with where
-where_not_implemented = [
-    'drop',
-    'rename',
-    'reindex'
-]
-
-# Recipe names that use forbidden python keywords
-reserved_word_replacements = {
-    "try": "Try"
-}
+# When to replace NaN values created by wrangles
+# 'step' - after each wrangle, for only the columns it changed
+# 'write' - once all wrangles have run, before the data is written
+nan_cleanup = _os.environ.get('WRANGLES_NAN_CLEANUP', 'step')
+
+# Default engine for the sql wrangle - sqlite or duckdb
+sql_engine = _os.environ.get('WRANGLES_SQL_ENGINE', 'sqlite')
+
+# Maximum number of threads shared by recipes for running work concurrently
+# e.g. batch, concurrent, matrix, parallel wrangles and timeouts
+max_threads = int(_os.environ.get('WRANGLES_MAX_THREADS', 64))
+
+# Number of batches sent to the Wrangles API at once by each wrangle
+# Can be overridden by the concurrency parameter of the wrangle
+batch_concurrency = int(_os.environ.get('WRANGLES_BATCH_CONCURRENCY', 4))
+
+# Batches sent to the Wrangles API are made smaller to keep each request
+# within this payload size and response time, up to the wrangle's batch size
+batch_target_bytes = int(_os.environ.get('WRANGLES_BATCH_TARGET_BYTES', 1000000))
+batch_target_seconds = float(_os.environ.get('WRANGLES_BATCH_TARGET_SECONDS', 30))
+
+# Seconds to cache model metadata and content fetched from the Wrangles API
+# Set to 0 to fetch them every time they are used
+model_cache_seconds = float(_os.environ.get('WRANGLES_MODEL_CACHE_SECONDS', 300))
+
+# Kept for backwards compatibility. These are derived from how each
+# wrangle uses the dataframe, as declared in wrangles.capabilities.
+# They are built once when first used and may be changed.
+#   reserved_word_replacements - Recipe names that use forbidden python keywords
+#   where_overwrite_output - Wrangles that overwrite the output when using where
+#     rather than trying to merge the contents back to the original dataframe
+#   where_not_implemented - Wrangles that don't work with where
+_DERIVED = ['reserved_word_replacements', 'where_overwrite_output', 'where_not_implemented']
+
+
+def __getattr__(name):
+    # Capabilities are only loaded when first needed,
+    # so config doesn't depend on any other modules
+    if name not in _DERIVED:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from . import capabilities
+    if name == 'reserved_word_replacements':
+        value = capabilities.reserved_word_replacements
+    elif name == 'where_overwrite_output':
+        value = capabilities.names(where='overwrite')
+    else:
+        value = capabilities.names(where='unsupported')
+    # Keep the first one built so changes aren't lost
+    return globals().setdefault(name, value)
@@ -1,31 +1,50 @@
 """
 Connectors to read/write from external systems
+
+Each connector is imported when it is first used,
+so that importing wrangles stays fast.
 """
+import importlib as _importlib
+
+
+_CONNECTORS = [
+    'akeneo',
+    'access',
+    'ckan',
+    'concurrent',
+    'duckdb',
+    'excel',
+    'file',
+    'http',
+    'memory',
+    'mssql',
+    'mysql',
+    'notification',
+    'postgres',
+    'pricefx',
+    'test',
+    'ssh',
+    'sftp',
+    'sqlite',
+    'matrix',
+    'mongodb',
+    'salesforce',
+    'recipe',
+    's3',
+    'train',
+    'jinja',
+    '_formatting',
+    'input',
+]
+
+
+def __getattr__(name: str):
+    if name in _CONNECTORS:
+        # Importing the submodule also sets it as an
+        # attribute, so this only runs the first time
+        return _importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-from . import akeneo
-from . import access
-from . import ckan
-from . import concurrent
-from . import duckdb
-from . import excel
-from . import file
-from . import http
-from . import memory
-from . import mssql
-from . import mysql
-from . import notification
-from . import postgres
-from . import pricefx
-from . import test
-from . import ssh
-from . import sftp
-from . import sqlite
-from . import matrix
-from . import mongodb
-from . import salesforce
-from . import recipe
-from . import s3
-from . import train
-from . import jinja
-from . import _formatting
-from . import input
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_CONNECTORS))
@@ -1,4 +1,7 @@
-import polars as pl
+from ..utils import LazyLoader as _LazyLoader
+
+# Only needed when formatting Excel files
+pl = _LazyLoader('polars')
 
 def file_format(
         df,
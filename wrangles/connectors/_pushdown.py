@@ -0,0 +1,138 @@
+"""
+Reduce the rows and columns read by database connectors to those a recipe needs
+"""
+import typing as _typing
+
+
+def quote_double(column: str) -> str:
+    return '"' + str(column).replace('"', '""') + '"'
+
+
+def quote_backtick(column: str) -> str:
+    return '`' + str(column).replace('`', '``') + '`'
+
+
+def quote_bracket(column: str) -> str:
+    return '[' + str(column).replace(']', ']]') + ']'
+
+
+def projection(available: list, needed_columns: list) -> _typing.Optional[list]:
+    """
+    Get the columns to keep from those available.
+
+    Column names in where conditions are matched case-insensitively,
+    so if a needed name only matches an available column with
+    different case, all of the columns are kept.
+
+    :param available: Columns available from the source
+    :param needed_columns: Columns the recipe needs
+    :return: List of columns to keep, or None if all should be kept
+    """
+    needed = set(needed_columns)
+    lowered = {str(col).lower() for col in needed}
+    if any(col not in needed and str(col).lower() in lowered for col in available):
+        return None
+
+    keep = [col for col in available if col in needed]
+    if len(keep) == len(available):
+        return None
+    # Keep a column so that the number of rows is preserved
+    return keep or available[:1]
+
+
+def _filter_command(
+    query: str,
+    params,
+    row_filters: list,
+    quote: _typing.Callable[[str], str],
+    paramstyle: str
+) -> tuple:
+    """
+    Wrap a query with a WHERE for the filters using positional parameters
+    """
+    placeholder = '%s' if paramstyle == 'format' else '?'
+    if paramstyle == 'format' and not params:
+        # Without parameters, the driver doesn't treat % as special
+        query = query.replace('%', '%%')
+
+    conditions = []
+    values = list(params or [])
+    for column, _, options in row_filters:
+        conditions.append(
+            f"{quote(column)} IN ({', '.join([placeholder] * len(options))})"
+        )
+        values.extend(options)
+
+    return (
+        f"SELECT * FROM ({query}) AS wrwx_filter WHERE {' AND '.join(conditions)}",
+        values
+    )
+
+
+def rewrite(
+    command: str,
+    params,
+    get_columns: _typing.Callable[[str, _typing.Any], list],
+    needed_columns: _typing.Optional[list] = None,
+    row_filters: _typing.Optional[list] = None,
+    quote: _typing.Callable[[str], str] = quote_double,
+    paramstyle: str = 'qmark'
+) -> tuple:
+    """
+    Rewrite a SELECT command to only return the needed rows and columns.
+
+    The command is checked by running it wrapped so that no
+    rows are returned, which also gives the columns available.
+    If anything about the command is unexpected, it is returned unchanged.
+    Rows that don't match the filters may still be returned,
+    so the data must still be filtered afterwards.
+
+    :param command: SQL command
+    :param params: Parameters for the command
+    :param get_columns: Function to run a command with parameters and return the names of the columns
+    :param needed_columns: (Optional) Columns the recipe needs
+    :param row_filters: (Optional) List of (column, 'in', values) the rows must match
+    :param quote: Function to quote a column name
+    :param paramstyle: Placeholder used by the driver - qmark (?) or format (%s)
+    :return: Tuple of the SQL command and parameters
+    """
+    if (not needed_columns and not row_filters) or not isinstance(command, str):
+        return command, params
+
+    query = command.strip().rstrip(';').strip()
+    if not query[:6].lower() == 'select' or ';' in query:
+        # Table names, multiple statements etc.
+        return command, params
+
+    def probe(query, params):
+        try:
+            return list(get_columns(
+                f"SELECT * FROM ({query}) AS wrwx_projection WHERE 1=0",
+                params
+            ))
+        except Exception:
+            return None
+
+    available = None
+    if row_filters and (params is None or isinstance(params, (list, tuple))):
+        filtered, filtered_params = _filter_command(query, params, row_filters, quote, paramstyle)
+        available = probe(filtered, filtered_params)
+        if available is not None:
+            command, query, params = filtered, filtered, filtered_params
+
+    if not needed_columns:
+        return command, params
+
+    if available is None:
+        available = probe(query, params)
+    if available is None or len(set(available)) != len(available):
+        return command, params
+
+    keep = projection(available, needed_columns)
+    if keep is None:
+        return command, params
+
+    return (
+        f"SELECT {', '.join(quote(col) for col in keep)} FROM ({query}) AS wrwx_projection",
+        params
+    )
@@ -8,8 +8,8 @@ for detailed REST API docs.
 """
 import json as _json
 import pandas as _pd
-import requests as _requests
 import logging as _logging
+from ..utils import http_request as _http_request
 
 
 _schema = {}
@@ -51,7 +51,8 @@ def read(
     _logging.info(f": Reading data from Akeneo :: {host} / {source}")
     parameters = {**(parameters or {}), 'limit': 100}
 
-    auth_response = _requests.post(
+    auth_response = _http_request(
+        'POST',
         f"{host}/api/oauth/v1/token",
         auth = (client_id, client_secret),
         json = {
@@ -78,7 +79,7 @@ def read(
     params = parameters
 
     while url:
-        response = _requests.get(url, params=params, headers=headers)
+        response = _http_request('GET', url, params=params, headers=headers)
         if not response.ok:
             json_response = response.json()
             raise ValueError(f"Status Code: {json_response.get('code', response.status_code)} Message: {json_response.get('message', response.text)}")
@@ -192,7 +193,8 @@ def write(
     """
     _logging.info(f": Writing data to Akeneo :: {host} / {source}")
 
-    auth_response = _requests.post(
+    auth_response = _http_request(
+        'POST',
         f"{host}/api/oauth/v1/token",
         auth=(client_id, client_secret),
         json={
@@ -216,7 +218,8 @@ def write(
     payload = '\n'.join([_json.dumps(row) for row in df.to_dict(orient='records')])
 
     # Upload data
-    response = _requests.patch(
+    response = _http_request(
+        'PATCH',
         f"{host}/api/rest/v1/{source}",
         headers={
             'Content-type': 'application/vnd.akeneo.collection+json',
@@ -2,15 +2,16 @@ import logging as _logging
 from io import BytesIO as _BytesIO
 from typing import Union as _Union
 import pandas as _pd
-import requests as _requests
 from . import file as _file
+from ..utils import http_request as _http_request
 
 
 _schema = {}
 
 
 def _get_packages_in_dataset(host, dataset, api_key):
-    response = _requests.get(
+    response = _http_request(
+        'GET',
         url = f"{host}/api/3/action/package_show?id={dataset}",
         headers={'Authorization': api_key}
     )
@@ -46,7 +47,7 @@ def read(host: str, dataset: str, file: str, api_key: str = None, **kwargs) -> _
         raise ValueError('File not found in dataset')
     
     # Download the requested data
-    response = _requests.get(packages[file]["url"], headers={'Authorization': api_key})
+    response = _http_request('GET', packages[file]["url"], headers={'Authorization': api_key})
     file_io = _BytesIO(response.content)
     df = _file.read(file, file_object=file_io, **kwargs)    
  
@@ -93,14 +94,16 @@ def write(df: _pd.DataFrame, host: str, dataset: str, file: str, api_key: str, *
     packages = _get_packages_in_dataset(host, dataset, api_key)
 
     if file in packages.keys():
-        response = _requests.post(
+        response = _http_request(
+            'POST',
             url = f"{host}/api/action/resource_update",
             data = {"id": packages[file]["id"]},
             headers = {"Authorization": api_key},
             files = {'upload': (file, memory_file.getvalue())}
         )
     else:
-        response = _requests.post(
+        response = _http_request(
+            'POST',
             url = f"{host}/api/action/resource_create",
             data={
                 "package_id": dataset,
@@ -205,7 +208,7 @@ class download:
                 raise ValueError(f'File {fname} not found in dataset')
             
             # Download the requested data
-            response = _requests.get(packages[fname]["url"], headers={'Authorization': api_key})
+            response = _http_request('GET', packages[fname]["url"], headers={'Authorization': api_key})
 
             with open(output_fname, "wb") as f:
                 f.write(_BytesIO(response.content).getbuffer())
@@ -279,14 +282,16 @@ class upload:
                 memory_file = _BytesIO(f.read())
 
             if output_fname in packages.keys():
-                response = _requests.post(
+                response = _http_request(
+                    'POST',
                     url = f"{host}/api/action/resource_update",
                     data = {"id": packages[output_fname]["id"]},
                     headers = {"Authorization": api_key},
                     files = {'upload': (output_fname, memory_file.getvalue())}
                 )
             else:
-                response = _requests.post(
+                response = _http_request(
+                    'POST',
                     url = f"{host}/api/action/resource_create",
                     data={
                         "package_id": dataset,
@@ -5,7 +5,6 @@ other write connectors concurrently.
 import pandas as _pd
 import wrangles as _wrangles
 import concurrent.futures as _futures
-import contextvars as _contextvars
 import types as _types
 from typing import Union as _Union
 
@@ -32,34 +31,28 @@ def run(
         variables = {}
     if use_multiprocessing:
         # Not publicly documented. Use at your own risk.
-        pool_executor = _futures.ProcessPoolExecutor
-    else:
-        pool_executor = _futures.ThreadPoolExecutor
-
-    with pool_executor(max_workers=max_concurrency) as executor:
-        futures = []
-        for run_definition in run:
-            if use_multiprocessing:
-                future = executor.submit(
+        with _futures.ProcessPoolExecutor(max_workers=max_concurrency) as executor:
+            futures = [
+                executor.submit(
                     _wrangles.recipe.run,
                     recipe={'run': {"on_start": [run_definition]}},
                     variables=variables,
                     functions=functions
                 )
-            else:
-                future = executor.submit(
-                    _contextvars.copy_context().run,
-                    _wrangles.recipe.run,
-                    {'run': {"on_start": [run_definition]}},
-                    variables,
-                    None,
-                    functions
-                )
-            futures.append(future)
-        
-        # Wait for all futures to complete
-        for future in futures:
-            future.result()
+                for run_definition in run
+            ]
+            # Wait for all futures to complete
+            for future in futures:
+                future.result()
+    else:
+        _wrangles.scheduler.map(
+            _wrangles.recipe.run,
+            [{'run': {"on_start": [run_definition]}} for run_definition in run],
+            [variables] * len(run),
+            [None] * len(run),
+            [functions] * len(run),
+            max_workers=max_concurrency
+        )
 
 _schema['run'] = """
 type: object
@@ -101,15 +94,10 @@ def read(
     """
     if variables is None:
       variables = {}
+    recipes = [{'read': [read_definition]} for read_definition in read]
     if use_multiprocessing:
         # Not publicly documented. Use at your own risk.
-        pool_executor = _futures.ProcessPoolExecutor
-    else:
-        pool_executor = _futures.ThreadPoolExecutor
-    
-    with pool_executor(max_workers=max_concurrency) as executor:
-        recipes = [{'read': [read_definition]} for read_definition in read]
-        if use_multiprocessing:
+        with _futures.ProcessPoolExecutor(max_workers=max_concurrency) as executor:
             dfs = list(executor.map(
                 _wrangles.recipe.run,
                 recipes,
@@ -117,19 +105,15 @@ def read(
                 [None for _ in read],
                 [functions for _ in read]
             ))
-        else:
-            futures = [
-                executor.submit(
-                    _contextvars.copy_context().run,
-                    _wrangles.recipe.run,
-                    recipe,
-                    variables,
-                    None,
-                    functions
-                )
-                for recipe in recipes
-            ]
-            dfs = [future.result() for future in futures]
+    else:
+        dfs = _wrangles.scheduler.map(
+            _wrangles.recipe.run,
+            recipes,
+            [variables for _ in read],
+            [None for _ in read],
+            [functions for _ in read],
+            max_workers=max_concurrency
+        )
 
     return dfs
 
@@ -179,35 +163,29 @@ def write(
         variables = {}
     if use_multiprocessing:
         # Not publicly documented. Use at your own risk.
-        pool_executor = _futures.ProcessPoolExecutor
-    else:
-        pool_executor = _futures.ThreadPoolExecutor
-
-    with pool_executor(max_workers=max_concurrency) as executor:
-        futures = []
-        for write_definition in write:
-            if use_multiprocessing:
-                future = executor.submit(
+        with _futures.ProcessPoolExecutor(max_workers=max_concurrency) as executor:
+            futures = [
+                executor.submit(
                     _wrangles.recipe.run,
                     recipe={'write': [write_definition]},
                     dataframe=df.copy(),
                     variables=variables,
                     functions=functions
                 )
-            else:
-                future = executor.submit(
-                    _contextvars.copy_context().run,
-                    _wrangles.recipe.run,
-                    {'write': [write_definition]},
-                    variables,
-                    df.copy(),
-                    functions
-                )
-            futures.append(future)
-        
-        # Wait for all futures to complete
-        for future in futures:
-            future.result()
+                for write_definition in write
+            ]
+            # Wait for all futures to complete
+            for future in futures:
+                future.result()
+    else:
+        _wrangles.scheduler.map(
+            _wrangles.recipe.run,
+            [{'write': [write_definition]} for write_definition in write],
+            [variables] * len(write),
+            [df.copy() for _ in write],
+            [functions] * len(write),
+            max_workers=max_concurrency
+        )
 
 _schema['write'] = """
 type: object
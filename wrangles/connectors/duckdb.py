@@ -10,6 +10,7 @@ from ..utils import (
     LazyLoader as _LazyLoader,
     wildcard_expansion as _wildcard_expansion,
 )
+from . import _pushdown
 
 
 _duckdb = _LazyLoader('duckdb')
@@ -29,6 +30,8 @@ def read(
     command: str,
     columns: _Union[str, list] = None,
     params: _Union[list, tuple, dict] = None,
+    needed_columns: list = None,
+    row_filters: list = None,
     **kwargs
 ) -> _pd.DataFrame:
     """
@@ -41,10 +44,21 @@ def read(
     :param command: SQL command to select data.
     :param columns: (Optional) Subset of columns to be returned. This is less efficient than specifying in the SQL command.
     :param params: (Optional) Variables to pass to a parameterized query.
+    :param needed_columns: (Optional) Columns that are needed. Set by recipes so that other columns are not read.
+    :param row_filters: (Optional) List of (column, 'in', values) that rows must match. Set by recipes so that rows that will be filtered out are not read.
     """
     _logging.info(f": Reading data from DuckDB :: {database}")
 
     with _duckdb.connect(database=database, **kwargs) as conn:
+        command, params = _pushdown.rewrite(
+            command,
+            params,
+            lambda probe, probe_params: [
+                x[0] for x in conn.execute(probe, probe_params or ()).description
+            ],
+            needed_columns,
+            row_filters
+        )
         df = conn.execute(command, params or ()).fetchdf()
 
     if columns is not None:
@@ -15,6 +15,7 @@ import os as _os
 import re as _re
 from ..utils import wildcard_expansion as _wildcard_expansion
 from ._formatting import file_format as _file_format
+from . import _pushdown
 
 
 _schema = {}
@@ -39,10 +40,123 @@ def _remove_illegal_characters(df: _pd.DataFrame) -> _pd.DataFrame:
     return df.map(_clean_cell_value)
 
 
+def _needed_set(needed_columns: list, columns) -> set:
+    needed = set(needed_columns)
+    if columns is not None:
+        # Any columns requested directly must still be read
+        needed.update([columns] if isinstance(columns, str) else columns)
+    return needed
+
+
+def _needed_lower(needed_columns: list, columns) -> set:
+    # Column names in where conditions are matched case-insensitively
+    return {str(col).lower() for col in _needed_set(needed_columns, columns)}
+
+
+def _needed_usecols(needed_columns: list, columns, kwargs: dict):
+    """
+    Get a usecols function that only reads the needed columns,
+    or None if all the columns should be read
+    """
+    if not needed_columns or any(k in kwargs for k in ['usecols', 'names', 'header', 'index_col']):
+        return None
+    needed = _needed_lower(needed_columns, columns)
+    first = []
+
+    def usecols(column):
+        # Keep the first column in case none of the others are needed,
+        # so that the number of rows is preserved
+        if not first:
+            first.append(column)
+        return str(column).lower() in needed or column == first[0]
+    return usecols
+
+
+def _drop_unneeded_first(df: _pd.DataFrame, needed_columns: list, columns) -> _pd.DataFrame:
+    """
+    Drop the first column kept by usecols if other needed columns were found
+    """
+    if len(df.columns) > 1 and str(df.columns[0]).lower() not in _needed_lower(needed_columns, columns):
+        return df.iloc[:, 1:]
+    return df
+
+
+def _needed_parquet_columns(needed_columns: list, columns, file_object, kwargs: dict):
+    """
+    Get the list of columns to read from a parquet file,
+    or None if all the columns should be read
+    """
+    if not needed_columns or 'columns' in kwargs:
+        return None
+    needed = _needed_set(needed_columns, columns)
+    try:
+        available = _pq.ParquetFile(file_object).schema_arrow.names
+    finally:
+        if hasattr(file_object, 'seek'):
+            file_object.seek(0)
+    keep = _pushdown.projection(available, needed)
+    if keep is None:
+        return None
+    return [col for col in keep if not col.startswith('__index_level_')] or available[:1]
+
+def _parquet_filters(row_filters: list, file_object, kwargs: dict):
+    """
+    Get the filters to pass to pyarrow when reading a parquet
+    file, so that row groups that can't match are skipped.
+    Only filters where the values match the type of the column are used.
+    """
+    if not row_filters or 'filters' in kwargs:
+        return None
+    try:
+        schema = _pq.ParquetFile(file_object).schema_arrow
+    finally:
+        if hasattr(file_object, 'seek'):
+            file_object.seek(0)
+
+    filters = []
+    for column, op, values in row_filters:
+        if column not in schema.names:
+            continue
+        dtype = schema.field(column).type
+        if _pa.types.is_string(dtype) or _pa.types.is_large_string(dtype):
+            valid = all(isinstance(x, str) for x in values)
+        elif _pa.types.is_integer(dtype):
+            valid = all(isinstance(x, int) and not isinstance(x, bool) for x in values)
+        elif _pa.types.is_floating(dtype):
+            valid = all(
+                isinstance(x, (int, float)) and not isinstance(x, bool)
+                for x in values
+            )
+        else:
+            valid = False
+        if valid:
+            filters.append((column, op, list(values)))
+    return filters or None
+
+
+def _file_from_dict(name, file_object):
+    """
+    Get the name and file object if a file was passed
+    as an object with a name, base64 data and mimeType
+    """
+    if (
+        isinstance(name, dict) and
+        all(x in name for x in ['name', 'data', 'mimeType'])
+    ):
+        # User passed a file as a object
+        file_object = _BytesIO(
+            _base64.b64decode(name['data'])
+        )
+        name = name['name']
+    return name, file_object
+
+
 def read(
     name: str,
     columns: _Union[str, list] = None,
     file_object = None,
+    needed_columns: list = None,
+    row_filters: list = None,
     **kwargs
     ) -> _pd.DataFrame:
     """
@@ -62,6 +176,8 @@ def read(
     :param name: Name of the file to import
     :param columns: (Optional) Subset of the columns to be read. If not provided, all columns will be included
     :param file_object: (Optional) File object to read. If provided, this will be read instead of from the file system. A name is still required to infer the file type.
+    :param needed_columns: (Optional) Columns that are needed. Set by recipes so that other columns are not read. Used for Excel, CSV and Parquet files.
+    :param row_filters: (Optional) List of (column, 'in', values) that rows must match. Set by recipes so that row groups of Parquet files that will be filtered out are not read.
     :param kwargs: (Optional) Named arguments to pass to respective pandas function.
     :return: A Pandas dataframe of the imported data.
     """
@@ -69,15 +185,7 @@ def read(
     if isinstance(name, _os.PathLike):
         name = str(name)
 
-    if (
-        isinstance(name, dict) and
-        all(x in name for x in ['name', 'data', 'mimeType'])
-    ):
-        # User passed a file as a object
-        file_object = _BytesIO(
-            _base64.b64decode(name['data'])
-        )
-        name = name['name']
+    name, file_object = _file_from_dict(name, file_object)
 
     _logging.info(f": Reading data from file :: {name}")
     
@@ -96,9 +204,19 @@ def read(
     # Open appropriate file type
     if name.split('.')[-1] in ['xlsx', 'xlsm', 'xls']:
         if 'dtype' not in kwargs.keys(): kwargs['dtype'] = 'object'
+        usecols = _needed_usecols(needed_columns, columns, kwargs)
+        if usecols is not None:
+            kwargs['usecols'] = usecols
         df = _pd.read_excel(file_object, **kwargs).fillna('')
+        if usecols is not None:
+            df = _drop_unneeded_first(df, needed_columns, columns)
     elif name.split('.')[-1] in ['csv', 'txt'] or '.'.join(name.split('.')[-2:]) in ['csv.gz', 'txt.gz']:
+        usecols = _needed_usecols(needed_columns, columns, kwargs)
+        if usecols is not None:
+            kwargs['usecols'] = usecols
         df = _pd.read_csv(file_object, **kwargs).fillna('')
+        if usecols is not None:
+            df = _drop_unneeded_first(df, needed_columns, columns)
     elif name.split('.')[-1] in ['json'] or '.'.join(name.split('.')[-2:]) in ['json.gz']:
         df = _pd.read_json(file_object, **kwargs).fillna('')
     elif name.split('.')[-1] in ['jsonl'] or '.'.join(name.split('.')[-2:]) in ['jsonl.gz']:
@@ -113,7 +231,20 @@ def read(
     ):
         df = _pd.read_pickle(file_object, **kwargs).fillna('')
     elif name.split('.')[-1] in ['parquet']:
-        df = _pd.read_parquet(file_object, **kwargs).fillna('')
+        parquet_columns = _needed_parquet_columns(needed_columns, columns, file_object, kwargs)
+        if parquet_columns is not None:
+            kwargs['columns'] = parquet_columns
+        parquet_filters = _parquet_filters(row_filters, file_object, kwargs)
+        if parquet_filters is not None:
+            try:
+                df = _pd.read_parquet(file_object, filters=parquet_filters, **kwargs).fillna('')
+            except _pa.ArrowException:
+                # The rows are filtered again afterwards, so this is only an optimization
+                if hasattr(file_object, 'seek'):
+                    file_object.seek(0)
+                df = _pd.read_parquet(file_object, **kwargs).fillna('')
+        else:
+            df = _pd.read_parquet(file_object, **kwargs).fillna('')
     else:
       # If file type is not recognised
       raise ValueError(f"File type '{name.split('.')[-1]}' is not supported by the file connector.")
@@ -129,6 +260,80 @@ def read(
 
     return df
 
+def read_chunks(
+    name: str,
+    chunk_size: int,
+    columns: _Union[str, list] = None,
+    file_object = None,
+    needed_columns: list = None,
+    **kwargs
+):
+    """
+    Read a file in chunks of rows, so that the whole file
+    does not need to be held in memory at once.
+    This is used by recipes in streaming mode.
+
+    Supports CSV (.csv, .txt), JSONL (.jsonl) and Parquet (.parquet) files.
+
+    >>> for chunk in wrangles.connectors.file.read_chunks('myfile.csv', 100000):
+    >>>     ...
+
+    :param name: Name of the file to import
+    :param chunk_size: Number of rows per chunk
+    :param columns: (Optional) Subset of the columns to be read. If not provided, all columns will be included
+    :param file_object: (Optional) File object to read. If provided, this will be read instead of from the file system. A name is still required to infer the file type.
+    :param needed_columns: (Optional) Columns that are needed. Set by recipes so that other columns are not read. Used for CSV and Parquet files.
+    :param kwargs: (Optional) Named arguments to pass to respective pandas function.
+    :return: A generator of Pandas dataframes
+    """
+    if isinstance(name, _os.PathLike):
+        name = str(name)
+
+    name, file_object = _file_from_dict(name, file_object)
+
+    if file_object is None:
+        file_object = name
+    elif str(name).lower().endswith('gz') and 'compression' not in kwargs:
+        kwargs['compression'] = 'gzip'
+
+    if kwargs.get('drop_empty'):
+        raise NotImplementedError("drop_empty requires reading the whole file")
+    kwargs.pop('drop_empty', None)
+
+    usecols = None
+
+    if name.split('.')[-1] in ['csv', 'txt'] or '.'.join(name.split('.')[-2:]) in ['csv.gz', 'txt.gz']:
+        usecols = _needed_usecols(needed_columns, columns, kwargs)
+        if usecols is not None:
+            kwargs['usecols'] = usecols
+        chunks = _pd.read_csv(file_object, chunksize=chunk_size, **kwargs)
+    elif name.split('.')[-1] in ['jsonl'] or '.'.join(name.split('.')[-2:]) in ['jsonl.gz']:
+        kwargs['lines'] = True
+        kwargs['orient'] = 'records'
+        chunks = _pd.read_json(file_object, chunksize=chunk_size, **kwargs)
+    elif name.split('.')[-1] in ['parquet'] and not kwargs:
+        parquet_columns = _needed_parquet_columns(needed_columns, columns, file_object, kwargs)
+        chunks = (
+            batch.to_pandas()
+            for batch in _pq.ParquetFile(file_object).iter_batches(
+                batch_size=chunk_size,
+                columns=parquet_columns
+            )
+        )
+    else:
+        raise NotImplementedError(f"File type '{name.split('.')[-1]}' can't be read in chunks")
+
+    _logging.info(f": Reading data from file in chunks :: {name}")
+
+    for chunk in chunks:
+        chunk = chunk.fillna('')
+        if usecols is not None:
+            chunk = _drop_unneeded_first(chunk, needed_columns, columns)
+        if columns is not None:
+            chunk = chunk[_wildcard_expansion(chunk.columns, columns)]
+        yield chunk
+
+
 _schema['read'] = """
 type: object
 description: Import a file
@@ -301,6 +506,125 @@ def write(df: _pd.DataFrame, name: str, columns: _Union[str, list] = None, file_
       # If file type is not recognised
       raise ValueError(f"File type '{name.split('.')[-1]}' is not supported by the file connector.")
 
+class _ChunkWriter:
+    """
+    Append chunks of a dataframe to a single file
+    """
+    def __init__(self, name: str, file_object, file_type: str, columns, kwargs: dict):
+        self.name = name
+        self.file_object = file_object
+        self.file_type = file_type
+        self.columns = columns
+        self.kwargs = kwargs
+        self._columns = None
+        self._parquet_writer = None
+
+    def _conform(self, df: _pd.DataFrame) -> _pd.DataFrame:
+        """
+        Ensure every chunk has the same columns as the first
+        """
+        if self.columns is not None:
+            df = df[_wildcard_expansion(df.columns, self.columns)]
+
+        if self._columns is None:
+            self._columns = list(df.columns)
+        elif list(df.columns) != self._columns:
+            extra = [col for col in df.columns if col not in self._columns]
+            if extra:
+                raise ValueError(
+                    f"Columns {extra} were not present in the first chunk written to {self.name}"
+                )
+            df = df.reindex(columns=self._columns, fill_value='')
+        return df
+
+    def write(self, df: _pd.DataFrame) -> None:
+        """
+        Write a chunk
+
+        :param df: Dataframe to append to the file
+        """
+        first = self._columns is None
+        df = self._conform(df)
+        kwargs = dict(self.kwargs)
+        if isinstance(self.file_object, str):
+            kwargs['mode'] = 'w' if first else 'a'
+
+        if self.file_type == 'csv':
+            if 'index' not in kwargs: kwargs['index'] = False
+            df.to_csv(self.file_object, header=first, **kwargs)
+
+        elif self.file_type == 'jsonl':
+            kwargs['lines'] = True
+            kwargs['orient'] = 'records'
+            df.to_json(self.file_object, **kwargs)
+
+        elif self.file_type == 'parquet':
+            index = kwargs.pop('index', False)
+            kwargs.pop('mode', None)
+            table = _pa.Table.from_pandas(df, preserve_index=index)
+            if self._parquet_writer is None:
+                self._parquet_writer = _pq.ParquetWriter(self.file_object, table.schema, **kwargs)
+            elif table.schema != self._parquet_writer.schema:
+                table = table.cast(self._parquet_writer.schema)
+            self._parquet_writer.write_table(table)
+
+    def close(self) -> None:
+        """
+        Finish writing the file
+        """
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+
+def chunk_writer(
+    name: str,
+    columns: _Union[str, list] = None,
+    file_object: _BytesIO = None,
+    **kwargs
+) -> _ChunkWriter:
+    """
+    Open a file to be written one chunk of rows at a time.
+    This is used by recipes in streaming mode.
+
+    Supports CSV (.csv, .txt), JSONL (.jsonl) and Parquet (.parquet) files.
+
+    >>> writer = wrangles.connectors.file.chunk_writer('myfile.csv')
+    >>> for chunk in chunks:
+    >>>     writer.write(chunk)
+    >>> writer.close()
+
+    :param name: Name of the output file
+    :param columns: (Optional) Subset of the columns to be written. If not provided, all columns will be output
+    :param file_object: (Optional) A bytes file object to be written in memory. If passed, file will be written in memory instead of to the file system.
+    :param kwargs: (Optional) Named arguments to pass to respective pandas function.
+    :return: A writer with write(df) and close() methods
+    """
+    if isinstance(name, _os.PathLike):
+        name = str(name)
+
+    if name.split('.')[-1] in ['csv', 'txt'] or '.'.join(name.split('.')[-2:]) in ['csv.gz', 'txt.gz']:
+        file_type = 'csv'
+    elif name.split('.')[-1] in ['jsonl'] or '.'.join(name.split('.')[-2:]) in ['jsonl.gz']:
+        file_type = 'jsonl'
+    elif name.split('.')[-1] in ['parquet']:
+        file_type = 'parquet'
+    else:
+        raise NotImplementedError(f"File type '{name.split('.')[-1]}' can't be written in chunks")
+
+    _logging.info(f": Writing data to file in chunks :: {name}")
+
+    if file_object is None:
+        path_matched = _re.search(r'^.+(?=\/\w+\.\w+)', name)
+        if path_matched:
+            _os.makedirs(path_matched[0], exist_ok=True)
+        file_object = name
+    elif str(name).lower().endswith('gz') and 'compression' not in kwargs:
+        kwargs['compression'] = 'gzip'
+
+    return _ChunkWriter(name, file_object, file_type, columns, kwargs)
+
+
 _schema['write'] = """
 type: object
 description: Export data to a file
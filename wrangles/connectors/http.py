@@ -1,10 +1,10 @@
 """
 Connector to make http(s) requests
 """
-import requests as _requests
 import pandas as _pd
 from typing import Union as _Union
 import logging as _logging
+from ..utils import http_request as _http_request
 
 
 def _get_oauth_token(url, method="POST", **kwargs):
@@ -16,7 +16,7 @@ def _get_oauth_token(url, method="POST", **kwargs):
     :return: The OAuth token
     """
     _logging.debug(f": Fetching OAuth token :: url :: {url}, method :: {method}")
-    response = _requests.request(url=url, method=method, **kwargs)
+    response = _http_request(url=url, method=method, **kwargs)
     if not response.ok:
         raise RuntimeError(
             f"OAuth request failed with status code {response.status_code}. Response: {response.text}"
@@ -54,7 +54,7 @@ def run(
     if oauth:
         headers["Authorization"] = f"Bearer {_get_oauth_token(**oauth)}"
     
-    response = _requests.request(
+    response = _http_request(
        method=method,
        url=url,
        headers=headers,
@@ -166,7 +166,7 @@ def read(
     if oauth:
         headers["Authorization"] = f"Bearer {_get_oauth_token(**oauth)}"
 
-    response = _requests.request(
+    response = _http_request(
        method=method,
        url=url,
        headers=headers,
@@ -306,7 +306,7 @@ def write(
         headers["Authorization"] = f"Bearer {_get_oauth_token(**oauth)}"
 
     if batch is True:
-        response = _requests.request(
+        response = _http_request(
             method=method,
             url=url,
             json=df.to_dict(orient=orient),
@@ -318,7 +318,7 @@ def write(
             )
     elif batch is False:
         for row in df.to_dict(orient="records"):
-            response = _requests.request(method=method, url=url, json=row, **kwargs)
+            response = _http_request(method=method, url=url, json=row, **kwargs)
             if not response.ok:
                 raise RuntimeError(
                     f"Request failed with status code {response.status_code}. Response: {response.text}"
@@ -327,7 +327,7 @@ def write(
         # Ensure the dataframe is using the default index
         df = df.reset_index(drop=True)
         for i in range(0, len(df), batch):
-            response = _requests.request(
+            response = _http_request(
                 method=method,
                 url=url,
                 json=df.iloc[i:i+batch].to_dict(orient=orient),
@@ -128,29 +128,31 @@ def run(
     """    
     if functions is None:
         functions = {}
+    permutations = list(_define_permutations(
+        variables=variables,
+        strategy=strategy,
+        functions=functions
+    ))
+
     if use_multiprocessing:
         # Not publicly documented. Use at your own risk.
-        pool_executor = _futures.ProcessPoolExecutor
+        with _futures.ProcessPoolExecutor(max_workers=max_concurrency) as executor:
+            for permutation in permutations:
+                executor.submit(
+                    _wrangles.recipe.run,
+                    recipe={'run': {"on_start": run}},
+                    variables=permutation,
+                    functions=functions
+                )
     else:
-        pool_executor = _futures.ThreadPoolExecutor
-
-    with pool_executor(max_workers=max_concurrency) as executor:
-        futures = []
-        for permutation in _define_permutations(
-            variables=variables,
-            strategy=strategy,
-            functions=functions
-        ):
-            future = executor.submit(
-                _wrangles.recipe.run,
-                recipe={'run': {"on_start": run}},
-                variables=permutation,
-                functions=functions
-            )
-
-            # Wait for all futures to complete
-            for future in futures:
-                future.result()
+        _wrangles.scheduler.map(
+            _wrangles.recipe.run,
+            [{'run': {"on_start": run}} for _ in permutations],
+            permutations,
+            [None for _ in permutations],
+            [functions for _ in permutations],
+            max_workers=max_concurrency
+        )
 
 _schema['run'] = """
 type: object
@@ -218,26 +220,31 @@ def read(
     """    
     if functions is None:
         functions = {}
+    permutations = list(_define_permutations(
+        variables=variables,
+        strategy=strategy,
+        functions=functions
+    ))
+
     if use_multiprocessing:
         # Not publicly documented. Use at your own risk.
-        pool_executor = _futures.ProcessPoolExecutor
+        with _futures.ProcessPoolExecutor(max_workers=max_concurrency) as executor:
+            dfs = list(executor.map(
+                _wrangles.recipe.run,
+                [{'read': read} for _ in permutations],
+                permutations,
+                [None for _ in permutations],
+                [functions for _ in permutations]
+            ))
     else:
-        pool_executor = _futures.ThreadPoolExecutor
-
-    with pool_executor(max_workers=max_concurrency) as executor:
-        permutations = _define_permutations(
-            variables=variables,
-            strategy=strategy,
-            functions=functions
-        )
-
-        dfs = list(executor.map(
+        dfs = _wrangles.scheduler.map(
             _wrangles.recipe.run,
             [{'read': read} for _ in permutations],
             permutations,
             [None for _ in permutations],
-            [functions for _ in permutations]
-        ))
+            [functions for _ in permutations],
+            max_workers=max_concurrency
+        )
 
     return dfs
 
@@ -309,31 +316,33 @@ def write(
     :param use_multiprocessing: Use multiprocessing instead of threading
     :param max_concurrency: The maximum number to execute in parallel. If there are more than this, the rest will be queued.
     """    
+    permutations = list(_define_permutations(
+        variables=variables,
+        strategy=strategy,
+        functions=functions,
+        df=df
+    ))
+
     if use_multiprocessing:
         # Not publicly documented. Use at your own risk.
-        pool_executor = _futures.ProcessPoolExecutor
+        with _futures.ProcessPoolExecutor(max_workers=max_concurrency) as executor:
+            for permutation in permutations:
+                executor.submit(
+                    _wrangles.recipe.run,
+                    recipe={'write': write},
+                    dataframe=df.copy(),
+                    variables=permutation,
+                    functions=functions
+                )
     else:
-        pool_executor = _futures.ThreadPoolExecutor
-
-    with pool_executor(max_workers=max_concurrency) as executor:
-        futures = []
-        for permutation in _define_permutations(
-            variables=variables,
-            strategy=strategy,
-            functions=functions,
-            df=df
-        ):
-            future = executor.submit(
-                _wrangles.recipe.run,
-                recipe={'write': write},
-                dataframe=df.copy(),
-                variables=permutation,
-                functions=functions
-            )
-
-            # Wait for all futures to complete
-            for future in futures:
-                future.result()
+        _wrangles.scheduler.map(
+            _wrangles.recipe.run,
+            [{'write': write} for _ in permutations],
+            permutations,
+            [df.copy() for _ in permutations],
+            [functions for _ in permutations],
+            max_workers=max_concurrency
+        )
 
 _schema['write'] = """
 type: object
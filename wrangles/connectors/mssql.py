@@ -8,6 +8,7 @@ from ..utils import (
   wildcard_expansion as _wildcard_expansion,
   LazyLoader as _LazyLoader
 )
+from . import _pushdown
 
 # Lazy load external dependency
 _pymssql = _LazyLoader('pymssql')
@@ -15,7 +16,7 @@ _pymssql = _LazyLoader('pymssql')
 _schema = {}
 
 
-def read(host: str, user: str, password: str, command: str, port = 1433, database: str = '', columns: _Union[str, list] = None, params: _Union[list, dict] = None) -> _pd.DataFrame:
+def read(host: str, user: str, password: str, command: str, port = 1433, database: str = '', columns: _Union[str, list] = None, params: _Union[list, dict] = None, needed_columns: list = None, row_filters: list = None) -> _pd.DataFrame:
     """
     Import data from a Microsoft SQL database.
 
@@ -30,11 +31,22 @@ def read(host: str, user: str, password: str, command: str, port = 1433, databas
     :param database: (Optional) Database to be queried
     :param columns: (Optional) Subset of columns to be returned. This is less efficient than specifying in the SQL command.
     :param params: (Optional) List of parameters to pass to execute method. The syntax used to pass parameters is database driver dependent.
+    :param needed_columns: (Optional) Columns that are needed. Set by recipes so that other columns are not read.
+    :param row_filters: (Optional) List of (column, 'in', values) that rows must match. Set by recipes so that rows that will be filtered out are not read.
     :return: Pandas Dataframe of the imported data
     """
     _logging.info(f": Reading data from MSSQL :: {host} / {database}")
 
     conn = f"mssql+pymssql://{user}:{password}@{host}:{port}/{database}?charset=utf8"
+    command, params = _pushdown.rewrite(
+        command,
+        params,
+        lambda probe, probe_params: _pd.read_sql(probe, conn, probe_params).columns,
+        needed_columns,
+        row_filters,
+        _pushdown.quote_bracket,
+        paramstyle='format'
+    )
     df = _pd.read_sql(command, conn, params)
 
     if columns is not None:
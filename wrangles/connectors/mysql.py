@@ -8,6 +8,7 @@ from ..utils import (
   wildcard_expansion as _wildcard_expansion,
   LazyLoader as _LazyLoader
 )
+from . import _pushdown
 
 # Lazy load optional dependencies
 _pymysql = _LazyLoader('pymysql')
@@ -16,7 +17,7 @@ _sqlalchemy = _LazyLoader('sqlalchemy')
 _schema = {}
 
 
-def read(host: str, user: str, password: str, command: str, port = 3306, database: str = '', columns: _Union[str, list] = None, params: _Union[list, dict] = None) -> _pd.DataFrame:
+def read(host: str, user: str, password: str, command: str, port = 3306, database: str = '', columns: _Union[str, list] = None, params: _Union[list, dict] = None, needed_columns: list = None, row_filters: list = None) -> _pd.DataFrame:
     """
     Import data from a MySQL database.
 
@@ -31,11 +32,22 @@ def read(host: str, user: str, password: str, command: str, port = 3306, databas
     :param database: (Optional) Database to be queried
     :param columns: (Optional) Subset of columns to be returned. This is less efficient than specifying in the SQL command.
     :param params: (Optional) List of parameters to pass to execute method. The syntax used to pass parameters is database driver dependent.
+    :param needed_columns: (Optional) Columns that are needed. Set by recipes so that other columns are not read.
+    :param row_filters: (Optional) List of (column, 'in', values) that rows must match. Set by recipes so that rows that will be filtered out are not read.
     :return: Pandas Dataframe of the imported data
     """
     _logging.info(f": Reading data from MySQL :: {host} / {database}")
 
     conn = f"mysql+pymysql://{user}:{password}@{host}:{port}/{database}"
+    command, params = _pushdown.rewrite(
+        command,
+        params,
+        lambda probe, probe_params: _pd.read_sql(probe, conn, probe_params).columns,
+        needed_columns,
+        row_filters,
+        _pushdown.quote_backtick,
+        paramstyle='format'
+    )
     df = _pd.read_sql(command, conn, params)
 
     if columns is not None:
@@ -2,9 +2,9 @@
 Connector for PriceFx
 """
 import pandas as _pd
-import requests as _requests
 import logging as _logging
 import json as _json
+from ..utils import http_request as _http_request
 from ..utils import wildcard_expansion as _wildcard_expansion
 
 
@@ -76,7 +76,7 @@ def _get_field_map(host: str, partition: str, target_code: str, user: str, passw
     """
     field_map = {}
     url = f"https://{host}/pricefx/{partition}/fetch/{target_code}AM"
-    field_map_list = _requests.post(url, auth=(f'{partition}/{user}', password)).json()['response']['data']
+    field_map_list = _http_request('POST', url, auth=(f'{partition}/{user}', password)).json()['response']['data']
     for row in field_map_list:
         # Add labels and labelTranslations to map for alternative lookups
         if source is None or source == row['name']:
@@ -141,7 +141,7 @@ def read(
                 ]
             }
         }
-        response = _requests.post(url, json=payload, auth=(f'{partition}/{user}', password))
+        response = _http_request('POST', url, json=payload, auth=(f'{partition}/{user}', password))
         typed_id = response.json()["response"]["data"][0]['typedId']
 
         url = f"https://{host}/pricefx/{partition}/datamart.fetchnocount/{typed_id}"
@@ -206,7 +206,7 @@ def read(
         payload['startRow'] = i
         payload['endRow'] = i + batch_size
 
-        response = _requests.post(url, auth=(f'{partition}/{user}', password), params=params, json=payload)
+        response = _http_request('POST', url, auth=(f'{partition}/{user}', password), params=params, json=payload)
         if str(response.status_code)[0] != '2':
             raise RuntimeError('Failed to read data. Check your input settings. If using column/table lables, consider trying names instead.')
 
@@ -335,7 +335,7 @@ def write(
         field_map = {}
         url = f"https://{host}/pricefx/{partition}/fetch/{meta_table}"
         payload = { 'startRow': 0, 'endRow': 100000 }
-        response = _requests.post(url, auth=(f'{partition}/{user}', password), json=payload)
+        response = _http_request('POST', url, auth=(f'{partition}/{user}', password), json=payload)
         for row in response.json()['response']['data']:
             # Skip if this isn't the right lookup table
             if meta_table in ['JLTVM', 'MLTVM'] and row['lookupTableId'] != source:
@@ -373,7 +373,7 @@ def write(
                 "data": df.values.tolist()
             }
         }
-        response = _requests.post(url, json=payload, auth=(f'{partition}/{user}', password))
+        response = _http_request('POST', url, json=payload, auth=(f'{partition}/{user}', password))
 
         # If the response is not 2XX then raise an error
         if str(response.status_code)[0] != '2':
@@ -389,7 +389,7 @@ def write(
                     "sourceName": f"DMF.{source}"
                 }
             }
-            response = _requests.post(url, json=payload, auth=(f'{partition}/{user}', password))
+            response = _http_request('POST', url, json=payload, auth=(f'{partition}/{user}', password))
 
             # If the response is not 2XX then raise an error
             if str(response.status_code)[0] != '2':
@@ -408,7 +408,7 @@ def write(
             }
         }
 
-        response = _requests.post(url, json=payload, auth=(f'{partition}/{user}', password))
+        response = _http_request('POST', url, json=payload, auth=(f'{partition}/{user}', password))
         # If the response is not 2XX then raise an error
         if str(response.status_code)[0] != '2':
             raise ValueError(f"Status Code {response.status_code} - {response.reason}\n{_json.loads(response.text)['response']['data']}")
@@ -426,7 +426,7 @@ def write(
                 "data": df.values.tolist()
             }
         }
-        response = _requests.post(url, json=payload, auth=(f'{partition}/{user}', password))
+        response = _http_request('POST', url, json=payload, auth=(f'{partition}/{user}', password))
         # If the response is not 2XX then raise an error
         if str(response.status_code)[0] != '2':
             raise ValueError(f"Status Code {response.status_code} - {response.reason}\n{_json.loads(response.text)['response']['data']}")
@@ -5,10 +5,11 @@ import pandas as _pd
 import logging as _logging
 import sqlite3 as _sqlite3
 from typing import Union as _Union
+from . import _pushdown
 
 _schema = {}
 
-def read(database: str, command: str, **kwargs) -> _pd.DataFrame:
+def read(database: str, command: str, needed_columns: list = None, row_filters: list = None, **kwargs) -> _pd.DataFrame:
     """
     Read data from a SQLite database.
 
@@ -17,11 +18,22 @@ def read(database: str, command: str, **kwargs) -> _pd.DataFrame:
 
     :param database: The database to connect to including the file path. e.g. directory/database.db
     :param command: SQL command or table name
+    :param needed_columns: (Optional) Columns that are needed. Set by recipes so that other columns are not read.
+    :param row_filters: (Optional) List of (column, 'in', values) that rows must match. Set by recipes so that rows that will be filtered out are not read.
     """
     _logging.info(f": Reading data from SQLite :: {database}")
     
     with _sqlite3.connect(database) as conn:
-        df = _pd.read_sql(command, conn, **kwargs)
+        command, params = _pushdown.rewrite(
+            command,
+            kwargs.pop('params', None),
+            lambda probe, probe_params: _pd.read_sql(probe, conn, params=probe_params, **kwargs).columns,
+            needed_columns,
+            row_filters,
+            # Double quoted names that don't exist are treated as strings by SQLite
+            _pushdown.quote_bracket
+        )
+        df = _pd.read_sql(command, conn, params=params, **kwargs)
 
     return df
 
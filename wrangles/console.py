@@ -48,3 +48,58 @@ def recipe():
         variables=variables,
         timeout=args.timeout
     )
+
+
+def worker():
+    """
+    Run a worker that keeps wrangles warm and runs recipes sent to it
+
+    >>> wrangles.worker --port 8080 --functions custom_functions.py
+    >>> wrangles.worker --socket /tmp/wrangles.sock
+    """
+    from . import worker as _worker
+
+    parser = _argparse.ArgumentParser(prog="wrangles.worker", description="Run a Wrangles worker")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="The host to listen on. Default localhost only.")
+    parser.add_argument("--port", "-p", type=int, default=8080, help="The port to listen on. Default 8080.")
+    parser.add_argument("--socket", "-s", type=str, help="Listen on a Unix socket instead of a port")
+    parser.add_argument("--functions", "-f", type=str, help="A file of custom functions")
+    parser.add_argument("--max-jobs", "-j", type=int, help="The maximum number of recipes to run at once")
+
+    args = parser.parse_args()
+
+    _worker.serve(
+        host=args.host,
+        port=args.port,
+        socket_path=args.socket,
+        functions=args.functions,
+        max_jobs=args.max_jobs
+    )
+
+
+def run_many():
+    """
+    Run many recipes from a manifest using a pool of processes
+
+    >>> wrangles.run_many manifest.yml --processes 4 --retries 1 --report report.csv
+    """
+    parser = _argparse.ArgumentParser(prog="wrangles.run_many", description="Run many Wrangles recipes from a manifest")
+    parser.add_argument("manifest", type=str, help="The filename of the manifest of jobs")
+    parser.add_argument("--processes", "-p", type=int, help="The number of processes. Default the number of CPUs.")
+    parser.add_argument("--functions", "-f", type=str, help="A file of custom functions")
+    parser.add_argument("--retries", "-r", type=int, default=0, help="The number of times to retry a failed job")
+    parser.add_argument("--report", type=str, help="A .csv or .json file to write the summary to")
+
+    args = parser.parse_args()
+
+    summary = _recipe.run_many(
+        args.manifest,
+        processes=args.processes,
+        functions=args.functions,
+        retries=args.retries,
+        report=args.report
+    )
+
+    # Exit with an error if any jobs failed
+    if (summary['status'] == 'failed').any():
+        raise SystemExit(1)
@@ -1,11 +1,21 @@
 """
 Functions for interacting with user and app data
 """
+import copy as _copy
+import threading as _threading
+import time as _time
 from . import config as _config
 from . import auth as _auth
 from . import utils as _utils
 
 
+# Model metadata and content by (kind, user, id, version)
+# Each entry is (expires_at, value)
+_CACHE_LOCK = _threading.Lock()
+_CACHE = {}
+_INFLIGHT = {}
+
+
 class AuthenticationError(RuntimeError):
     pass
 
@@ -27,6 +37,77 @@ def _raise_model_response_error(response, id: str, action: str) -> None:
     raise RuntimeError(f'Something went wrong trying to {action} model {id}')
 
 
+class _Flight:
+    def __init__(self):
+        self.event = _threading.Event()
+        self.result = None
+        self.exception = None
+
+
+def _cached(key: tuple, fetch):
+    """
+    Get a value from the cache, or fetch it if it is missing or expired.
+    Concurrent calls for the same key share a single fetch.
+
+    :param key: Cache key. The second element must be the model ID.
+    :param fetch: Function to get the value if it isn't cached
+    :return: A copy of the value, so callers can safely change it
+    """
+    if _config.model_cache_seconds <= 0:
+        return fetch()
+
+    key = (key[0], _config.api_host, _config.api_user) + key[1:]
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+        if entry is not None and entry[0] > _time.monotonic():
+            return _copy.deepcopy(entry[1])
+
+        flight = _INFLIGHT.get(key)
+        owner = flight is None
+        if owner:
+            flight = _Flight()
+            _INFLIGHT[key] = flight
+
+    if not owner:
+        flight.event.wait()
+        if flight.exception is not None:
+            raise flight.exception
+        return _copy.deepcopy(flight.result)
+
+    try:
+        flight.result = fetch()
+        with _CACHE_LOCK:
+            # Don't store if the model was cleared while fetching
+            if _INFLIGHT.get(key) is flight:
+                _CACHE[key] = (
+                    _time.monotonic() + _config.model_cache_seconds,
+                    flight.result
+                )
+        return _copy.deepcopy(flight.result)
+    except Exception as exc:
+        flight.exception = exc
+        raise
+    finally:
+        flight.event.set()
+        with _CACHE_LOCK:
+            if _INFLIGHT.get(key) is flight:
+                del _INFLIGHT[key]
+
+
+def clear_cache(id: str = None) -> None:
+    """
+    Clear cached model metadata and content.
+    Models trained or updated from this process are cleared automatically.
+
+    :param id: (Optional) Model ID to clear. If not provided, all models are cleared.
+    """
+    with _CACHE_LOCK:
+        for cache in (_CACHE, _INFLIGHT):
+            for key in list(cache):
+                if id is None or key[3] == id:
+                    del cache[key]
+
+
 class user():
     """
     Get user data
@@ -55,10 +136,19 @@ class user():
 
 def model(id: str):
     """
-    Get a model definition
+    Get a model definition.
+    Recently fetched models are cached for WRANGLES_MODEL_CACHE_SECONDS.
+
     :param id: model ID
     :returns: Dict of model properties
     """
+    return _cached(('model', id), lambda: _model(id))
+
+
+def _model(id: str):
+    """
+    Get a model definition from the API
+    """
     response = _utils.request_retries(
                 request_type='GET',
                 url=f'{_config.api_host}/model/metadata',
@@ -89,18 +179,27 @@ def model_update(id: str, metadata: dict) -> None:
                     'json': metadata
                 }
             )
+    clear_cache(id)
     if not response.ok:
         _raise_model_response_error(response, id, 'update')
 
 
 def model_content(id: str, version_id: str = None) -> list:
     """
-    Get the training data for a model
+    Get the training data for a model.
+    Recently fetched models are cached for WRANGLES_MODEL_CACHE_SECONDS.
 
     :param id: Model ID
     :param version_id: (Optional) Version ID. If not provided, the latest version will be used.
     :return: Model data with Settings, Columns and Data as a 2D array
     """
+    return _cached(('content', id, version_id), lambda: _model_content(id, version_id))
+
+
+def _model_content(id: str, version_id: str = None) -> list:
+    """
+    Get the training data for a model from the API
+    """
     response = _utils.request_retries(
                 request_type='GET',
                 url=f'{_config.api_host}/model/content',
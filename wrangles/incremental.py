@@ -0,0 +1,168 @@
+"""
+Only process the rows that are new or have changed since the previous run
+
+Incremental mode is enabled with the incremental section of a recipe.
+
+>>> incremental:
+>>>   key: id
+>>>   path: ./cache/catalog
+
+Each input row is hashed and compared with a manifest saved by the
+previous run. The wrangles only run on rows that are new or whose
+values changed, and the saved results are used for the others.
+Rows that are no longer in the input are dropped.
+
+Wrangles up to the first that needs all the rows at once, e.g. sort
+or group_by, run incrementally. That wrangle and any after it run on
+all the rows. The manifest is rebuilt if those wrangles or the input
+columns change. Changes to custom functions or external data are not
+detected - delete the directory to process every row again.
+
+The manifest is saved as a pickle file to preserve the exact data,
+so only use directories you trust.
+"""
+import hashlib as _hashlib
+import json as _json
+import logging as _logging
+import os as _os
+import typing as _typing
+import uuid as _uuid
+
+import numpy as _np
+import pandas as _pd
+
+
+_VERSION = 1
+
+
+def row_hashes(df: _pd.DataFrame) -> _np.ndarray:
+    """
+    Get a hash of the values of each row of a dataframe
+
+    :param df: Dataframe
+    :return: Array of uint64 hashes
+    """
+    try:
+        return _pd.util.hash_pandas_object(df, index=False).to_numpy()
+    except TypeError:
+        # Unhashable values such as lists or dicts
+        return _pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy()
+
+
+def _keys(df: _pd.DataFrame, key: list) -> _pd.Index:
+    if len(key) == 1:
+        return _pd.Index(df[key[0]])
+    return _pd.MultiIndex.from_frame(df[key])
+
+
+class Manifest:
+    """
+    The hashes of the input rows from the previous
+    run and the results of the wrangles for them
+    """
+    def __init__(self, path: str, key: _typing.Union[str, list], wrangles: list, df: _pd.DataFrame):
+        """
+        :param path: Directory to save the manifest to
+        :param key: Column or columns that uniquely identify each row
+        :param wrangles: Wrangles that will be run incrementally
+        :param df: The input data for this run
+        """
+        self.file = _os.path.join(str(path), 'manifest.pkl')
+        self.key = key if isinstance(key, list) else [key]
+
+        missing = [col for col in self.key if col not in df.columns]
+        if missing:
+            raise KeyError(f"incremental key column(s) {missing} not found")
+        if df.duplicated(self.key).any():
+            raise ValueError(f"incremental key {self.key} is not unique")
+
+        self.df = df
+        self.keys = _keys(df, self.key)
+        self.hashes = row_hashes(df)
+        self.version = _hashlib.sha256(_json.dumps(
+            [_VERSION, self.key, wrangles, [str(col) for col in df.columns]],
+            sort_keys=True,
+            default=str
+        ).encode()).hexdigest()
+        self._previous = self._load()
+        self._changed = None
+
+    def _load(self) -> _typing.Optional[dict]:
+        if not _os.path.exists(self.file):
+            return None
+        try:
+            previous = _pd.read_pickle(self.file)
+        except Exception as e:
+            _logging.warning(f": Incremental :: Unable to load {self.file} :: {e}")
+            return None
+        if not isinstance(previous, dict) or previous.get('version') != self.version:
+            _logging.info(": Incremental :: The recipe or input columns changed. All rows will be processed.")
+            return None
+        return previous
+
+    def changed(self) -> _np.ndarray:
+        """
+        Find the rows that are new or have changed since the previous run
+
+        :return: Boolean array for the rows of the input data
+        """
+        if self._previous is None or len(self._previous['hashes']) == 0:
+            self._changed = _np.ones(len(self.df), dtype=bool)
+        else:
+            positions = self._previous['keys'].get_indexer(self.keys)
+            previous_hashes = self._previous['hashes'][_np.maximum(positions, 0)]
+            self._changed = (positions == -1) | (previous_hashes != self.hashes)
+        return self._changed
+
+    def merge(self, result: _typing.Optional[_pd.DataFrame]) -> _pd.DataFrame:
+        """
+        Combine the results for the changed rows with the
+        saved results for the others, in the order of the input
+
+        :param result: Result of the wrangles for the changed rows
+        :return: Dataframe
+        """
+        parts = []
+        if self._previous is not None and not self._changed.all():
+            saved = self._previous['rows']
+            unchanged = self.keys[~self._changed]
+            parts.append(saved.loc[_keys(saved, self.key).isin(unchanged)])
+        if result is not None:
+            missing = [col for col in self.key if col not in result.columns]
+            if missing:
+                raise KeyError(f"incremental key column(s) {missing} must not be removed by the wrangles")
+            parts.append(result)
+
+        if not parts:
+            return self.df.iloc[0:0]
+        df = _pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+
+        positions = self.keys.get_indexer(_keys(df, self.key))
+        if (positions == -1).any():
+            raise ValueError(f"incremental key {self.key} must not be changed by the wrangles")
+        return df.iloc[_np.argsort(positions, kind='stable')].reset_index(drop=True)
+
+    def save(self, rows: _pd.DataFrame) -> None:
+        """
+        Save the manifest for the next run
+
+        :param rows: The results of the wrangles for every input row
+        """
+        _os.makedirs(_os.path.dirname(self.file), exist_ok=True)
+        # Write to a temporary file first so that an interrupted
+        # save can't leave behind a partial manifest
+        temp = f"{self.file}.{_uuid.uuid4().hex}.tmp"
+        try:
+            _pd.to_pickle(
+                {
+                    'version': self.version,
+                    'keys': self.keys,
+                    'hashes': self.hashes,
+                    'rows': rows
+                },
+                temp
+            )
+            _os.replace(temp, self.file)
+        finally:
+            if _os.path.exists(temp):
+                _os.remove(temp)
@@ -10,6 +10,7 @@ import numpy as _np
 import time as _time
 import warnings as _warnings
 from . import openai_responses as _openai_responses
+from .utils import http_request as _http_request
 try:
     from yaml import CSafeDumper as _YAMLDumper
 except ImportError:
@@ -90,7 +91,8 @@ def chatGPT(
 
         response = None
         try:
-            response = _requests.post(
+            response = _http_request(
+                method='POST',
                 url = url,
                 headers = {
                     "Authorization": f"Bearer {api_key}"
@@ -254,7 +256,8 @@ def _embedding_thread(
     backoff_time = 1
     while (retries + 1):
         try:
-            response = _requests.post(
+            response = _http_request(
+                method='POST',
                 url=url,
                 headers={
                     "Authorization": f"Bearer {api_key}"
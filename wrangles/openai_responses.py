@@ -21,6 +21,8 @@ from pydantic import Field as _Field
 from pydantic import ValidationError as _ValidationError
 from pydantic import create_model as _create_model
 
+from .utils import http_request as _http_request
+
 
 _LOG = _logging.getLogger(__name__)
 _LOCK = _threading.Lock()
@@ -653,7 +655,8 @@ def call_structured(
         response = None
         try:
             started = _time.time()
-            response = _requests.post(
+            response = _http_request(
+                method='POST',
                 url=url,
                 headers=headers,
                 json=request_payload,
@@ -0,0 +1,292 @@
+"""
+Profile the execution of recipes
+
+Records the time, rows, columns and memory for each read, wrangle,
+write and action run by a recipe, including those in nested recipes
+such as batch, matrix, concurrent and try.
+
+>>> profiler = wrangles.profiling.Profiler()
+>>> df = wrangles.recipe.run('recipe.wrgl.yml', profile=profiler)
+>>> profiler.report()
+
+Profiling can also be enabled by setting the environment variable
+WRANGLES_PROFILE to the path of a JSON file to write the report to,
+and optionally WRANGLES_PROFILE_TRACE to the path of a Chrome trace file.
+"""
+import contextvars as _contextvars
+import itertools as _itertools
+import json as _json
+import logging as _logging
+import os as _os
+import threading as _threading
+import time as _time
+import tracemalloc as _tracemalloc
+import typing as _typing
+
+import pandas as _pd
+
+
+# The profiler for the current run and the step currently executing.
+# Both are context variables so that they carry into the worker
+# threads used to run recipes and nested recipes.
+_ACTIVE_PROFILER = _contextvars.ContextVar('wrangles_profiler', default=None)
+_CURRENT_SPAN = _contextvars.ContextVar('wrangles_profiler_span', default=None)
+
+
+def _memory(df) -> _typing.Optional[int]:
+    if isinstance(df, _pd.DataFrame):
+        return int(df.memory_usage(index=True, deep=True).sum())
+    return None
+
+
+def _shape(df) -> tuple:
+    if isinstance(df, _pd.DataFrame):
+        return len(df), len(df.columns)
+    if isinstance(df, list) and all(isinstance(x, _pd.DataFrame) for x in df):
+        return sum(len(x) for x in df), max([len(x.columns) for x in df], default=0)
+    return None, None
+
+
+class Profiler:
+    """
+    Collect timings and resource usage for the steps of a recipe
+    """
+    def __init__(self, trace_memory: bool = True, measure_dataframes: bool = True):
+        """
+        :param trace_memory: Trace the peak memory allocated by each step. \
+            This uses tracemalloc which will slow down execution.
+        :param measure_dataframes: Record the memory used by the dataframe \
+            before and after each step. This requires inspecting every value \
+            which may be slow for very large data.
+        """
+        self.trace_memory = trace_memory
+        self.measure_dataframes = measure_dataframes
+        self.records = []
+        self._open = []
+        self._ids = _itertools.count(1)
+        self._lock = _threading.Lock()
+        self._start = _time.perf_counter()
+        self._started_tracemalloc = False
+
+    def __enter__(self):
+        if self.trace_memory and not _tracemalloc.is_tracing():
+            _tracemalloc.start()
+            self._started_tracemalloc = True
+        self._token = _ACTIVE_PROFILER.set(self)
+        return self
+
+    def __exit__(self, *_):
+        _ACTIVE_PROFILER.reset(self._token)
+        if self._started_tracemalloc:
+            _tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _update_peaks(self) -> None:
+        """
+        Fold the peak traced memory since the last update into all open steps
+        """
+        if not (self.trace_memory and _tracemalloc.is_tracing()):
+            return
+        peak = _tracemalloc.get_traced_memory()[1]
+        for span in self._open:
+            span['_peak'] = max(span['_peak'], peak)
+        _tracemalloc.reset_peak()
+
+    def start(self, section: str, name: str, df=None, index: int = None) -> dict:
+        """
+        Start recording a step
+
+        :param section: Section of the recipe e.g. read, wrangle, write, action
+        :param name: Name of the step e.g. convert.case
+        :param df: (Optional) Dataframe passed to the step
+        :param index: (Optional) Position of the step within its section
+        :return: The record for the step, to pass to finish
+        """
+        rows, columns = _shape(df)
+        span = {
+            'id': next(self._ids),
+            'parent': _CURRENT_SPAN.get(),
+            'section': section,
+            'name': name,
+            'index': index,
+            'thread': _threading.get_ident(),
+            'rows_in': rows,
+            'columns_in': columns,
+            'memory_in': _memory(df) if self.measure_dataframes else None,
+        }
+        with self._lock:
+            self._update_peaks()
+            traced = _tracemalloc.get_traced_memory()[0] if _tracemalloc.is_tracing() else 0
+            span['_traced_start'] = traced
+            span['_peak'] = traced
+            self._open.append(span)
+
+        span['_token'] = _CURRENT_SPAN.set(span['id'])
+        span['start'] = _time.perf_counter() - self._start
+        span['_wall'] = _time.perf_counter()
+        span['_cpu'] = _time.thread_time()
+        return span
+
+    def finish(self, span: dict, df=None, error: Exception = None) -> None:
+        """
+        Finish recording a step
+
+        :param span: The record returned by start
+        :param df: (Optional) Dataframe returned by the step
+        :param error: (Optional) Exception raised by the step
+        """
+        wall_time = _time.perf_counter() - span.pop('_wall')
+        cpu_time = _time.thread_time() - span.pop('_cpu')
+        _CURRENT_SPAN.reset(span.pop('_token'))
+
+        with self._lock:
+            self._update_peaks()
+            self._open.remove(span)
+
+        rows, columns = _shape(df)
+        traced_start = span.pop('_traced_start')
+        peak = span.pop('_peak')
+        span.update({
+            'wall_time': wall_time,
+            'cpu_time': cpu_time,
+            'rows_out': rows,
+            'columns_out': columns,
+            'memory_out': _memory(df) if self.measure_dataframes else None,
+            'peak_memory': max(peak - traced_start, 0) if self.trace_memory else None,
+        })
+        if error is not None:
+            span['error'] = f"{error.__class__.__name__}: {error}"
+
+        with self._lock:
+            self.records.append(span)
+
+    def report(self) -> dict:
+        """
+        Get the report of all recorded steps, in the order they started
+
+        :return: Dict with the total time and a list of steps
+        """
+        with self._lock:
+            steps = sorted(self.records, key=lambda x: x['start'])
+        return {
+            'total_time': _time.perf_counter() - self._start,
+            'steps': steps
+        }
+
+    def write(self, path: str) -> None:
+        """
+        Write the report to a JSON file
+
+        :param path: Path of the file to write
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            _json.dump(self.report(), f, indent=2, default=str)
+
+    def write_trace(self, path: str) -> None:
+        """
+        Write the report in the Chrome trace event format.
+        This can be viewed in chrome://tracing or https://ui.perfetto.dev
+
+        :param path: Path of the file to write
+        """
+        events = [
+            {
+                'name': step['name'],
+                'cat': step['section'],
+                'ph': 'X',
+                'ts': step['start'] * 1e6,
+                'dur': step['wall_time'] * 1e6,
+                'pid': _os.getpid(),
+                'tid': step['thread'],
+                'args': {
+                    k: v
+                    for k, v in step.items()
+                    if k not in ('name', 'section', 'start', 'wall_time', 'thread')
+                }
+            }
+            for step in self.report()['steps']
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            _json.dump({'traceEvents': events}, f, default=str)
+
+    def log(self) -> None:
+        """
+        Log a summary of the slowest steps
+        """
+        steps = sorted(self.report()['steps'], key=lambda x: x['wall_time'], reverse=True)
+        lines = [
+            f"{step['wall_time']:>9.3f}s {step['cpu_time']:>9.3f}s cpu  "
+            f"{step['section']} :: {step['name']}"
+            + (f" #{step['index']}" if step['index'] is not None else '')
+            for step in steps[:20]
+        ]
+        _logging.info(": Profile :: slowest steps\n" + '\n'.join(lines))
+
+
+def active() -> _typing.Optional[Profiler]:
+    """
+    Get the profiler for the current recipe run, if profiling
+    """
+    return _ACTIVE_PROFILER.get()
+
+
+def start(section: str, name: str, df=None, index: int = None) -> _typing.Optional[dict]:
+    """
+    Start recording a step with the active profiler, if any
+
+    :return: The record to pass to finish, or None if not profiling
+    """
+    profiler = _ACTIVE_PROFILER.get()
+    if profiler is None:
+        return None
+    return profiler.start(section, name, df, index)
+
+
+def finish(span: _typing.Optional[dict], df=None, error: Exception = None) -> None:
+    """
+    Finish recording a step started with start
+    """
+    if span is not None:
+        _ACTIVE_PROFILER.get().finish(span, df, error)
+
+
+def from_setting(profile) -> _typing.Optional[Profiler]:
+    """
+    Get a new profiler for a recipe run based on the profile
+    argument or the WRANGLES_PROFILE environment variable
+
+    :param profile: True, a path to write a JSON report to or a Profiler
+    :return: Profiler, or None if profiling is not requested \
+        or a profiler is already active for a parent run
+    """
+    if _ACTIVE_PROFILER.get() is not None:
+        return None
+    if isinstance(profile, Profiler):
+        return profile
+    if profile is None:
+        profile = _os.environ.get('WRANGLES_PROFILE')
+        if profile and profile.strip().lower() in ('false', '0', ''):
+            profile = None
+    if profile:
+        return Profiler()
+    return None
+
+
+def output(profiler: Profiler, profile) -> None:
+    """
+    Log the report and write it to any requested files
+
+    :param profiler: Profiler used for the run
+    :param profile: The profile setting passed to the run
+    """
+    profiler.log()
+
+    path = profile if isinstance(profile, str) else None
+    if profile is None:
+        path = _os.environ.get('WRANGLES_PROFILE')
+    if path and path.strip().lower() not in ('true', '1'):
+        profiler.write(path)
+
+    trace_path = _os.environ.get('WRANGLES_PROFILE_TRACE')
+    if trace_path:
+        profiler.write_trace(trace_path)
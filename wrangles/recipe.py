@@ -15,29 +15,38 @@ import warnings as _warnings
 import concurrent.futures as _futures
 import contextvars as _contextvars
 import time as _time
+import copy as _copy
+import threading as _threading
+import collections as _collections
 import pandas as _pandas
-import requests as _requests
 from . import recipe_wrangles as _recipe_wrangles
 from . import connectors as _connectors
 from . import data as _data
-from .config import (
-    reserved_word_replacements as _reserved_word_replacements,
-    where_overwrite_output as _where_overwrite_output,
-    where_not_implemented as _where_not_implemented
-)
+from . import config as _config
+from . import where as _where
+from . import profiling as _profiling
+from . import capabilities as _capabilities
+from . import checkpoint as _checkpoint
+from . import incremental as _incremental
+from . import scheduler as _scheduler
+from .capabilities import reserved_word_replacements as _reserved_word_replacements
 from .utils import (
     evaluate_conditional as _evaluate_conditional,
     get_nested_function as _get_nested_function,
     validate_function_args as _validate_function_args,
     add_special_parameters as _add_special_parameters,
+    function_spec as _function_spec,
     wildcard_expansion as _wildcard_expansion,
     wildcard_expansion_dict as _wildcard_expansion_dict,
-    replace_templated_values as _replace_templated_values
+    replace_templated_values as _replace_templated_values,
+    find_templated_variables as _find_templated_variables,
+    variables_cache_key as _variables_cache_key,
+    http_request as _http_request
 )
 try:
-    from yaml import CSafeDumper as _YAMLDumper
+    from yaml import CSafeLoader as _YAMLLoader, CSafeDumper as _YAMLDumper
 except ImportError:
-    from yaml import SafeDumper as _YAMLDumper
+    from yaml import SafeLoader as _YAMLLoader, SafeDumper as _YAMLDumper
 
 _logging.getLogger().setLevel(_logging.INFO)
 
@@ -59,23 +68,60 @@ _RECIPE_RUN_CONTEXT = _contextvars.ContextVar(
 _warnings.simplefilter(action='ignore', category=_pandas.errors.PerformanceWarning)
 
 
-def _load_recipe(
+def _load_functions(functions: _Union[_types.FunctionType, list, dict, str]) -> dict:
+    """
+    Load custom functions from the supported formats
+
+    :param functions: A function, list of functions, dict of named functions or file path
+    :return: Dictionary of named functions
+    """
+    if not functions:
+        return {}
+
+    # If user has passed in a single function, convert to a list
+    if callable(functions): functions = [functions]
+
+    # If the user has specified a file of custom function, import those
+    if isinstance(functions, str):
+        custom_module = _types.ModuleType('custom_module')
+        exec(open(functions, "r").read(), custom_module.__dict__)
+        functions = [
+            getattr(custom_module, method)
+            for method in dir(custom_module)
+            if not method.startswith('_')
+        ]
+        # getting only the functions
+        functions = [
+            x
+            for x in functions
+            if _inspect.isfunction(x)
+        ]
+
+    # Convert custom functions from a list to a dict using the name as a key
+    if isinstance(functions, list):
+        functions = {
+            custom_function.__name__: custom_function
+            for custom_function in functions
+        }
+
+    return functions
+
+
+def _read_recipe_source(
     recipe: str,
-    variables: dict = None,
     functions: _Union[_types.FunctionType, list, dict, str] = []
-) -> dict:
+) -> tuple:
     """
-    Load yaml recipe file + replace any placeholder variables
+    Read and parse a recipe and resolve any custom functions
 
-    :param recipe: YAML recipe or name of a YAML file to be parsed
-    :param variables: (Optional) dictionary of custom variables to override placeholders in the YAML file
+    :param recipe: YAML recipe, name of a YAML file to be parsed or a recipe object
     :param functions: (Optional) function, list of functions or a file of functions.
 
-    :return: YAML Recipe converted to a dictionary
+    :return: Tuple of the recipe string, the parsed recipe, a dict of custom functions \
+        and whether the recipe came from an independently addressable source. \
+        The recipe string is None if the recipe was passed in as an object. \
+        The parsed recipe may be the object passed in, so must not be mutated.
     """
-    if variables is None:
-        variables = {}
-
     # Accept path-like objects (e.g. pathlib.Path) by converting to str
     if isinstance(recipe, _os.PathLike):
         recipe = str(recipe)
@@ -83,14 +129,6 @@ def _load_recipe(
     if isinstance(recipe, str) and "\n" not in recipe:
         _logging.info(f": Reading Recipe :: {recipe}")
     
-    # Load the recipe from the various supported formats
-    if not isinstance(recipe, str):
-        try:
-            # If user passes in a pre-parsed recipe, convert back to YAML
-            recipe = _yaml.dump(recipe, sort_keys=False, Dumper=_YAMLDumper, allow_unicode=True)
-        except:
-            raise ValueError('Recipe passed in as an invalid type')
-
     # Dict to store functions stored within a model
     model_functions = {}
 
@@ -104,9 +142,21 @@ def _load_recipe(
     # to whatever recipe text the outer call was already tracking.
     _is_external_source = False
 
+    recipe_object = None
+
+    # A pre-parsed recipe, e.g. from a nested run within this process.
+    # Substituting variables creates a new copy, so there is no
+    # need to convert it to YAML and back.
+    if isinstance(recipe, dict):
+        recipe_string = None
+        recipe_object = recipe
+
+    elif not isinstance(recipe, str):
+        raise ValueError('Recipe passed in as an invalid type')
+
     # If the recipe to read is from "https://" or "http://"
-    if 'https://' == recipe[:8] or 'http://' == recipe[:7]:
-        response = _requests.get(recipe)
+    elif 'https://' == recipe[:8] or 'http://' == recipe[:7]:
+        response = _http_request('GET', recipe)
         if str(response.status_code)[0] != '2':
             raise ValueError(f'Error getting recipe from url: {response.url}\nReason: {response.reason}-{response.status_code}')
         recipe_string = response.text
@@ -183,46 +233,118 @@ def _load_recipe(
                 + 'The recipe should be a YAML file using utf-8 encoding.'
             )
 
-    # Load the custom functions from the supported formats
-    # If user has passed in a single function, convert to a list
-    if callable(functions): functions = [functions]
-
-    # If the user has specified a file of custom function, import those
-    if isinstance(functions, str):
-        custom_module = _types.ModuleType('custom_module')
-        exec(open(functions, "r").read(), custom_module.__dict__)
-        functions = [
-            getattr(custom_module, method)
-            for method in dir(custom_module)
-            if not method.startswith('_')
-        ]
-        # getting only the functions
-        functions = [
-            x
-            for x in functions
-            if _inspect.isfunction(x)
-        ]
-
-    # Convert custom functions from a list to a dict using the name as a key
-    if isinstance(functions, list):
-        functions = {
-            custom_function.__name__: custom_function
-            for custom_function in functions
-        }
+    functions = _load_functions(functions)
 
     # Merge user input functions and any from remote model
     functions = {**model_functions, **functions}
 
+    if recipe_object is None:
+        recipe_object = _yaml.load(recipe_string, Loader=_YAMLLoader)
+
+    return recipe_string, recipe_object, functions, _is_external_source
+
+
+def _environment_references(recipe_object) -> set:
+    """
+    Get the names in a recipe that may refer to environment variables -
+    those referenced as ${} and any names used in if conditions
+    or python wrangles, which are evaluated with the variables
+
+    :param recipe_object: Parsed recipe
+    :return: Set of names
+    """
+    names = set(_find_templated_variables(recipe_object))
+    pending = [recipe_object]
+    while pending:
+        obj = pending.pop()
+        if isinstance(obj, dict):
+            for key, val in obj.items():
+                if key == 'if' and isinstance(val, str):
+                    names.update(_re.findall(r'[A-Za-z_][A-Za-z0-9_]*', val))
+                elif key == 'python' and isinstance(val, dict) and isinstance(val.get('command'), str):
+                    names.update(_re.findall(r'[A-Za-z_][A-Za-z0-9_]*', val['command']))
+                pending.append(val)
+        elif isinstance(obj, list):
+            pending.extend(obj)
+    return names
+
+
+def _functions_take_variables(functions: dict) -> bool:
+    """
+    Check whether any custom function accepts the variables as an argument.
+    These may read any environment variable, so need all of them.
+
+    :param functions: Dictionary of named custom functions
+    :return: True if any function has a variables argument
+    """
+    pending = list(functions.values())
+    while pending:
+        obj = pending.pop()
+        if isinstance(obj, dict):
+            pending.extend(obj.values())
+        elif isinstance(obj, _types.ModuleType):
+            pending.extend(
+                val
+                for key, val in vars(obj).items()
+                if not key.startswith('_') and _inspect.isfunction(val)
+            )
+        elif callable(obj):
+            try:
+                if 'variables' in _function_spec(obj).arg_set:
+                    return True
+            except TypeError:
+                # Signature can't be inspected e.g. some builtins
+                pass
+    return False
+
+
+def _resolve_variables(
+    variables: dict,
+    functions: dict,
+    references: set = None
+) -> dict:
+    """
+    Add environment variables and interpret any variables
+    defined by a custom function. Variables are updated in place.
+
+    :param variables: Dictionary of variables passed in by the user
+    :param functions: Dictionary of named custom functions
+    :param references: (Optional) Names the recipe may use. If provided, \
+        only environment variables with these names are added, unless a \
+        custom function may read them all. See _environment_references.
+    :return: The updated variables
+    """
+    # Variables defined by a custom function may use any of the
+    # other variables as arguments, including environment variables
+    defined_by_function = any(
+        isinstance(v, str) and v.lower().startswith("custom.")
+        for v in variables.values()
+    )
+
     # Also add environment variables to list of placeholder variables
-    for env_key, env_val in _os.environ.items():
-        if env_key not in variables.keys():
+    if (
+        references is None
+        or defined_by_function
+        or 'recipe_variables' in references
+        or _functions_take_variables(functions)
+    ):
+        environment = _os.environ.items()
+    else:
+        # Only read those that are referenced
+        environment = [
+            (name, _os.environ[name])
+            for name in references
+            if name in _os.environ
+        ]
+    for env_key, env_val in environment:
+        if env_key not in variables:
             variables[env_key] = env_val
 
     # Interpret any variables defined by a custom function
     for k, v in variables.items():
         if isinstance(v, str) and v.lower().startswith("custom."):
             func = _get_nested_function(v, None, functions)
-            fn_argspec = _inspect.getfullargspec(func)
+            fn_argspec = _function_spec(func)
             args = {}
 
             # Full variables dict required
@@ -242,17 +364,17 @@ def _load_recipe(
 
             variables[k] = func(**args)
 
-    recipe_object = _yaml.safe_load(recipe_string)
+    return variables
 
-    # Add variables to variables
-    variables['recipe_variables'] = {
-        key: value
-        for key, value in variables.items()
-        if key != 'recipe_variables'
-    }
 
-    # Keep a copy of the raw recipe string for line lookups.
-    #
+def _track_recipe_string(recipe_string: str, is_external_source: bool) -> None:
+    """
+    Keep a copy of the raw recipe string for error line lookups
+
+    :param recipe_string: Raw text of the recipe. If the recipe was passed in as \
+        an object, the object, which is only converted to text if needed.
+    :param is_external_source: Whether the recipe was read from a URL, model_id or file
+    """
     # Always do this for the outermost recipe.run() call, and also for any
     # nested call whose recipe came from an independently addressable source
     # (a URL, model_id, or file path) - e.g. a model_id that itself points to
@@ -265,9 +387,54 @@ def _load_recipe(
     # meaningful to the user, so keep pointing at whatever recipe text the
     # outer call was already tracking.
     run_context = _RECIPE_RUN_CONTEXT.get()
-    if run_context is not None and (run_context['depth'] <= 1 or _is_external_source):
+    if run_context is not None and (run_context['depth'] <= 1 or is_external_source):
         run_context['recipe_string'] = recipe_string
 
+
+def _add_recipe_variables(variables: dict) -> dict:
+    """
+    Expose the full set of variables as ${recipe_variables}
+
+    :param variables: Dictionary of variables. This is updated in place.
+    :return: The updated variables
+    """
+    variables['recipe_variables'] = {
+        key: value
+        for key, value in variables.items()
+        if key != 'recipe_variables'
+    }
+    return variables
+
+
+def _load_recipe(
+    recipe: str,
+    variables: dict = None,
+    functions: _Union[_types.FunctionType, list, dict, str] = []
+) -> dict:
+    """
+    Load yaml recipe file + replace any placeholder variables
+
+    :param recipe: YAML recipe or name of a YAML file to be parsed
+    :param variables: (Optional) dictionary of custom variables to override placeholders in the YAML file
+    :param functions: (Optional) function, list of functions or a file of functions.
+
+    :return: YAML Recipe converted to a dictionary
+    """
+    if variables is None:
+        variables = {}
+
+    recipe_string, recipe_object, functions, is_external_source = _read_recipe_source(recipe, functions)
+
+    _resolve_variables(variables, functions, _environment_references(recipe_object))
+
+    # Add variables to variables
+    _add_recipe_variables(variables)
+
+    _track_recipe_string(
+        recipe_string if recipe_string is not None else recipe_object,
+        is_external_source
+    )
+
     # Check if there are any templated valued to update
     recipe_object = _replace_templated_values(recipe_object, variables)
 
@@ -284,6 +451,10 @@ def _find_item_line(item_name: str, occurrence_index: int = 1) -> int:
     if not recipe_string:
         return None
     try:
+        if not isinstance(recipe_string, str):
+            # Recipe passed in as an object. Convert to YAML only now it's needed.
+            recipe_string = _yaml.dump(recipe_string, sort_keys=False, Dumper=_YAMLDumper, allow_unicode=True)
+            run_context['recipe_string'] = recipe_string
         # Use [ \t]* rather than \s* around the dash/name/colon so a blank
         # line immediately before the match can't be swallowed into it -
         # \s* matches newlines too, which would anchor the match (and its
@@ -378,6 +549,7 @@ def _run_actions(
                 raise ValueError('The run section of the recipe is not correctly structured')
 
         for action_type, params in action.items():
+            span = None
             try:
                 # If the action is conditional, check if it should be run
                 if (
@@ -385,7 +557,8 @@ def _run_actions(
                     not _evaluate_conditional(params["if"], variables)
                 ):
                     continue
-                
+
+                span = _profiling.start('action', action_type)
                 common_params = {}
                 # Add to common_params dict and remove from params
                 for key in ['if']:
@@ -402,21 +575,189 @@ def _run_actions(
 
                 # Execute the function
                 func(**args)
+                _profiling.finish(span)
             except Exception as e:
+                _profiling.finish(span, error=e)
                 # Wrap with enhanced error information
                 _wrap_and_raise('ACTION', action_type, None, e)
 
+def _where_columns(params: dict) -> _typing.Optional[set]:
+    """
+    Get the columns referenced by the where parameter, if any
+    """
+    if 'where' not in params:
+        return set()
+    return _where.columns(params['where'], params.get('where_params'))
+
+
+def _uses_all_columns(params: dict) -> bool:
+    """
+    Check whether an if condition may depend on which columns exist
+    """
+    condition = params.get('if')
+    return isinstance(condition, str) and bool(
+        _re.search(r'\b(df|columns|column_count)\b', condition)
+    )
+
+
+def _needed_columns(recipe: dict) -> _typing.Optional[list]:
+    """
+    Work out which columns from the read section a recipe
+    uses, so that connectors can avoid reading the others.
+
+    Working back from the write section, this collects the columns
+    written and the columns read by each wrangle. If any step may use
+    columns that can't be known in advance, e.g. a write without
+    columns, a wildcard or a custom function, all columns are needed.
+
+    :param recipe: Recipe object
+    :return: List of column names, or None if all columns are needed
+    """
+    writes = recipe.get('write')
+    if not writes:
+        # The result is returned with all columns
+        return None
+    if not isinstance(writes, list):
+        writes = [writes]
+
+    needed = set()
+    for export in writes:
+        if not isinstance(export, dict):
+            return None
+        for params in export.values():
+            if (
+                not isinstance(params, dict) or
+                not isinstance(params.get('columns'), list) or
+                any(k in params for k in ['not_columns', 'order_by']) or
+                _uses_all_columns(params)
+            ):
+                return None
+            columns = _capabilities._expand(params['columns'], None)
+            where_columns = _where_columns(params)
+            if columns is None or where_columns is None:
+                return None
+            needed |= columns | where_columns
+
+    wrangles_list = recipe.get('wrangles', recipe.get('wrangle')) or []
+    if not isinstance(wrangles_list, list):
+        wrangles_list = [wrangles_list]
+
+    for step in wrangles_list:
+        if isinstance(step, str):
+            step = {step: {}}
+        if not isinstance(step, dict):
+            return None
+        for wrangle, params in step.items():
+            params = dict(params or {})
+            if _uses_all_columns(params):
+                return None
+            where_columns = _where_columns(params)
+            params.pop('where', None)
+            reads = _capabilities.columns_read(wrangle, params, None)
+            if reads is None or where_columns is None:
+                return None
+            # Columns that are written are also kept, in case the
+            # wrangle behaves differently if they already exist
+            writes = _capabilities._expand(params.get('output', []), None) or set()
+            needed |= reads | where_columns | writes
+
+    return sorted(needed)
+
+
+def _row_filters(recipe: dict) -> list:
+    """
+    Get filters that rows must match from any filter wrangles at the
+    start of the recipe, so that connectors can avoid reading rows
+    that will be removed. The wrangles still run as normal.
+
+    :param recipe: Recipe object
+    :return: List of (column, 'in', values)
+    """
+    wrangles_list = recipe.get('wrangles', recipe.get('wrangle')) or []
+    if not isinstance(wrangles_list, list):
+        wrangles_list = [wrangles_list]
+
+    filters = []
+    for step in wrangles_list:
+        if not isinstance(step, dict) or list(step.keys()) != ['filter']:
+            break
+        params = step['filter'] or {}
+        if 'if' in params:
+            break
+
+        filters.extend(_where.row_filters(params.get('where'), params.get('where_params')))
+
+        inputs = params.get('input', [])
+        if not isinstance(inputs, list):
+            inputs = [inputs]
+        inputs = [
+            col for col in inputs
+            if isinstance(col, str) and '*' not in col and not col.lower().startswith('regex:')
+        ]
+        for key in ['equal', 'is_in']:
+            values = params.get(key)
+            if values is None:
+                continue
+            if not isinstance(values, list):
+                values = [values]
+            if values and all(_where._filter_value(x) for x in values):
+                filters.extend((col, 'in', values) for col in inputs)
+    return filters
+
+
+def _read_pushdown(
+    recipe: list,
+    read_params: dict,
+    needed_columns: list,
+    row_filters: list
+) -> dict:
+    """
+    Get the needed_columns and row_filters parameters for a read,
+    if the rows and columns it returns can safely be reduced
+    """
+    if len(recipe) != 1:
+        return {}
+
+    pushdown = {}
+    filters = list(row_filters or []) + _where.row_filters(
+        read_params.get('where'),
+        read_params.get('where_params')
+    )
+    if filters:
+        pushdown['row_filters'] = filters
+
+    if needed_columns is None or 'order_by' in read_params:
+        return pushdown
+    needed = set(needed_columns)
+    if 'columns' in read_params:
+        columns = _capabilities._expand(read_params['columns'], None)
+        if columns is None:
+            return pushdown
+        needed |= columns
+    where_columns = _where_columns(read_params)
+    if where_columns is None:
+        return pushdown
+    pushdown['needed_columns'] = sorted(needed | where_columns)
+    return pushdown
+
+
 def _read_data(
     recipe: _Union[dict, list],
     functions: dict = None,
     variables: dict = None,
-    input_dataframe: _pandas.DataFrame = None
+    input_dataframe: _pandas.DataFrame = None,
+    needed_columns: list = None,
+    row_filters: list = None
 ) -> _pandas.DataFrame:
     """
     Import data from requested datasources as defined by the recipe
 
     :param recipe: Read section of a recipe
     :param functions: (Optional) A dictionary of named custom functions passed in by the user
+    :param needed_columns: (Optional) Columns used by the rest of the recipe. \
+        Passed to connectors that support it so other columns aren't read.
+    :param row_filters: (Optional) List of (column, 'in', values) that rows \
+        must match. Passed to connectors that support it so other rows aren't read.
     :return: Dataframe of imported data
     """
     if functions is None:
@@ -437,6 +778,9 @@ def _read_data(
                 raise ValueError('The read section of the recipe is not correctly structured')
             
         for read_type, read_params in read.items():
+            # Stop if the recipe has been cancelled or timed out
+            _scheduler.check()
+            span = None
             try:
                 # If the action is conditional, check if it should be run
                 if (
@@ -445,6 +789,8 @@ def _read_data(
                 ):
                     return None
 
+                span = _profiling.start('read', read_type)
+
                 # Divide parameters into general and specific to that type of read
                 params_general = ['columns', 'not_columns', 'where', 'where_params', 'order_by', 'if']
                 params_specific = {
@@ -496,7 +842,10 @@ def _read_data(
                         func,
                         functions,
                         variables,
-                        common_params=params_general
+                        common_params={
+                            **params_general,
+                            **_read_pushdown(recipe, read_params, needed_columns, row_filters)
+                        }
                     )
 
                     _validate_function_args(func, args, read_type)
@@ -513,7 +862,9 @@ def _read_data(
                 else:
                     raise RuntimeError(f"Function {read_type} did not return a dataframe")
 
+                _profiling.finish(span, results[-1] if isinstance(df, _pandas.DataFrame) else df)
             except Exception as e:
+                _profiling.finish(span, error=e)
                 # Wrap with enhanced error information
                 _wrap_and_raise('READ', read_type, None, e)
     if len(results) == 1:
@@ -521,11 +872,179 @@ def _read_data(
     else:
         return results
 
+def _where_wrangle_columns(
+    params: dict,
+    capabilities: _capabilities.Capabilities,
+    df: _pandas.DataFrame
+) -> _typing.Optional[list]:
+    """
+    Get the columns a row-wise wrangle with where needs to be given
+
+    :param params: Parameters of the wrangle, with wildcards in the input expanded
+    :param capabilities: Capabilities of the wrangle
+    :param df: Dataframe the wrangle will be run against
+    :return: List of columns, or None for all columns
+    """
+    if capabilities.reads != 'input' or not capabilities.wildcards or not params.get('input'):
+        return None
+    return _wildcard_expansion(df.columns.tolist(), params['input'])
+
+
+def _assign_where(
+    df: _pandas.DataFrame,
+    df_original: _pandas.DataFrame,
+    columns: list
+) -> _pandas.DataFrame:
+    """
+    Assign the result of a wrangle run on the rows selected
+    by where back to those rows of the original dataframe
+
+    :param df: Result of the wrangle for the selected rows
+    :param df_original: The original dataframe. This is updated in place.
+    :param columns: Columns the wrangle created or modified
+    :return: The original dataframe with the new values
+    """
+    columns = set(columns)
+    for col in df.columns:
+        if col in columns:
+            # Same as merging and combining with the original values -
+            # rows that weren't selected, or got no value, keep the original
+            values = df[col].reindex(df_original.index)
+            if col in df_original.columns:
+                values = values.combine_first(df_original[col])
+            df_original[col] = values
+    return df_original
+
+
+def _unique_columns(
+    wrangle: str,
+    params: dict,
+    capabilities: _capabilities.Capabilities,
+    functions: dict,
+    df: _pandas.DataFrame
+) -> list:
+    """
+    Get the columns that determine the result of a wrangle run with unique
+
+    :param wrangle: Name of the wrangle
+    :param params: Parameters of the wrangle, with wildcards in the input expanded
+    :param capabilities: Capabilities of the wrangle
+    :param functions: Dictionary of named custom functions
+    :param df: Dataframe the wrangle will be run against
+    :return: List of columns. Rows with the same values in these columns get the same result.
+    """
+    if wrangle.split('.')[0] == 'custom':
+        # Row-wise custom functions are only given the input columns
+        func = _get_nested_function(wrangle, None, functions)
+        if 'df' in _function_spec(func).args:
+            raise NotImplementedError(f"unique parameter is not implemented for {wrangle} as it uses the whole dataframe")
+        # Custom functions may have side effects or give a different
+        # result each time, unless they are declared to be pure
+        if not capabilities.supports_unique:
+            raise NotImplementedError(
+                f"unique parameter is not implemented for {wrangle}. "
+                "Declare it as pure using wrangles.capabilities.register to use unique."
+            )
+        reads_input = True
+    elif not capabilities.supports_unique:
+        raise NotImplementedError(f"unique parameter is not implemented for {wrangle}")
+    else:
+        reads_input = capabilities.reads == 'input'
+
+    if reads_input and params.get('input'):
+        return _wildcard_expansion(df.columns.tolist(), params['input'])
+    return df.columns.tolist()
+
+
+def _unique_rows(
+    df: _pandas.DataFrame,
+    columns: list
+) -> _typing.Optional[tuple]:
+    """
+    Reduce a dataframe to the first row for each distinct combination of values
+
+    :param df: Dataframe to reduce
+    :param columns: Columns to find the distinct values of
+    :return: Tuple of the reduced dataframe and the position within it \
+        of the matching row for each row of the original. None if there \
+        are no duplicates or the values can't be compared.
+    """
+    keys = [df[col] for col in columns]
+    # Values such as 1, True and 1.0 are equal, but wrangles
+    # may treat them differently, so the type must also match
+    keys += [
+        key.map(type).rename(f'{key.name} type')
+        for key in keys
+        if key.dtype == object
+    ]
+    try:
+        groups = df.groupby(keys, sort=False, dropna=False).ngroup()
+    except TypeError:
+        # e.g. lists or dicts, which can't be hashed
+        _logging.debug(": Wrangling :: unique skipped as the values can't be compared")
+        return None
+
+    groups = groups.to_numpy()
+    first = _pandas.Series(groups).drop_duplicates().index
+    if len(first) == len(df):
+        return None
+
+    _logging.info(f": Wrangling :: unique :: {len(first)} distinct of {len(df)} rows")
+    return df.take(first), groups
+
+
+def _expand_unique(
+    df_unique: _pandas.DataFrame,
+    df_full: _pandas.DataFrame,
+    positions,
+    wrangle: str,
+    params: dict,
+    all_columns: bool
+) -> _pandas.DataFrame:
+    """
+    Copy the result of a wrangle run on distinct rows back to all of the rows
+
+    :param df_unique: Result of running the wrangle on the distinct rows
+    :param df_full: All of the rows before the wrangle was run
+    :param positions: Position in df_unique of the matching row for each row of df_full
+    :param wrangle: Name of the wrangle
+    :param params: Parameters the wrangle was called with
+    :param all_columns: Whether the rows were made distinct using every column
+    :return: Dataframe with the result for every row
+    """
+    # Number of distinct rows the wrangle was given
+    distinct = int(positions.max()) + 1
+    if len(df_unique) != distinct:
+        raise ValueError(f"unique parameter is not supported for {wrangle} as it changed the number of rows")
+
+    touched = _touched_columns(wrangle, params, df_unique, set(df_full.columns), distinct)
+
+    if touched is None:
+        if not all_columns:
+            raise ValueError(f"unique parameter is not supported for {wrangle} as the columns it changes can't be determined")
+        # Every column was used to find distinct rows, so
+        # the result for matching rows is exactly the same
+        df = df_unique.take(positions)
+        df.index = df_full.index
+        return df
+
+    touched = set(touched)
+    df = df_full.copy(deep=False)
+    for col in df_unique.columns:
+        if col in touched:
+            values = df_unique[col].take(positions)
+            values.index = df_full.index
+            df[col] = values
+    return df
+
+
 def _execute_wrangles(
     df: _pandas.DataFrame,
     wrangles_list: list,
     functions: dict = None,
-    variables: dict = None
+    variables: dict = None,
+    start: int = 1,
+    frame_cleaned: bool = False
 ) -> _pandas.DataFrame:
     """
     Execute a list of Wrangles on a dataframe
@@ -534,6 +1053,8 @@ def _execute_wrangles(
     :param wrangles_list: List of Wrangles + their definitions to be executed
     :param functions: (Optional) A dictionary of named custom functions passed in by the user
     :param variables: (Optional) A dictionary of variables to pass to the recipe
+    :param start: (Optional) Number of the first wrangle in the list, used in messages
+    :param frame_cleaned: (Optional) Whether NaN's have already been cleaned from the whole dataframe
     :return: Pandas Dataframe of the Wrangled data
     """
     # remove empty-named columns before executing wrangles - these can cause issues with some wrangles and are unlikely to be intentional
@@ -549,7 +1070,7 @@ def _execute_wrangles(
     if not isinstance(wrangles_list, list):
         wrangles_list = [wrangles_list]
 
-    for i, step in enumerate(wrangles_list, 1):  # Start from 1 for user-friendly numbering  
+    for i, step in enumerate(wrangles_list, start):  # Start from 1 for user-friendly numbering  
         # Ensure step is a dictionary
         if not isinstance(step, dict):
             if isinstance(step, str):
@@ -559,6 +1080,9 @@ def _execute_wrangles(
                 raise ValueError('The wrangles section of the recipe is not correctly structured')
 
         for wrangle, params in step.items():
+            # Stop if the recipe has been cancelled or timed out
+            _scheduler.check()
+            span = None
             try:
                 if params is None: params = {}
                 # Replace any conflicting reserved words with a safe alternative
@@ -566,9 +1090,15 @@ def _execute_wrangles(
 
                 original_params = params.copy()
                 original_columns = set(df.columns)
+                original_row_count = len(df)
+
+                # Set if the wrangle may have changed any column
+                # without declaring it as an input or output
+                full_frame_changed = False
 
                 # Used to store parameters common to all wrangles - e.g where
                 common_params = {}
+                where_assign = False
 
                 # If the action is conditional, check if it should be run
                 # before column validation or wildcard expansion so that
@@ -591,20 +1121,12 @@ def _execute_wrangles(
                     _logging.info(f": Wrangling :: {wrangle} skipped due to not passing the if statement.")
                     continue
 
-                # Blacklist of Wrangles not to allow wildcards for
+                span = _profiling.start('wrangle', wrangle, df, i)
+
+                capabilities = _capabilities.get(wrangle)
+
                 original_input = params.get('input') # Save for later reference
-                if (
-                    'input' in params and 
-                    wrangle not in [
-                        'math',
-                        'maths',
-                        'merge.key_value_pairs',
-                        'split.text',
-                        'split.list',
-                        'select.element',
-                        'rename'
-                    ]
-                ):
+                if 'input' in params and capabilities.wildcards:
                     # Expand out any wildcards or regex in column names
                     params['input'] = _wildcard_expansion(
                         all_columns=df.columns.tolist(),
@@ -613,19 +1135,32 @@ def _execute_wrangles(
 
                 # Filter dataframe if a where clause is present
                 if 'where' in params.keys():
-                    if wrangle in _where_not_implemented:
+                    if capabilities.where == 'unsupported':
                         raise NotImplementedError(f"where parameter is not implemented for {wrangle}")
 
-                    # Save original so we can merge back later
-                    df_original = df.copy()
-                    
+                    # Wrangles that only write their outputs can be run on just the
+                    # selected rows and columns, with the results assigned back to
+                    # those rows. Otherwise the result is merged back to the original.
+                    where_assign = (
+                        capabilities.where == 'merge'
+                        and capabilities.row_wise
+                        and df.index.is_unique
+                    )
+
+                    # Save original so we can merge back later. When assigning
+                    # back, the wrangle never sees the original so no copy is needed
+                    df_original = df.copy(deep=not where_assign)
+
                     # Save original index, filter data, then restore index
                     df = _filter_dataframe(
                         df,
+                        columns=_where_wrangle_columns(params, capabilities, df) if where_assign else None,
                         where = params.get('where'),
                         where_params= params.get('where_params', None),
                         preserve_index=True
                     )
+                    where_columns = set(df.columns)
+                    where_row_count = len(df)
 
                     # If where filters out all rows, skip actually executing the
                     # wrangle (some wrangles error when given no rows), but if it
@@ -661,10 +1196,21 @@ def _execute_wrangles(
                                     df_original[col] = ''
 
                         df = df_original
+                        _profiling.finish(span, df)
                         continue
 
+                # Only run the wrangle on the distinct values of the columns it
+                # reads, and copy the results to the rest of the rows afterwards
+                unique = None
+                if params.get('unique') and len(df) > 0:
+                    unique_columns = _unique_columns(wrangle, params, capabilities, functions, df)
+                    unique = _unique_rows(df, unique_columns)
+                    if unique is not None:
+                        df_full = df
+                        df, unique_positions = unique
+
                 # Add to common_params dict and remove from params
-                for key in ['where', 'where_params', 'if']:
+                for key in ['where', 'where_params', 'if', 'unique']:
                     if key in params.keys():
                         common_params[key] = params.pop(key)
 
@@ -672,6 +1218,7 @@ def _execute_wrangles(
                 _wrangle_start_time = _time.perf_counter()
 
                 if wrangle.split('.')[0] == 'pandas':
+                    full_frame_changed = True
                     # Execute a pandas method
                     # TODO: disallow any hidden methods
                     # TODO: remove parameters, allow selecting in/out columns
@@ -697,10 +1244,11 @@ def _execute_wrangles(
                     func = _get_nested_function(wrangle, None, functions)
 
                     # Get user's function arguments
-                    fn_argspec = _inspect.getfullargspec(func)
+                    fn_argspec = _function_spec(func)
 
                     # If function's arguments contain df, pass them the whole dataframe
                     if 'df' in fn_argspec.args:
+                        full_frame_changed = True
                         args = _add_special_parameters(
                             params,
                             func,
@@ -774,17 +1322,20 @@ def _execute_wrangles(
                         else:
                             result_type = 'reduce'
 
+                        # Stop between rows if the recipe is cancelled
+                        row_func = _scheduler.checked(func)
+
                         # If the custom functions has kwargs or a parameter
                         # matching a column name, execute including those
                         if fn_argspec.varkw or cols_renamed:
                             df[params['output']] = df_temp.apply(
-                                lambda x: func(**{**x, **params_temp}),
+                                lambda x: row_func(**{**x, **params_temp}),
                                 axis=1,
                                 result_type=result_type
                             )
                         else:
                             df[params['output']] = df_temp.apply(
-                                lambda _: func(**params_temp),
+                                lambda _: row_func(**params_temp),
                                 axis=1,
                                 result_type=result_type
                             )
@@ -817,10 +1368,27 @@ def _execute_wrangles(
                     # Execute the function
                     df = func(df=df, **params)
 
+                if unique is not None:
+                    df = _expand_unique(
+                        df,
+                        df_full,
+                        unique_positions,
+                        wrangle,
+                        params,
+                        len(unique_columns) == len(df_full.columns)
+                    )
+
+                where_touched = None
+                if where_assign:
+                    where_touched = _touched_columns(wrangle, params, df, where_columns, where_row_count)
+
+                if where_touched is not None:
+                    df = _assign_where(df, df_original, where_touched)
+
                 # If the user specified a where, we need to merge this back to the original dataframe
                 # Certain wrangles (e.g. transpose, select.group_by) manipulate the structure of the 
                 # dataframe and do not make sense to merge back to the original
-                if 'where' in original_params and wrangle not in _where_overwrite_output:
+                elif 'where' in original_params and capabilities.where != 'overwrite':
 
                     # Wrangle explictly defined the output
                     if 'output' in params.keys():
@@ -897,11 +1465,23 @@ def _execute_wrangles(
                     ]
 
                 with _pandas.option_context('future.no_silent_downcasting', True):
-                    # Clean up NaN's
-                    df = df.fillna('')
-                    # Run a second pass of df.fillna() in order to fill NaT's (not picked up before) with zeros
-                    # Could also use _pandas.api.types.is_datetime64_any_dtype(df) as a check
-                    df = df.fillna('0')
+                    if _config.nan_cleanup != 'write':
+                        # Clean up NaN's. The first wrangle to run cleans the
+                        # whole dataframe, after that only the columns each
+                        # wrangle created or modified need to be checked
+                        df = _clean_nan(
+                            df,
+                            _touched_columns(
+                                wrangle,
+                                params,
+                                df,
+                                original_columns,
+                                original_row_count
+                            )
+                            if frame_cleaned and not full_frame_changed
+                            else None
+                        )
+                        frame_cleaned = True
                     if wrangle != 'log':  
                         # Determine what columns were actually produced for logging  
                         if 'output' in params:  
@@ -957,44 +1537,271 @@ def _execute_wrangles(
                         _wrangle_elapsed = _time.perf_counter() - _wrangle_start_time
                         _logging.info(f": Wrangling :: {wrangle} :: {input_display} >> {output_display} :: {_wrangle_elapsed:.3f}s Completed")
 
+                _profiling.finish(span, df)
             except Exception as e:
+                _profiling.finish(span, error=e)
                 # Wrap with enhanced error information and include wrangle index
                 _wrap_and_raise('WRANGLE', wrangle, i, e)
 
     return df
 
 
-def _filter_dataframe(
-    df: _pandas.DataFrame,
-    columns: list = None,
-    not_columns: list = None,
-    where: str = None,
-    where_params: _Union[list, dict] = None,
-    order_by: str = None,
-    preserve_index: bool = False,
-    **_
-) -> _pandas.DataFrame:
+def _parallel_group(wrangles_list: list, columns: list) -> list:
     """
-    Filter a DataFrame
+    Find the wrangles at the start of a list that
+    don't depend on each other's columns, so can run at the same time.
 
-    :param df: Input DataFrame
-    :param columns: List of columns to include
-    :param not_columns: List of columns to exclude
-    :param where: SQL where criteria to filter based on
-    :param where_params: List of parameters to pass to execute method. \
-        The syntax used to pass parameters is database driver dependent.
-    :param order_by: SQL order by criteria to sort based on
-    :param preserve_index: Whether the maintain the index after filtering or reset to the default order
+    A wrangle can only share a group if the columns it reads and
+    writes are known in advance and it doesn't change the number of rows.
+
+    :param wrangles_list: List of Wrangles + their definitions
+    :param columns: Columns of the dataframe before the wrangles run
+    :return: List of (step, columns read, columns written). \
+        Always includes at least the first wrangle.
     """
+    group = []
+    group_reads = set()
+    group_writes = set()
+    columns = list(columns)
+
+    for step in wrangles_list:
+        if isinstance(step, str):
+            step = {step: {}}
+
+        reads = writes = None
+        if isinstance(step, dict) and len(step) == 1:
+            wrangle, params = list(step.items())[0]
+            params = params or {}
+            if 'if' not in params:
+                reads = _capabilities.columns_read(wrangle, params, columns)
+                writes = _capabilities.columns_written(wrangle, params, columns)
+
+        independent = (
+            reads is not None and
+            writes is not None and
+            reads <= set(columns) and
+            not reads & group_writes and
+            not writes & (group_reads | group_writes)
+        )
 
-    if where or order_by:
-        sql = (
-            f"""
-            SELECT *
-            FROM df
-            {("WHERE " + where if where else "")}
-            {("ORDER BY " + order_by if order_by else "")}
-            ;
+        if not group:
+            group.append((step, reads, writes))
+            if not independent:
+                break
+        elif independent:
+            group.append((step, reads, writes))
+        else:
+            break
+
+        group_reads |= reads
+        group_writes |= writes
+        columns.extend(col for col in writes if col not in columns)
+
+    return group
+
+
+def _execute_wrangles_parallel(
+    df: _pandas.DataFrame,
+    wrangles_list: list,
+    functions: dict = None,
+    variables: dict = None,
+    max_workers: int = 4,
+    start: int = 1,
+    frame_cleaned: bool = False
+) -> _pandas.DataFrame:
+    """
+    Execute a list of Wrangles on a dataframe, running consecutive
+    wrangles that don't depend on each other at the same time.
+
+    Each wrangle in a parallel group runs on only the columns it reads.
+    The columns it writes are then merged back in the order the wrangles
+    are listed, so the result is the same as running them one by one.
+
+    :param df: Dateframe that the Wrangles will be run against
+    :param wrangles_list: List of Wrangles + their definitions to be executed
+    :param functions: (Optional) A dictionary of named custom functions passed in by the user
+    :param variables: (Optional) A dictionary of variables to pass to the recipe
+    :param max_workers: (Optional) Maximum number of wrangles to run at once
+    :param start: (Optional) Number of the first wrangle in the list, used in messages
+    :param frame_cleaned: (Optional) Whether NaN's have already been cleaned from the whole dataframe
+    :return: Pandas Dataframe of the Wrangled data
+    """
+    if not isinstance(wrangles_list, list):
+        wrangles_list = [wrangles_list]
+
+    if any(col == "" for col in df.columns):
+        df = df.loc[:, df.columns != ""]
+
+    i = 1
+    while i <= len(wrangles_list):
+        group = _parallel_group(wrangles_list[i - 1:], df.columns)
+        if len(group) == 1 or max_workers < 2:
+            df = _execute_wrangles(
+                df,
+                [step for step, _, _ in group],
+                functions,
+                variables,
+                start=start + i - 1,
+                frame_cleaned=frame_cleaned
+            )
+        else:
+            _logging.info(
+                f": Wrangling :: Running {len(group)} wrangles in parallel :: "
+                + ', '.join(list(step.keys())[0] for step, _, _ in group)
+            )
+            results = _scheduler.map(
+                _execute_wrangles,
+                [df[[col for col in df.columns if col in reads]].copy() for _, reads, _ in group],
+                [[step] for step, _, _ in group],
+                [functions] * len(group),
+                [variables] * len(group),
+                [start + i - 1 + j for j in range(len(group))],
+                max_workers=max_workers
+            )
+
+            df = df.copy(deep=False)
+            for (_, reads, writes), result in zip(group, results):
+                for col in result.columns:
+                    if col in writes or col not in reads:
+                        df[col] = result[col].values
+
+            if not frame_cleaned and _config.nan_cleanup != 'write':
+                df = _clean_nan(df)
+
+        i += len(group)
+        frame_cleaned = True
+
+    return df
+
+
+def _clean_nan(
+    df: _pandas.DataFrame,
+    columns: list = None
+) -> _pandas.DataFrame:
+    """
+    Replace NaN values with empty strings, and NaT values with '0'
+
+    :param df: Dataframe to clean
+    :param columns: (Optional) Only clean these columns. If omitted, the whole dataframe is cleaned.
+    :return: Cleaned dataframe
+    """
+    with _pandas.option_context('future.no_silent_downcasting', True):
+        if columns is None or not df.columns.is_unique:
+            df = df.fillna('')
+            # Run a second pass of df.fillna() in order to fill NaT's (not picked up before) with zeros
+            # Could also use _pandas.api.types.is_datetime64_any_dtype(df) as a check
+            return df.fillna('0')
+
+        # Columns are updated in place. The dataframe has already
+        # been copied by an earlier cleanup or by the wrangle itself
+        with _pandas.option_context('mode.chained_assignment', None):
+            for col in columns:
+                if col in df.columns and df[col].hasnans:
+                    df[col] = df[col].fillna('').fillna('0')
+
+    return df
+
+
+def _touched_columns(
+    wrangle: str,
+    params: dict,
+    df: _pandas.DataFrame,
+    original_columns: set,
+    original_row_count: int
+) -> _typing.Optional[list]:
+    """
+    Identify the columns a wrangle created or modified
+
+    :param wrangle: Name of the wrangle
+    :param params: Parameters the wrangle was called with
+    :param df: Dataframe returned by the wrangle
+    :param original_columns: Columns before the wrangle was run
+    :param original_row_count: Number of rows before the wrangle was run
+    :return: List of columns, or None if they can't be determined \
+        and the whole dataframe should be treated as modified
+    """
+    capabilities = _capabilities.get(wrangle)
+
+    # e.g. log returns the dataframe unchanged
+    if capabilities.writes == 'none':
+        return []
+
+    # Structural changes may affect any column
+    if (
+        len(df) != original_row_count or
+        capabilities.where == 'overwrite' or
+        ('output' not in params and 'input' not in params)
+    ):
+        return None
+
+    declared = params['output'] if 'output' in params else params['input']
+    if not isinstance(declared, list):
+        declared = [declared]
+
+    # Outputs may be given as dicts of renamed columns
+    names = []
+    for item in declared:
+        if isinstance(item, dict):
+            names.extend(list(item.keys()) + list(item.values()))
+        else:
+            names.append(item)
+
+    all_columns = df.columns.tolist()
+    touched = [col for col in all_columns if col not in original_columns]
+    for name in names:
+        if name in all_columns:
+            touched.append(name)
+        elif isinstance(name, str) and ('*' in name or name.lower().startswith('regex:')):
+            try:
+                touched.extend(_wildcard_expansion(all_columns, [name]))
+            except (KeyError, ValueError):
+                return None
+
+    return touched
+
+
+def _filter_dataframe(
+    df: _pandas.DataFrame,
+    columns: list = None,
+    not_columns: list = None,
+    where: str = None,
+    where_params: _Union[list, dict] = None,
+    order_by: str = None,
+    preserve_index: bool = False,
+    **_
+) -> _pandas.DataFrame:
+    """
+    Filter a DataFrame
+
+    :param df: Input DataFrame
+    :param columns: List of columns to include
+    :param not_columns: List of columns to exclude
+    :param where: SQL where criteria to filter based on
+    :param where_params: List of parameters to pass to execute method. \
+        The syntax used to pass parameters is database driver dependent.
+    :param order_by: SQL order by criteria to sort based on
+    :param preserve_index: Whether the maintain the index after filtering or reset to the default order
+    """
+
+    # Evaluate simple criteria directly against the dataframe
+    # and only fall back to SQLite for anything more complex
+    mask = None
+    if where and not order_by and df.index.is_unique:
+        mask = _where.mask(df, where, where_params)
+
+    if mask is not None:
+        df = df.loc[mask]
+        if not preserve_index:
+            df = df.reset_index(drop=True)
+
+    elif where or order_by:
+        sql = (
+            f"""
+            SELECT *
+            FROM df
+            {("WHERE " + where if where else "")}
+            {("ORDER BY " + order_by if order_by else "")}
+            ;
             """
         )
         # Use SQL to get the indexes of filtered rows and
@@ -1005,7 +1812,8 @@ def _filter_dataframe(
                 sql,
                 where_params,
                 preserve_index=True,
-                preserve_data_types=False
+                preserve_data_types=False,
+                engine='sqlite'
             ).index.to_list()
         ]
         if not preserve_index:
@@ -1062,6 +1870,9 @@ def _write_data(
                 raise ValueError('The write section of the recipe is not correctly structured')
 
         for export_type, params in export.items():
+            # Stop if the recipe has been cancelled or timed out
+            _scheduler.check()
+            span = None
             try:
                 # Filter the dataframe as requested before passing
                 # to the desired write function
@@ -1085,6 +1896,8 @@ def _write_data(
                 ):
                     continue
 
+                span = _profiling.start('write', export_type, df_temp)
+
                 # Separate any parameters that are commmon to all write functions
                 common_params = {}
                 for key in ['columns', 'not_columns', 'where', 'where_params', 'order_by', 'if']:
@@ -1113,17 +1926,472 @@ def _write_data(
 
                     # Execute the function
                     func(df_temp, **args)
+                _profiling.finish(span)
             except Exception as e:
+                _profiling.finish(span, error=e)
                 # Wrap with enhanced error information
                 _wrap_and_raise('WRITE', export_type, None, e)
     return df_return
 
 
+def _run_wrangles(
+    recipe: dict,
+    df: _pandas.DataFrame,
+    wrangles_list: list,
+    functions: dict,
+    variables: dict,
+    start: int = 1,
+    frame_cleaned: bool = False
+) -> _pandas.DataFrame:
+    """
+    Execute the wrangles for a recipe, in parallel if requested
+
+    :param recipe: Recipe object, checked for parallel settings
+    :param df: Dateframe that the Wrangles will be run against
+    :param wrangles_list: List of Wrangles + their definitions to be executed
+    :param functions: Dictionary of named custom functions
+    :param variables: Dictionary of variables available to the recipe
+    :param start: (Optional) Number of the first wrangle in the list, used in messages
+    :param frame_cleaned: (Optional) Whether NaN's have already been cleaned from the whole dataframe
+    :return: Pandas Dataframe of the Wrangled data
+    """
+    settings = recipe.get('parallel')
+    if not settings:
+        return _execute_wrangles(df, wrangles_list, functions, variables, start, frame_cleaned)
+
+    if not isinstance(settings, dict):
+        settings = {}
+    max_workers = int(settings.get('max_workers', 4))
+    if max_workers < 1:
+        raise ValueError('parallel max_workers must be at least 1')
+
+    return _execute_wrangles_parallel(
+        df,
+        wrangles_list,
+        functions,
+        variables,
+        max_workers,
+        start,
+        frame_cleaned
+    )
+
+
+def _step_name(step) -> str:
+    """
+    Get the name of a wrangle from its definition
+    """
+    if isinstance(step, dict) and step:
+        return list(step.keys())[0]
+    return str(step)
+
+
+def _row_local_split(wrangles_list: list, functions: dict) -> int:
+    """
+    Find the first wrangle that needs all the rows at once
+
+    :param wrangles_list: List of Wrangles + their definitions
+    :param functions: Dictionary of named custom functions
+    :return: Position of the wrangle, or the length of \
+        the list if every wrangle works row by row
+    """
+    for i, step in enumerate(wrangles_list):
+        if isinstance(step, str):
+            step = {step: {}}
+        if isinstance(step, dict) and not all(
+            _capabilities.is_row_local(wrangle, params, functions)
+            for wrangle, params in step.items()
+        ):
+            return i
+    return len(wrangles_list)
+
+
+def _run_incremental(
+    recipe: dict,
+    df: _pandas.DataFrame,
+    wrangles_list: list,
+    functions: dict,
+    variables: dict
+) -> _pandas.DataFrame:
+    """
+    Execute the wrangles for a recipe on only the rows that are
+    new or have changed since the previous run, reusing the
+    stored results for the others. See wrangles.incremental
+
+    :param recipe: Recipe object
+    :param df: Dateframe that the Wrangles will be run against
+    :param wrangles_list: List of Wrangles + their definitions to be executed
+    :param functions: Dictionary of named custom functions
+    :param variables: Dictionary of variables available to the recipe
+    :return: Pandas Dataframe of the Wrangled data
+    """
+    settings = recipe['incremental']
+    if not isinstance(settings, dict) or not all(k in settings for k in ['key', 'path']):
+        raise ValueError('incremental requires a key and path')
+    if not isinstance(wrangles_list, list):
+        wrangles_list = [wrangles_list]
+
+    # Only wrangles that work row by row can be run on
+    # the changed rows alone. Any after that run on all rows.
+    split = _row_local_split(wrangles_list, functions)
+    if split == 0 or len(df) == 0:
+        if split == 0:
+            _logging.warning(
+                f": Incremental :: {_step_name(wrangles_list[0])} requires all rows. "
+                "All rows will be processed."
+            )
+        return _run_wrangles(recipe, df, wrangles_list, functions, variables)
+    if split < len(wrangles_list):
+        _logging.info(
+            f": Incremental :: {_step_name(wrangles_list[split])} requires all rows. "
+            "It and the wrangles after it will run on all rows."
+        )
+
+    manifest = _incremental.Manifest(
+        settings['path'],
+        settings['key'],
+        wrangles_list[:split],
+        df
+    )
+    changed = manifest.changed()
+    _logging.info(f": Incremental :: {int(changed.sum())} of {len(df)} rows are new or changed")
+
+    result = None
+    if changed.any():
+        result = _run_wrangles(
+            recipe,
+            df.loc[changed].reset_index(drop=True),
+            wrangles_list[:split],
+            functions,
+            variables
+        )
+
+    df = manifest.merge(result)
+    manifest.save(df)
+
+    if split < len(wrangles_list):
+        df = _run_wrangles(
+            recipe,
+            df,
+            wrangles_list[split:],
+            functions,
+            variables,
+            start=split + 1,
+            frame_cleaned=True
+        )
+    return df
+
+
+def _run_wrangles_checkpointed(
+    recipe: dict,
+    df: _pandas.DataFrame,
+    wrangles_list: list,
+    functions: dict,
+    variables: dict,
+    checkpoints: _checkpoint.Checkpoints
+) -> _pandas.DataFrame:
+    """
+    Execute the wrangles for a recipe, saving the data after each
+    selected wrangle. If resuming, the latest saved data is loaded
+    and only the wrangles after it are run.
+
+    :param recipe: Recipe object
+    :param df: Dateframe that the Wrangles will be run against
+    :param wrangles_list: List of Wrangles + their definitions to be executed
+    :param functions: Dictionary of named custom functions
+    :param variables: Dictionary of variables available to the recipe
+    :param checkpoints: Where to save and load the data
+    :return: Pandas Dataframe of the Wrangled data
+    """
+    if not isinstance(wrangles_list, list):
+        wrangles_list = [wrangles_list]
+
+    # The key for each wrangle depends on the input data, the
+    # variables used and every wrangle up to and including it
+    variables_key = _variables_cache_key(_environment_references(wrangles_list), variables)
+    keys = []
+    key = checkpoints.key(_checkpoint.fingerprint(df), 0, variables_key)
+    for i, step in enumerate(wrangles_list, 1):
+        key = checkpoints.key(key, i, step)
+        keys.append(key)
+
+    completed = 0
+    # Variables that can't be compared may have changed since the checkpoints were saved
+    if checkpoints.resume and variables_key is not None:
+        for i in reversed(range(len(wrangles_list))):
+            if not checkpoints.selected(wrangles_list[i]):
+                continue
+            saved = checkpoints.load(keys[i])
+            if saved is not None:
+                df, completed = saved, i + 1
+                _logging.info(f": Checkpoint :: Resuming after wrangle {completed}")
+                break
+
+    # Run the remaining wrangles up to each checkpoint
+    segment_start = completed
+    for i in range(completed, len(wrangles_list)):
+        selected = checkpoints.selected(wrangles_list[i])
+        if selected or i == len(wrangles_list) - 1:
+            df = _run_wrangles(
+                recipe,
+                df,
+                wrangles_list[segment_start:i + 1],
+                functions,
+                variables,
+                start=segment_start + 1,
+                frame_cleaned=segment_start > 0
+            )
+            if selected:
+                checkpoints.save(keys[i], df)
+            segment_start = i + 1
+
+    return df
+
+
+def _read_chunks(
+    recipe: _Union[dict, list],
+    functions: dict,
+    variables: dict,
+    input_dataframe: _pandas.DataFrame,
+    chunk_size: int,
+    needed_columns: list = None,
+    row_filters: list = None
+):
+    """
+    Read data for a streaming recipe as a series of chunks.
+
+    If the read section is a single read from a connector that
+    supports reading in chunks, the data is never fully loaded.
+    Otherwise, the data is read in full and then divided into chunks.
+
+    :param recipe: Read section of a recipe
+    :param functions: Dictionary of named custom functions
+    :param variables: Dictionary of variables available to the recipe
+    :param input_dataframe: (Optional) Dataframe passed in by the user
+    :param chunk_size: Number of rows per chunk
+    :param needed_columns: (Optional) Columns used by the rest of the recipe
+    :param row_filters: (Optional) List of (column, 'in', values) that rows must match
+    :return: A generator of dataframes
+    """
+    reads = recipe if isinstance(recipe, list) else [recipe]
+    if recipe and len(reads) == 1:
+        read = reads[0]
+        if isinstance(read, str):
+            read = {read: {}}
+        read_type, read_params = list(read.items())[0]
+        read_params = dict(read_params or {})
+
+        # Sorting needs all the data
+        if (
+            'order_by' not in read_params and
+            read_type not in ['input', 'join', 'concatenate', 'union'] and
+            read_type.split('.')[0] != 'custom'
+        ):
+            func = None
+            try:
+                func = _get_nested_function(read_type, _connectors, functions, 'read_chunks')
+            except Exception:
+                pass
+
+            if func is not None and not (
+                "if" in read_params and
+                not _evaluate_conditional(read_params["if"], variables)
+            ):
+                pushdown = _read_pushdown(reads, read_params, needed_columns, row_filters)
+                params_general = {
+                    key: read_params.pop(key)
+                    for key in ['columns', 'not_columns', 'where', 'where_params', 'if']
+                    if key in read_params
+                }
+                args = _add_special_parameters(
+                    {**read_params, 'chunk_size': chunk_size},
+                    func,
+                    functions,
+                    variables,
+                    common_params={**params_general, **pushdown}
+                )
+                _validate_function_args(func, args, read_type)
+
+                try:
+                    chunks = func(**args)
+                    first = next(chunks, None)
+                except NotImplementedError as e:
+                    _logging.info(f": Streaming :: {read_type} will be read in full :: {e}")
+                except Exception as e:
+                    _wrap_and_raise('READ', read_type, None, e)
+                else:
+                    if first is None:
+                        first = _pandas.DataFrame()
+                    yield _filter_dataframe(first, **params_general)
+                    for chunk in chunks:
+                        yield _filter_dataframe(chunk, **params_general)
+                    return
+
+    if recipe:
+        df = _read_data(recipe, functions, variables, input_dataframe, needed_columns, row_filters)
+        if df is None:
+            df = _pandas.DataFrame()
+        if isinstance(df, list) and all([isinstance(x, _pandas.DataFrame) for x in df]):
+            df = _pandas.concat(df, ignore_index=True)
+        if not isinstance(df, _pandas.DataFrame):
+            raise RuntimeError("Read did not return a valid dataframe")
+    elif input_dataframe is not None:
+        df = input_dataframe
+    else:
+        df = _pandas.DataFrame()
+
+    for start in range(0, max(len(df), 1), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+
+def _run_streaming(
+    recipe: dict,
+    functions: dict,
+    variables: dict,
+    dataframe: _pandas.DataFrame = None
+) -> _pandas.DataFrame:
+    """
+    Read, wrangle and write the data for a recipe one chunk
+    of rows at a time so that memory use is bounded by the
+    chunk size rather than the size of the data.
+
+    If a wrangle needs every row at once e.g. sort or group_by,
+    the chunks are combined at that point and the remainder of
+    the recipe runs on all the data.
+
+    :param recipe: Recipe object
+    :param functions: Dictionary of named custom functions
+    :param variables: Dictionary of variables available to the recipe
+    :param dataframe: (Optional) Dataframe passed in by the user
+    :return: The result dataframe, if requested by a dataframe write \
+        or there is no write section
+    """
+    settings = recipe['streaming']
+    if not isinstance(settings, dict):
+        settings = {}
+    chunk_size = int(settings.get('chunk_size', 100000))
+    if chunk_size < 1:
+        raise ValueError('streaming chunk_size must be at least 1')
+
+    wrangles_list = recipe.get('wrangles', recipe.get('wrangle', []))
+    if not isinstance(wrangles_list, list):
+        wrangles_list = [wrangles_list]
+
+    # Stream wrangles up to the first that needs all the data
+    split = _row_local_split(wrangles_list, functions)
+    if split < len(wrangles_list):
+        _logging.warning(
+            f": Streaming :: {_step_name(wrangles_list[split])} requires all rows. "
+            "Chunks will be combined before it runs."
+        )
+
+    def wrangled_chunks():
+        chunks = _read_chunks(
+            recipe.get('read'),
+            functions,
+            variables,
+            dataframe,
+            chunk_size,
+            _needed_columns(recipe),
+            _row_filters(recipe)
+        )
+        for chunk in chunks:
+            _scheduler.check()
+            if wrangles_list[:split]:
+                chunk = _run_wrangles(recipe, chunk, wrangles_list[:split], functions, variables)
+                if _config.nan_cleanup == 'write':
+                    chunk = _clean_nan(chunk)
+            yield chunk
+
+    writes = recipe.get('write', [])
+    if not isinstance(writes, list):
+        writes = [writes]
+
+    if split < len(wrangles_list):
+        # Materialise the data for the remaining wrangles
+        df = _pandas.concat(list(wrangled_chunks()), ignore_index=True)
+        df = _run_wrangles(recipe, df, wrangles_list[split:], functions, variables)
+        if _config.nan_cleanup == 'write':
+            df = _clean_nan(df)
+        if writes:
+            df = _write_data(df, writes, functions, variables)
+        return df
+
+    # Open a chunk writer for each write that supports it.
+    # Any others are collected and written in full at the end.
+    writers = []
+    collected = []
+    for export in writes:
+        if isinstance(export, str):
+            export = {export: {}}
+        for export_type, params in export.items():
+            params = dict(params or {})
+            writer = None
+            if (
+                export_type != 'dataframe' and
+                export_type.split('.')[0] != 'custom' and
+                not any(k in params for k in ['if', 'order_by'])
+            ):
+                try:
+                    func = _get_nested_function(export_type, _connectors, functions, 'chunk_writer')
+                except Exception:
+                    func = None
+
+                if func is not None:
+                    common_params = {
+                        key: params.pop(key)
+                        for key in ['columns', 'not_columns', 'where', 'where_params']
+                        if key in params
+                    }
+                    try:
+                        args = _add_special_parameters(
+                            params,
+                            func,
+                            functions,
+                            variables,
+                            common_params=common_params
+                        )
+                        _validate_function_args(func, args, export_type)
+                        writer = func(**args)
+                    except NotImplementedError as e:
+                        _logging.info(f": Streaming :: {export_type} will be written in full :: {e}")
+                    except Exception as e:
+                        _wrap_and_raise('WRITE', export_type, None, e)
+                    else:
+                        writers.append((export_type, writer, common_params))
+
+            if writer is None:
+                collected.append({export_type: params})
+
+    results = []
+    try:
+        for chunk in wrangled_chunks():
+            for export_type, writer, common_params in writers:
+                try:
+                    writer.write(_filter_dataframe(chunk, **common_params))
+                except Exception as e:
+                    _wrap_and_raise('WRITE', export_type, None, e)
+
+            if collected or not writes:
+                results.append(chunk)
+    finally:
+        for _, writer, _ in writers:
+            writer.close()
+
+    if not results:
+        return None
+
+    df = _pandas.concat(results, ignore_index=True)
+    if collected:
+        df = _write_data(df, collected, functions, variables)
+    return df
+
+
 def _run_thread(
     recipe: str,
     variables: dict = None,
     dataframe: _pandas.DataFrame = None,
-    functions: _Union[_types.FunctionType, list, dict, str] = None
+    functions: _Union[_types.FunctionType, list, dict, str] = None,
+    resume: bool = False
 ) -> _pandas.DataFrame:
     """
     Execute a Wrangles Recipe. Recipes are written in YAML and allow 
@@ -1141,6 +2409,7 @@ def _run_thread(
     :param functions: (Optional) A function, list of functions or file path \
         that can be called as part of the recipe. Functions can be referenced \
         as custom.function_name
+    :param resume: (Optional) Resume from the latest checkpoint. See wrangles.checkpoint
 
     :return: The result dataframe. The dataframe can be defined using \
         write: - dataframe in the recipe.
@@ -1154,38 +2423,69 @@ def _run_thread(
     if 'on_start' in recipe.get('run', {}).keys():
         _run_actions(recipe['run']['on_start'], functions, variables)
 
-    # Get requested data
-    if 'read' in recipe.keys():
-        # Execute requested data imports
-        df = _read_data(recipe['read'], functions, variables, dataframe)
+    checkpoints = _checkpoint.from_setting(recipe.get('checkpoint'), resume)
+    if checkpoints is not None and recipe.get('incremental'):
+        raise ValueError('checkpoint is not supported with incremental')
+
+    if recipe.get('streaming'):
+        if checkpoints is not None:
+            raise ValueError('checkpoint is not supported with streaming')
+        if recipe.get('incremental'):
+            raise ValueError('incremental is not supported with streaming')
+        # Read, wrangle and write the data one chunk at a time
+        df = _run_streaming(recipe, functions, variables, dataframe)
+    else:
+        # Get requested data
+        if 'read' in recipe.keys():
+            # Execute requested data imports
+            df = _read_data(
+                recipe['read'],
+                functions,
+                variables,
+                dataframe,
+                _needed_columns(recipe),
+                _row_filters(recipe)
+            )
 
-        # If no data is returned, initialize an empty dataframe
-        if df is None:
-            df = _pandas.DataFrame()
+            # If no data is returned, initialize an empty dataframe
+            if df is None:
+                df = _pandas.DataFrame()
 
-        # If multiple dataframes are returned, union them
-        if isinstance(df, list) and all([isinstance(x, _pandas.DataFrame) for x in df]):
-            df = _pandas.concat(df, ignore_index=True)
+            # If multiple dataframes are returned, union them
+            if isinstance(df, list) and all([isinstance(x, _pandas.DataFrame) for x in df]):
+                df = _pandas.concat(df, ignore_index=True)
 
-        if not isinstance(df, _pandas.DataFrame):
-            raise RuntimeError("Read did not return a valid dataframe")
+            if not isinstance(df, _pandas.DataFrame):
+                raise RuntimeError("Read did not return a valid dataframe")
 
-    elif dataframe is not None:
-        # User has passed in a pre-created dataframe
-        df = dataframe
-    else:
-        # User hasn't provided anything - initialize empty dataframe
-        df = _pandas.DataFrame()
+        elif dataframe is not None:
+            # User has passed in a pre-created dataframe
+            df = dataframe
+        else:
+            # User hasn't provided anything - initialize empty dataframe
+            df = _pandas.DataFrame()
+
+        # Execute any Wrangles required (allow single or plural)
+        if 'wrangles' in recipe.keys() or 'wrangle' in recipe.keys():
+            wrangles_list = recipe.get('wrangles', recipe.get('wrangle'))
+            if recipe.get('incremental'):
+                df = _run_incremental(recipe, df, wrangles_list, functions, variables)
+            elif checkpoints is not None:
+                # Make the checkpoints available to batch
+                with checkpoints:
+                    df = _run_wrangles_checkpointed(
+                        recipe, df, wrangles_list, functions, variables, checkpoints
+                    )
+            else:
+                df = _run_wrangles(recipe, df, wrangles_list, functions, variables)
 
-    # Execute any Wrangles required (allow single or plural)
-    if 'wrangles' in recipe.keys():
-        df = _execute_wrangles(df, recipe['wrangles'], functions, variables)
-    elif 'wrangle' in recipe.keys():
-        df = _execute_wrangles(df, recipe['wrangle'], functions, variables)
+        # NaN cleanup has been deferred until the wrangles are complete
+        if _config.nan_cleanup == 'write' and any(k in recipe for k in ('wrangles', 'wrangle')):
+            df = _clean_nan(df)
 
-    # Execute requested data exports
-    if 'write' in recipe.keys():
-        df = _write_data(df, recipe['write'], functions, variables)
+        # Execute requested data exports
+        if 'write' in recipe.keys():
+            df = _write_data(df, recipe['write'], functions, variables)
 
     # Run any actions required after the main recipe finishes
     if 'on_success' in recipe.get('run', {}).keys():
@@ -1194,12 +2494,132 @@ def _run_thread(
     return df
 
 
+def _execute_recipe(
+    recipe: dict,
+    variables: dict,
+    dataframe: _pandas.DataFrame,
+    functions: dict,
+    timeout: float = None,
+    profile: _Union[bool, str, _profiling.Profiler] = None,
+    resume: bool = False
+) -> _pandas.DataFrame:
+    """
+    Execute an already loaded recipe, enforcing any timeout and
+    triggering on_failure actions if the recipe fails
+
+    :param recipe: Recipe object with any variables already substituted
+    :param variables: Dictionary of variables available to the recipe
+    :param dataframe: (Optional) Dataframe passed in by the user
+    :param functions: Dictionary of named custom functions
+    :param timeout: (Optional) Timeout for the recipe in seconds
+    :param profile: (Optional) Profile the run. See wrangles.profiling
+    :param resume: (Optional) Resume from the latest checkpoint. See wrangles.checkpoint
+    :return: The result dataframe
+    """
+    profiler = _profiling.from_setting(profile)
+    if profiler is not None:
+        with profiler:
+            try:
+                return _execute_recipe(recipe, variables, dataframe, functions, timeout, resume=resume)
+            finally:
+                _profiling.output(profiler, profile)
+
+    span = _profiling.start('recipe', 'recipe', dataframe)
+    try:
+        df = _execute_recipe_thread(recipe, variables, dataframe, functions, timeout, resume)
+    except Exception as e:
+        _profiling.finish(span, error=e)
+        raise
+    _profiling.finish(span, df)
+    return df
+
+
+def _execute_recipe_thread(
+    recipe: dict,
+    variables: dict,
+    dataframe: _pandas.DataFrame,
+    functions: dict,
+    timeout: float = None,
+    resume: bool = False
+) -> _pandas.DataFrame:
+    """
+    Run the recipe with a cancellation token. If there is a
+    timeout, the recipe runs using the shared threads so that the
+    timeout can be enforced, and is cancelled if it is exceeded.
+
+    :param recipe: Recipe object with any variables already substituted
+    :param variables: Dictionary of variables available to the recipe
+    :param dataframe: (Optional) Dataframe passed in by the user
+    :param functions: Dictionary of named custom functions
+    :param timeout: (Optional) Timeout for the recipe in seconds
+    :param resume: (Optional) Resume from the latest checkpoint
+    :return: The result dataframe
+    """
+    with _scheduler.cancellable(timeout) as token:
+        try:
+            if timeout is None:
+                # Run in a copy of the context as if it were in another thread
+                return _contextvars.copy_context().run(
+                    _run_thread, recipe, variables, dataframe, functions, resume
+                )
+
+            future = _scheduler.submit(
+                _run_thread,
+                recipe,
+                variables,
+                dataframe,
+                functions,
+                resume
+            )
+            try:
+                return future.result(timeout)
+            except _futures.TimeoutError:
+                if future.done():
+                    # Raised by the recipe itself
+                    raise
+
+            # Stop any remaining work at the next step
+            error = TimeoutError(f"Recipe timed out. Limit: {timeout}s")
+            token.cancel(error)
+            future.cancel()
+
+        except Exception as e:
+            try:
+                # Run any actions requested if the recipe fails
+                if 'on_failure' in recipe.get('run', {}).keys():
+                    _run_actions(recipe['run']['on_failure'], functions, variables, e)
+            except:
+                pass
+            raise
+
+        try:
+            # Run any actions requested if the recipe fails
+            if 'on_failure' in recipe.get('run', {}).keys():
+                _run_actions(recipe['run']['on_failure'], functions, variables, error)
+        except:
+            pass
+        raise error
+
+
+def _new_run_context() -> dict:
+    """
+    Create the context for a new recipe run, nested within any current run
+    """
+    parent_context = _RECIPE_RUN_CONTEXT.get()
+    return {
+        'depth': (parent_context.get('depth', 0) if parent_context else 0) + 1,
+        'recipe_string': parent_context.get('recipe_string') if parent_context else None
+    }
+
+
 def run(
     recipe: str,
     variables: dict = None,
     dataframe: _pandas.DataFrame = None,
     functions: _Union[_types.FunctionType, list, dict] = [],
-    timeout: float = None
+    timeout: float = None,
+    profile: _Union[bool, str, _profiling.Profiler] = None,
+    resume: bool = False
 ) -> _pandas.DataFrame:
     """
     Execute a Wrangles Recipe. Recipes are written in YAML and allow 
@@ -1213,6 +2633,8 @@ def run(
     :param dataframe: (Optional) Pass in a pandas dataframe, instead of defining a read section within the YAML
     :param functions: (Optional) A function or list of functions that can be called as part of the recipe. Functions can be referenced as custom.function_name
     :param timeout: (Optional) Set a timeout for the recipe in seconds. If not provided, the time is unlimited.
+    :param profile: (Optional) Record the time, rows, columns and memory of each step. True to log a summary, a file path to also write a JSON report, or a wrangles.profiling.Profiler to collect the report. Can also be enabled with the WRANGLES_PROFILE environment variable.
+    :param resume: (Optional) If the recipe has a checkpoint section, load the data saved by a previous run and only run the wrangles after the latest checkpoint.
 
     :return: The result dataframe. The dataframe can be defined using \
         write: - dataframe in the recipe.
@@ -1220,12 +2642,7 @@ def run(
     if variables is None:
         variables = {}
 
-    parent_context = _RECIPE_RUN_CONTEXT.get()
-    run_context = {
-        'depth': (parent_context.get('depth', 0) if parent_context else 0) + 1,
-        'recipe_string': parent_context.get('recipe_string') if parent_context else None
-    }
-    context_token = _RECIPE_RUN_CONTEXT.set(run_context)
+    context_token = _RECIPE_RUN_CONTEXT.set(_new_run_context())
     try:
         # Parse recipe
         recipe, functions = _load_recipe(
@@ -1234,36 +2651,363 @@ def run(
             functions or {}
         )
 
-        with _futures.ThreadPoolExecutor(max_workers=1) as executor:
-            try:
-                worker_context = _contextvars.copy_context()
-                future = executor.submit(
-                    worker_context.run,
-                    _run_thread,
-                    recipe,
-                    variables,
-                    dataframe,
-                    functions
-                )
-                return future.result(timeout)
-
-            except _futures.TimeoutError as e:
-                try:
-                    executor._threads.clear()
-                    # Run any actions requested if the recipe fails
-                    if 'on_failure' in recipe.get('run', {}).keys():
-                        _run_actions(recipe['run']['on_failure'], functions, variables, e)
-                except:
-                    pass
-                raise TimeoutError(f"Recipe timed out. Limit: {timeout}s")
-
-            except Exception as e:
-                try:
-                    # Run any actions requested if the recipe fails
-                    if 'on_failure' in recipe.get('run', {}).keys():
-                        _run_actions(recipe['run']['on_failure'], functions, variables, e)
-                except:
-                    pass
-                raise
+        return _execute_recipe(recipe, variables, dataframe, functions, timeout, profile, resume)
     finally:
         _RECIPE_RUN_CONTEXT.reset(context_token)
+
+
+class CompiledRecipe:
+    """
+    A recipe that has been read, parsed and had its custom
+    functions resolved ahead of time, so that it can be run
+    repeatedly with minimal load overhead.
+
+    Create using wrangles.recipe.compile
+
+    >>> plan = wrangles.recipe.compile('recipe.wrgl.yml')
+    >>> df = plan.run(dataframe=df, variables={'supplier': 'ABC'})
+    """
+    # Number of distinct variable combinations to keep
+    # substituted recipes for before discarding the oldest
+    cache_size = 16
+
+    def __init__(
+        self,
+        recipe: str,
+        functions: _Union[_types.FunctionType, list, dict, str] = []
+    ):
+        """
+        :param recipe: YAML recipe, path to a YAML file or model ID containing the recipe
+        :param functions: (Optional) A function, list of functions or file path \
+            that can be called as part of the recipe.
+        """
+        (
+            self._recipe_string,
+            recipe_object,
+            self.functions,
+            self._is_external_source
+        ) = _read_recipe_source(recipe, functions or {})
+
+        # Keep a copy in case the caller changes the recipe they passed in
+        self._recipe_object = _copy.deepcopy(recipe_object) if self._recipe_string is None else recipe_object
+        self.references = _find_templated_variables(self._recipe_object)
+        self._environment_references = _environment_references(self._recipe_object)
+        self._cache = _collections.OrderedDict()
+        self._lock = _threading.Lock()
+
+    def _substitute(self, variables: dict) -> dict:
+        """
+        Get the recipe with variables substituted, reusing
+        a previous substitution if none of the variables
+        referenced by the recipe have changed
+
+        :param variables: Fully resolved variables for this run
+        :return: Recipe object, safe for the caller to mutate
+        """
+        key = _variables_cache_key(self.references, variables)
+
+        if key is not None:
+            with self._lock:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    return _copy.deepcopy(self._cache[key])
+
+        recipe_object = _replace_templated_values(self._recipe_object, variables)
+
+        if key is not None:
+            with self._lock:
+                self._cache[key] = recipe_object
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+            recipe_object = _copy.deepcopy(recipe_object)
+
+        return recipe_object
+
+    def run(
+        self,
+        dataframe: _pandas.DataFrame = None,
+        variables: dict = None,
+        timeout: float = None,
+        profile: _Union[bool, str, _profiling.Profiler] = None,
+        resume: bool = False
+    ) -> _pandas.DataFrame:
+        """
+        Execute the compiled recipe
+
+        :param dataframe: (Optional) Pass in a pandas dataframe, instead of defining a read section within the YAML
+        :param variables: (Optional) A dictionary of custom variables to override placeholders in the recipe.
+        :param timeout: (Optional) Set a timeout for the recipe in seconds. If not provided, the time is unlimited.
+        :param profile: (Optional) Profile the run. See wrangles.recipe.run
+        :param resume: (Optional) Resume from the latest checkpoint. See wrangles.recipe.run
+        :return: The result dataframe. The dataframe can be defined using \
+            write: - dataframe in the recipe.
+        """
+        variables = dict(variables or {})
+
+        context_token = _RECIPE_RUN_CONTEXT.set(_new_run_context())
+        try:
+            _resolve_variables(variables, self.functions, self._environment_references)
+            _add_recipe_variables(variables)
+            _track_recipe_string(
+                self._recipe_string if self._recipe_string is not None else self._recipe_object,
+                self._is_external_source
+            )
+
+            recipe_object = self._substitute(variables)
+
+            return _execute_recipe(
+                recipe_object,
+                variables,
+                dataframe,
+                self.functions,
+                timeout,
+                profile,
+                resume
+            )
+        finally:
+            _RECIPE_RUN_CONTEXT.reset(context_token)
+
+
+def compile(
+    recipe: str,
+    functions: _Union[_types.FunctionType, list, dict, str] = []
+) -> CompiledRecipe:
+    """
+    Read and parse a recipe once so it can be run repeatedly
+    without reloading it each time. Variables are substituted
+    when the recipe is run, and substitutions are reused for
+    repeated runs with the same values.
+
+    Recipes from a model ID are fetched once at compile time.
+    Compile again to pick up a newer version.
+
+    >>> plan = wrangles.recipe.compile('recipe.wrgl.yml')
+    >>> df = plan.run(dataframe=df, variables={'supplier': 'ABC'})
+
+    :param recipe: YAML recipe, path to a YAML file or model ID containing the recipe
+    :param functions: (Optional) A function, list of functions or file path \
+        that can be called as part of the recipe. Functions can be referenced \
+        as custom.function_name
+    :return: A CompiledRecipe that can be executed with .run()
+    """
+    return CompiledRecipe(recipe, functions)
+
+
+# Compiled recipes and custom functions for jobs run by run_many.
+# Set once per process so that each process stays warm between jobs.
+_RUN_MANY_STATE = None
+
+
+def _run_many_init(functions) -> None:
+    global _RUN_MANY_STATE
+    _RUN_MANY_STATE = {'functions': functions, 'compiled': {}}
+
+
+def _run_many_job(job: dict, state: dict = None) -> dict:
+    """
+    Run a single job for run_many
+
+    :param job: Normalized job from the manifest
+    :param state: (Optional) Compiled recipes and functions. Default the state of this process.
+    :return: Dictionary with the rows, seconds and any error.
+    """
+    state = state or _RUN_MANY_STATE
+    start = _time.perf_counter()
+    try:
+        key = job['recipe'] if isinstance(job['recipe'], str) else _json.dumps(job['recipe'], sort_keys=True, default=str)
+        if key not in state['compiled']:
+            state['compiled'][key] = compile(job['recipe'], state['functions'])
+        df = state['compiled'][key].run(
+            variables=job['variables'],
+            timeout=job['timeout']
+        )
+        return {
+            'rows': len(df) if isinstance(df, _pandas.DataFrame) else None,
+            'seconds': _time.perf_counter() - start,
+            'error': None
+        }
+    except Exception as e:
+        # Return rather than raise so errors that can't be pickled still reach the caller
+        return {
+            'rows': None,
+            'seconds': _time.perf_counter() - start,
+            'error': f"{type(e).__name__}: {e}"
+        }
+
+
+def _run_many_jobs(manifest: _Union[str, list, dict]) -> list:
+    """
+    Normalize a manifest into a list of jobs
+
+    :param manifest: Path to a YAML or JSON file, list of jobs, or dict of defaults and jobs
+    :return: List of dicts with name, recipe, variables and timeout
+    """
+    if isinstance(manifest, str):
+        with open(manifest, 'r', encoding='utf-8') as f:
+            manifest = _yaml.safe_load(f)
+
+    if isinstance(manifest, list):
+        manifest = {'jobs': manifest}
+    if not isinstance(manifest, dict) or not isinstance(manifest.get('jobs'), list):
+        raise ValueError("The manifest must be a list of jobs or a dictionary with a list of jobs")
+
+    jobs = []
+    for i, job in enumerate(manifest['jobs']):
+        if not isinstance(job, dict):
+            raise ValueError(f"Job #{i + 1} in the manifest must be a dictionary")
+        recipe = job.get('recipe', manifest.get('recipe'))
+        if not recipe:
+            raise ValueError(f"Job #{i + 1} in the manifest does not have a recipe")
+        jobs.append({
+            'name': str(job.get('name', f"Job #{i + 1}")),
+            'recipe': recipe,
+            'variables': {**(manifest.get('variables') or {}), **(job.get('variables') or {})},
+            'timeout': job.get('timeout', manifest.get('timeout'))
+        })
+    return jobs
+
+
+def run_many(
+    manifest: _Union[str, list, dict],
+    processes: int = None,
+    functions: _Union[_types.FunctionType, list, dict, str] = [],
+    retries: int = 0,
+    report: str = None,
+    on_result: _typing.Callable[[dict], None] = None
+) -> _pandas.DataFrame:
+    """
+    Run many recipes, or the same recipe with many sets of variables,
+    using a pool of processes so that CPU heavy recipes use every core.
+    Each process compiles a recipe once and reuses it for later jobs.
+
+    >>> wrangles.recipe.run_many({
+    >>>     'recipe': 'recipe.wrgl.yml',
+    >>>     'jobs': [
+    >>>         {'name': 'supplier_a', 'variables': {'supplier': 'A'}},
+    >>>         {'name': 'supplier_b', 'variables': {'supplier': 'B'}}
+    >>>     ]
+    >>> }, processes=4, retries=1, report='report.csv')
+
+    :param manifest: Jobs to run. A path to a YAML or JSON file, a list of jobs \
+        or a dictionary with a list of jobs and defaults for recipe, variables and timeout. \
+        Each job may have a name, recipe, variables and timeout.
+    :param processes: (Optional) Number of processes. Default the number of CPUs. \
+        Use 1 to run the jobs one after another in this process.
+    :param functions: (Optional) A file path, or functions that can be pickled, \
+        available to every recipe as custom.function_name
+    :param retries: (Optional) Number of times to retry a job that fails
+    :param report: (Optional) File path to write the summary to, as .csv or .json
+    :param on_result: (Optional) Called with the result of each job as it finishes
+    :return: Summary dataframe with the name, status, attempts, seconds, rows and error of each job
+    """
+    jobs = _run_many_jobs(manifest)
+    processes = processes or _os.cpu_count() or 1
+    results = [None] * len(jobs)
+
+    def finished(index: int, attempts: int, outcome: dict) -> bool:
+        """
+        Record the outcome of an attempt.
+        Returns True if the job should be retried.
+        """
+        if outcome['error'] and attempts <= retries:
+            _logging.warning(f": Run many :: {jobs[index]['name']} :: Retrying after error :: {outcome['error']}")
+            return True
+        result = {
+            'name': jobs[index]['name'],
+            'status': 'failed' if outcome['error'] else 'succeeded',
+            'attempts': attempts,
+            **outcome
+        }
+        results[index] = result
+        _logging.info(
+            f": Run many :: {result['name']} :: {result['status']} :: "
+            f"{result['seconds'] or 0:.2f}s :: {sum(r is not None for r in results)} of {len(jobs)} done"
+        )
+        if on_result:
+            on_result(result)
+        return False
+
+    if processes == 1 or len(jobs) <= 1:
+        state = {'functions': functions, 'compiled': {}}
+        for index, job in enumerate(jobs):
+            attempts = 1
+            while finished(index, attempts, _run_many_job(job, state)):
+                attempts += 1
+    else:
+        def new_executor(workers: int = None):
+            return _futures.ProcessPoolExecutor(
+                max_workers=workers or min(processes, len(jobs)),
+                initializer=_run_many_init,
+                initargs=(functions,)
+            )
+
+        executor = new_executor()
+        pending = {}
+        # Jobs waiting to run in the pool, and jobs that were running
+        # when a process exited, waiting to run on their own
+        waiting = _collections.deque((index, 1) for index in range(len(jobs)))
+        suspects = _collections.deque()
+
+        def submit(index: int, attempts: int, alone: bool = False):
+            # A job run alone has a process of its own, so that
+            # if the process exits no other jobs are affected
+            target = new_executor(1) if alone else executor
+            pending[target.submit(_run_many_job, jobs[index])] = (index, attempts, target, alone)
+
+        def fill():
+            # Keep at most one job in flight for each process.
+            # Suspects are run alone one at a time.
+            if (
+                suspects
+                and len(pending) < processes
+                and not any(alone for _, _, _, alone in pending.values())
+            ):
+                submit(*suspects.popleft(), alone=True)
+            while waiting and len(pending) < processes:
+                submit(*waiting.popleft())
+
+        try:
+            fill()
+            while pending:
+                done, _ = _futures.wait(pending, return_when=_futures.FIRST_COMPLETED)
+                for future in done:
+                    index, attempts, submitted_to, alone = pending.pop(future)
+                    if alone:
+                        submitted_to.shutdown(wait=False)
+                    try:
+                        outcome = future.result()
+                    except _futures.process.BrokenProcessPool as e:
+                        if not alone:
+                            # A process exited unexpectedly, which fails every job
+                            # in the pool. Replace the pool once, and run the job
+                            # again on its own to find out if it was the cause.
+                            if submitted_to is executor:
+                                executor.shutdown(wait=False, cancel_futures=True)
+                                executor = new_executor()
+                            suspects.append((index, attempts))
+                            continue
+                        outcome = {'rows': None, 'seconds': None, 'error': f"{type(e).__name__}: {e}"}
+
+                    if finished(index, attempts, outcome):
+                        (suspects if alone else waiting).append((index, attempts + 1))
+                fill()
+        finally:
+            for _, _, submitted_to, alone in pending.values():
+                if alone:
+                    submitted_to.shutdown(wait=True, cancel_futures=True)
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    summary = _pandas.DataFrame(
+        results,
+        columns=['name', 'status', 'attempts', 'seconds', 'rows', 'error']
+    )
+
+    if report:
+        if report.lower().endswith('.json'):
+            summary.to_json(report, orient='records', indent=2)
+        else:
+            summary.to_csv(report, index=False)
+
+    failed = int((summary['status'] == 'failed').sum())
+    _logging.info(f": Run many :: {len(jobs) - failed} of {len(jobs)} jobs succeeded")
+    return summary
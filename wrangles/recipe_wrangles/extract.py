@@ -245,6 +245,9 @@ def address(
       char:
         type: string
         description: Character to use when output_format is concatenate
+      concurrency:
+        type: integer
+        description: Number of batches to send to the API at once. Defaults to WRANGLES_BATCH_CONCURRENCY or 4.
     """
     # If output is not specified, overwrite input columns in place
     if output is None: output = input
@@ -692,6 +695,9 @@ def attributes(
       char:
         type: string
         description: Character to use when output_format is concatenate
+      concurrency:
+        type: integer
+        description: Number of batches to send to the API at once. Defaults to WRANGLES_BATCH_CONCURRENCY or 4.
     $ref: "#/$defs/misc/unit_entity_map"
     """
     # If output is not specified, overwrite input columns in place
@@ -965,6 +971,9 @@ def codes(
       extract_raw:
         type: boolean
         description: Whether to return tokens with their adjacent non-whitespace characters. Default False.
+      concurrency:
+        type: integer
+        description: Number of batches to send to the API at once. Defaults to WRANGLES_BATCH_CONCURRENCY or 4.
     """
     # If output is not specified, overwrite input columns in place
     if output is None: output = input
@@ -1087,6 +1096,9 @@ def custom(
       include_empty_labels:
         type: boolean
         description: Include labels with no found values in the output when using use_labels=True
+      concurrency:
+        type: integer
+        description: Number of batches to send to the API at once. Defaults to WRANGLES_BATCH_CONCURRENCY or 4.
     """
     if output is None: output = input
 
@@ -1409,6 +1421,9 @@ def html(
       char:
         type: string
         description: Character to use when output_format is concatenate
+      concurrency:
+        type: integer
+        description: Number of batches to send to the API at once. Defaults to WRANGLES_BATCH_CONCURRENCY or 4.
     """
     # If output is not specified, overwrite input columns in place
     if output is None: output = input
@@ -1503,6 +1518,9 @@ def properties(
       char:
         type: string
         description: Character to use when output_format is concatenate
+      concurrency:
+        type: integer
+        description: Number of batches to send to the API at once. Defaults to WRANGLES_BATCH_CONCURRENCY or 4.
     """
     # If output is not specified, overwrite input columns in place
     if output is None: output = input
@@ -11,14 +11,12 @@ import time as _time
 import sqlite3 as _sqlite3
 import re as _re
 import numexpr as _ne
-import requests as _requests
 import pandas as _pd
 import wrangles as _wrangles
 import json as _json
 import numpy as _np
 import math as _math
 import concurrent.futures as _futures
-import contextvars as _contextvars
 from ..openai import _divide_batches
 from ..classify import classify as _classify
 from ..standardize import standardize as _standardize
@@ -27,12 +25,20 @@ from ..data import model as _model
 from ..lookup import lookup as _lookup
 from .. import extract as _extract
 from .. import recipe as _recipe
+from .. import where as _where
 from .convert import to_json as _to_json
 from .convert import from_json as _from_json
 from ..connectors.matrix import _define_permutations
 from ..utils import statement_modifier as _statement_modifier
 from ..utils import delayed_variable_interpretation as _delayed_variable_interpretation
 from ..utils import replace_templated_values as _replace_templated_values
+from ..utils import LazyLoader as _LazyLoader
+from ..utils import http_request as _http_request
+from ..utils import variables_cache_key as _variables_cache_key
+from .. import config as _config
+
+
+_duckdb = _LazyLoader('duckdb')
 
 
 def accordion(
@@ -192,14 +198,39 @@ def _batch_thread(
     """
     if variables is None:
         variables = {}
+
+    # Save each batch so that only those that didn't
+    # complete need to be run again when resuming
+    checkpoints = _wrangles.checkpoint.active()
+    key = None
+    if checkpoints is not None and checkpoints.selected({'batch': {'wrangles': wrangles}}):
+        # Results depend on the values of any variables the wrangles use
+        variables_key = _variables_cache_key(
+            _recipe._environment_references(wrangles),
+            variables
+        )
+        if variables_key is not None:
+            key = checkpoints.key(
+                _wrangles.checkpoint.fingerprint(df),
+                'batch',
+                [wrangles, variables_key]
+            )
+    if key is not None and checkpoints.resume:
+        saved = checkpoints.load(key)
+        if saved is not None:
+            return saved
+
     try:
-        return _wrangles.recipe.run(
+        result = _wrangles.recipe.run(
             {"wrangles": wrangles},
             dataframe=df,
             functions=functions,
             variables=variables,
             timeout=timeout
         )
+        if key is not None:
+            checkpoints.save(key, result)
+        return result
     except Exception as err:
         if on_error:
             _logging.error(f": Suppressed error in batch #{batch_num}: {str(err)}")
@@ -276,25 +307,20 @@ def batch(
     if threads < 1:
         raise ValueError('threads must be an integer greater than 0')
   
+    # Pandas row slices may be views. Give each worker an independent
+    # dataframe so nested wrangles can safely add or transform columns.
+    batches = [
+        batch.copy()
+        for batch in _divide_batches(df, batch_size)
+    ]
+
     if use_multiprocessing:
         # Not publicly documented. Use at your own risk.
-        pool_executor = _futures.ProcessPoolExecutor
-    else:
-        pool_executor = _futures.ThreadPoolExecutor
-
-    with pool_executor(max_workers=threads) as executor:
-        # Pandas row slices may be views. Give each worker an independent
-        # dataframe so nested wrangles can safely add or transform columns.
-        batches = [
-            batch.copy()
-            for batch in _divide_batches(df, batch_size)
-        ]
-
-        if use_multiprocessing:
+        with _futures.ProcessPoolExecutor(max_workers=threads) as executor:
             # Set a chunk size for process pool executor
             # to reduce overhead of process creation.
             chunksize = min(max(len(batches) // threads, 1), 20)
-            results = executor.map(
+            results = list(executor.map(
                 _batch_thread,
                 batches,
                 range(1, len(batches) + 1),
@@ -304,23 +330,19 @@ def batch(
                 [timeout] * len(batches),
                 [on_error] * len(batches),
                 chunksize=chunksize
-            )
-        else:
-            futures = [
-                executor.submit(
-                    _contextvars.copy_context().run,
-                    _batch_thread,
-                    batch_df,
-                    batch_num,
-                    wrangles,
-                    functions,
-                    variables,
-                    timeout,
-                    on_error
-                )
-                for batch_num, batch_df in enumerate(batches, 1)
-            ]
-            results = [future.result() for future in futures]
+            ))
+    else:
+        results = _wrangles.scheduler.map(
+            _batch_thread,
+            batches,
+            range(1, len(batches) + 1),
+            [wrangles] * len(batches),
+            [functions] * len(batches),
+            [variables] * len(batches),
+            [timeout] * len(batches),
+            [on_error] * len(batches),
+            max_workers=threads
+        )
 
     return _pd.concat(results)
 
@@ -359,6 +381,9 @@ def classify(
       include_confidence:
         type: boolean
         description: For models that support it, include the confidence level in the output
+      concurrency:
+        type: integer
+        description: Number of batches to send to the API at once. Defaults to WRANGLES_BATCH_CONCURRENCY or 4.
     """
     # If output is not specified, overwrite input columns in place
     if output is None: output = input
@@ -475,47 +500,40 @@ def concurrent(
     """
     if variables is None:
         variables = {}
+    for wrangle_definition in wrangles:
+        if (
+            not isinstance(wrangle_definition, dict) or
+            "output" not in list(wrangle_definition.values())[0]
+        ):
+            raise ValueError('Using concurrent requires that each wrangle specify output column(s).')
+    outputs = [list(wrangle_definition.values())[0]["output"] for wrangle_definition in wrangles]
+
     if use_multiprocessing:
         # Not publicly documented. Use at your own risk.
-        pool_executor = _futures.ProcessPoolExecutor
-    else:
-        pool_executor = _futures.ThreadPoolExecutor
-
-    with pool_executor(max_workers=max_concurrency) as executor:
-        futures = []
-        futures_output_map = {}
-        for wrangle_definition in wrangles:
-            if (
-                not isinstance(wrangle_definition, dict) or
-                "output" not in list(wrangle_definition.values())[0]
-            ):
-                raise ValueError('Using concurrent requires that each wrangle specify output column(s).')
-
-            if use_multiprocessing:
-                future = executor.submit(
+        with _futures.ProcessPoolExecutor(max_workers=max_concurrency) as executor:
+            futures = [
+                executor.submit(
                     _wrangles.recipe.run,
                     recipe={'wrangles': [wrangle_definition]},
                     dataframe=df.copy(),
                     variables=variables,
                     functions=functions
                 )
-            else:
-                future = executor.submit(
-                    _contextvars.copy_context().run,
-                    _wrangles.recipe.run,
-                    {'wrangles': [wrangle_definition]},
-                    variables,
-                    df.copy(),
-                    functions
-                )
-            futures.append(future)
+                for wrangle_definition in wrangles
+            ]
+            results = [future.result() for future in futures]
+    else:
+        results = _wrangles.scheduler.map(
+            _wrangles.recipe.run,
+            [{'wrangles': [wrangle_definition]} for wrangle_definition in wrangles],
+            [variables] * len(wrangles),
+            [df.copy() for _ in wrangles],
+            [functions] * len(wrangles),
+            max_workers=max_concurrency
+        )
 
-            # Add output columns to reference on completion
-            futures_output_map[future] = list(wrangle_definition.values())[0]["output"]
-        
-        # Wait for all futures to complete
-        for future in _futures.as_completed(futures):
-            df[futures_output_map[future]] = future.result()[futures_output_map[future]]
+    for output, result in zip(outputs, results):
+        df[output] = result[output]
 
     return df
 
@@ -698,76 +716,97 @@ def filter(
         type: string
         description: Select rows where the input does not contain the value. Allows regular expressions.
     """
+    # Conditions are combined into a single mask
+    # so that the dataframe is only sliced once
+    mask = None
+
     if where != None:
-        # Filter the dataframe based on the where clause
-        # and use the index to filter the dataframe
-        # to prevent any side effects from passing through the DB
-        df = df.loc[
-            sql(
-                df,
-                f"""
-                SELECT *
-                FROM df
-                WHERE {where};
-                """,
-                where_params,
-                preserve_index=True,
-                preserve_data_types=False
-            ).index.to_list()
-        ]
+        if df.index.is_unique:
+            mask = _where.mask(df, where, where_params)
+
+        if mask is None:
+            # Filter the dataframe based on the where clause
+            # and use the index to filter the dataframe
+            # to prevent any side effects from passing through the DB
+            df = df.loc[
+                sql(
+                    df,
+                    f"""
+                    SELECT *
+                    FROM df
+                    WHERE {where};
+                    """,
+                    where_params,
+                    preserve_index=True,
+                    preserve_data_types=False,
+                    engine='sqlite'
+                ).index.to_list()
+            ]
 
     # If a string provided, convert to list
     if not isinstance(input, list): input = [input]
 
     # Return early on empty df
-    if df.empty: return df
+    if df.empty or (mask is not None and not mask.any()):
+        return df if mask is None else df.loc[mask]
+
+    if mask is None:
+        mask = _np.ones(len(df), dtype=bool)
+
+    def _apply(column, condition):
+        """
+        Narrow the mask using a condition. The condition is only evaluated
+        against rows that are still selected by the previous conditions.
+        """
+        positions = _np.flatnonzero(mask)
+        mask[positions] = _np.asarray(condition(df[column].iloc[positions]), dtype=bool)
 
     for input_column in input: 
         if equal != None:
             if not isinstance(equal, list): equal = [equal]
-            df = df.loc[df[input_column].isin(equal)]
+            _apply(input_column, lambda x: x.isin(equal))
 
         if not_equal != None:
             if not isinstance(not_equal, list): not_equal = [not_equal]
-            df = df.loc[~df[input_column].isin(not_equal)]
+            _apply(input_column, lambda x: ~x.isin(not_equal))
         
         if is_in != None:
             if not isinstance(is_in, list): is_in = [is_in]
-            df = df[df[input_column].isin(is_in)]
+            _apply(input_column, lambda x: x.isin(is_in))
         
         if not_in != None:
             if not isinstance(not_in, list): not_in = [not_in]
-            df = df[~df[input_column].isin(not_in)]
+            _apply(input_column, lambda x: ~x.isin(not_in))
         
         if greater_than != None:
-            df = df[df[input_column] > greater_than]
+            _apply(input_column, lambda x: x > greater_than)
         
         if greater_than_equal_to != None:
-            df = df[df[input_column] >= greater_than_equal_to]
+            _apply(input_column, lambda x: x >= greater_than_equal_to)
         
         if less_than != None:
-            df = df[df[input_column] < less_than]
+            _apply(input_column, lambda x: x < less_than)
         
         if less_than_equal_to != None:
-            df = df[df[input_column] <= less_than_equal_to]
+            _apply(input_column, lambda x: x <= less_than_equal_to)
         
         if between != None:
             if len(between) != 2: raise ValueError('Can only use "between" with two values')
-            df = df[df[input_column].between(between[0], between[1], **kwargs)]
+            _apply(input_column, lambda x: x.between(between[0], between[1], **kwargs))
         
         if contains != None:
-            df = df[df[input_column].str.contains(contains, na=False, **kwargs)]
+            _apply(input_column, lambda x: x.str.contains(contains, na=False, **kwargs))
         
         if not_contains != None:
-            df = df[~df[input_column].str.contains(not_contains, na=False, **kwargs)]
+            _apply(input_column, lambda x: ~x.str.contains(not_contains, na=False, **kwargs))
         
         if is_null == True:
-            df = df[df[input_column].isnull()]
+            _apply(input_column, lambda x: x.isnull())
         
         if is_null == False:
-            df = df[df[input_column].notnull()]
+            _apply(input_column, lambda x: x.notnull())
 
-    df = df.reset_index(drop=True)
+    df = df.loc[mask].reset_index(drop=True)
 
     return df
 
@@ -821,7 +860,8 @@ def huggingface(
 
     for input_col, output_col in zip(input, output):
         df[output_col] = [
-            _requests.post(
+            _http_request(
+                'POST',
                 f"https://api-inference.huggingface.co/models/{model}",
                 headers={
                     "Authorization": f"Bearer {api_token}"
@@ -986,6 +1026,9 @@ def lookup(
           - by_row
           - by_matrix
           - by_dataframe
+      concurrency:
+        type: integer
+        description: Number of batches to send to the API at once. Defaults to WRANGLES_BATCH_CONCURRENCY or 4.
     """
     # Ensure input is only 1 value
     if isinstance(input, list):
@@ -1974,7 +2017,8 @@ def sql(
     command: str,
     params: _Union[list, dict] = None,
     preserve_index: bool = False,
-    preserve_data_types: bool = True
+    preserve_data_types: bool = True,
+    engine: str = None
 ) -> _pd.DataFrame:
     """
     type: object
@@ -1985,7 +2029,7 @@ def sql(
     properties:
       command:
         type: string
-        description: SQL Command. The table is called df. For specific SQL syntax, this uses the SQLite dialect.
+        description: SQL Command. The table is called df. For specific SQL syntax, this uses the dialect of the chosen engine.
       params:
         type: 
           - array
@@ -1993,11 +2037,30 @@ def sql(
         description: |-
           Variables to use in conjunctions with query.
           This allows the query to be parameterized.
-          This uses sqlite syntax (? or :name)
+          For sqlite use ? or :name, for duckdb use ? or $name
+      engine:
+        type: string
+        description: |-
+          The SQL engine used to run the query.
+          sqlite copies the data into a temporary database.
+          duckdb queries the dataframe directly without copying it,
+          which is significantly faster for large data.
+          Default sqlite.
+        enum:
+          - sqlite
+          - duckdb
     """
     if command.strip().split()[0].upper() != 'SELECT':
       raise ValueError('Only SELECT statements are supported for sql wrangles')
 
+    if engine is None:
+        engine = _config.sql_engine
+
+    if engine == 'duckdb':
+        return _sql_duckdb(df, command, params, preserve_index, preserve_data_types)
+    elif engine != 'sqlite':
+        raise ValueError(f"Unknown SQL engine '{engine}'. Expected sqlite or duckdb")
+
     # Create an in-memory db with the contents of the current dataframe
     db = _sqlite3.connect(':memory:')
     
@@ -2087,6 +2150,58 @@ def sql(
     return df_temp
 
 
+def _sql_duckdb(
+    df: _pd.DataFrame,
+    command: str,
+    params: _Union[list, dict] = None,
+    preserve_index: bool = False,
+    preserve_data_types: bool = True
+) -> _pd.DataFrame:
+    """
+    Run a SQL query against the dataframe using DuckDB.
+    The dataframe is registered directly rather than being copied into a database.
+    """
+    # Shallow copy - columns added or replaced here
+    # don't affect the original or copy its data
+    df_temp = df.copy(deep=False)
+
+    # Nested objects are queried as JSON, consistent with sqlite
+    cols_changed = [
+        column
+        for column in df_temp.columns
+        if df_temp[column].dtype == object
+        and any(isinstance(value, (dict, list)) for value in df_temp[column].iloc[:100])
+    ]
+    for column in cols_changed:
+        df_temp[column] = [
+            _json.dumps(value, ensure_ascii=False, default=str)
+            if isinstance(value, (dict, list))
+            else value
+            for value in df_temp[column]
+        ]
+
+    if preserve_index:
+        # DuckDB doesn't expose the pandas index, so pass
+        # the row positions through as a column instead
+        df_temp['wrwx_sql_temp_index'] = _np.arange(len(df_temp))
+
+    with _duckdb.connect(':memory:') as conn:
+        conn.register('df', df_temp)
+        result = conn.execute(command, params or ()).df()
+
+    if preserve_index and 'wrwx_sql_temp_index' in result.columns:
+        result.index = df.index[result.pop('wrwx_sql_temp_index').to_numpy()]
+
+    if preserve_data_types and cols_changed:
+        # Change the columns back to an object
+        _from_json(
+          df=result,
+          input=[col for col in result.columns if col in cols_changed]
+        )
+
+    return result
+
+
 def standardize(
     df: _pd.DataFrame,
     input: _Union[str, int, list],
@@ -2120,6 +2235,9 @@ def standardize(
       case_sensitive:
         type: boolean
         description: Allows the wrangle to be case sensitive if set to True, default is False.
+      concurrency:
+        type: integer
+        description: Number of batches to send to the API at once. Defaults to WRANGLES_BATCH_CONCURRENCY or 4.
     """
     # If user hasn't specified an output column, overwrite the input
     if output is None: output = input
@@ -2250,6 +2368,9 @@ def translate(
           - Slovenian
           - Spanish
           - Swedish
+      concurrency:
+        type: integer
+        description: Number of batches to send to the API at once. Defaults to WRANGLES_BATCH_CONCURRENCY or 4.
     """
     # If output is not specified, overwrite input columns in place
     if output is None: output = input
@@ -0,0 +1,241 @@
+"""
+Shared threads for running work concurrently, and cancellation of recipe runs
+
+Recipes that run work concurrently, such as batch, concurrent,
+matrix or parallel wrangles, share one pool of threads rather
+than each creating their own. The size of the pool is set by
+wrangles.config.max_threads. If every thread is busy, work runs
+in the thread that requested it, so nested runs can't deadlock
+waiting for each other.
+
+Each recipe run has a cancellation token. The token is cancelled
+when the recipe times out, and the engine checks it between steps
+so that the remaining work stops. Long running code, such as custom
+functions, can check it with wrangles.scheduler.check().
+"""
+import collections as _collections
+import concurrent.futures as _futures
+import contextlib as _contextlib
+import contextvars as _contextvars
+import threading as _threading
+import time as _time
+import typing as _typing
+
+from . import config as _config
+
+
+class CancelledError(Exception):
+    """
+    Raised when work stops because its recipe run was cancelled
+    """
+    pass
+
+
+class CancellationToken:
+    """
+    Signals that a recipe run, and any runs nested within it, should stop
+    """
+    def __init__(self, parent: 'CancellationToken' = None, timeout: float = None):
+        """
+        :param parent: (Optional) Token of the enclosing run. \
+            This token is also cancelled when the parent is.
+        :param timeout: (Optional) Seconds until the token is cancelled automatically
+        """
+        self.parent = parent
+        self.timeout = timeout
+        self.deadline = None if timeout is None else _time.monotonic() + timeout
+        self._error = None
+        self._event = _threading.Event()
+
+    def cancel(self, error: Exception = None) -> None:
+        """
+        Cancel the token
+
+        :param error: (Optional) Exception to raise when the token is checked
+        """
+        self._error = error or CancelledError('Recipe cancelled')
+        self._event.set()
+
+    def _reason(self) -> _typing.Optional[Exception]:
+        token = self
+        while token is not None:
+            if token._event.is_set():
+                return token._error
+            if token.deadline is not None and _time.monotonic() >= token.deadline:
+                return TimeoutError(f"Recipe timed out. Limit: {token.timeout}s")
+            token = token.parent
+        return None
+
+    @property
+    def cancelled(self) -> bool:
+        """
+        Whether this token or any of its parents has been cancelled or timed out
+        """
+        return self._reason() is not None
+
+    def check(self) -> None:
+        """
+        Raise an error if the token has been cancelled or timed out
+        """
+        error = self._reason()
+        if error is not None:
+            raise error
+
+
+_CURRENT_TOKEN = _contextvars.ContextVar('wrangles_cancellation_token', default=None)
+
+
+def current() -> _typing.Optional[CancellationToken]:
+    """
+    Get the cancellation token for the current recipe run, if any
+    """
+    return _CURRENT_TOKEN.get()
+
+
+def check() -> None:
+    """
+    Raise an error if the current recipe run has been cancelled or timed out.
+    Does nothing if not called from within a recipe run.
+    """
+    token = _CURRENT_TOKEN.get()
+    if token is not None:
+        token.check()
+
+
+@_contextlib.contextmanager
+def cancellable(timeout: float = None):
+    """
+    Run the enclosed code with a new cancellation token,
+    nested within the token of any current run
+
+    :param timeout: (Optional) Seconds until the token is cancelled automatically
+    :return: The cancellation token
+    """
+    token = CancellationToken(_CURRENT_TOKEN.get(), timeout)
+    reset = _CURRENT_TOKEN.set(token)
+    try:
+        yield token
+    finally:
+        _CURRENT_TOKEN.reset(reset)
+
+
+_EXECUTOR = None
+_LOCK = _threading.Lock()
+# Tasks submitted to the shared pool that haven't finished
+_pending = 0
+
+
+def _executor() -> _futures.ThreadPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = _futures.ThreadPoolExecutor(
+                    max_workers=_config.max_threads,
+                    thread_name_prefix='wrangles'
+                )
+    return _EXECUTOR
+
+
+def _task_done(_) -> None:
+    global _pending
+    with _LOCK:
+        _pending -= 1
+
+
+def submit(fn: _typing.Callable, *args, **kwargs) -> _futures.Future:
+    """
+    Run a function using the shared threads. The function runs
+    with a copy of the caller's context, including its cancellation token.
+
+    If every thread is busy, the function is run immediately
+    in the calling thread and a completed future is returned.
+
+    :param fn: Function to run
+    :return: Future for the result of the function
+    """
+    global _pending
+    context = _contextvars.copy_context()
+    executor = _executor()
+    with _LOCK:
+        available = _pending < _config.max_threads
+        if available:
+            _pending += 1
+
+    if available:
+        future = executor.submit(context.run, fn, *args, **kwargs)
+        future.add_done_callback(_task_done)
+        return future
+
+    future = _futures.Future()
+    try:
+        future.set_result(context.run(fn, *args, **kwargs))
+    except BaseException as e:
+        future.set_exception(e)
+    return future
+
+
+def map(fn: _typing.Callable, *iterables, max_workers: int = None) -> list:
+    """
+    Run a function for each set of arguments using the shared threads
+
+    >>> wrangles.scheduler.map(pow, [2, 3], [2, 2], max_workers=2)
+    [4, 9]
+
+    :param fn: Function to run
+    :param iterables: Arguments for the function, as for the builtin map
+    :param max_workers: (Optional) Maximum number to run at once for this call
+    :return: List of the results in the same order as the arguments. \
+        If any raise an error, no further calls are started and the \
+        first error in argument order is raised.
+    """
+    if max_workers == 1:
+        # Nothing to run alongside, so use the calling thread
+        results = []
+        for args in zip(*iterables):
+            check()
+            results.append(fn(*args))
+        return results
+
+    futures = []
+    running = _collections.deque()
+    failed = False
+    for args in zip(*iterables):
+        check()
+        while max_workers and len(running) >= max_workers:
+            done, _ = _futures.wait(running, return_when=_futures.FIRST_COMPLETED)
+            running = _collections.deque(f for f in running if f not in done)
+            failed = any(f.exception() is not None for f in done)
+            if failed:
+                break
+        if failed:
+            break
+
+        future = submit(fn, *args)
+        futures.append(future)
+        if future.done():
+            if future.exception() is not None:
+                break
+        else:
+            running.append(future)
+
+    return [future.result() for future in futures]
+
+
+def checked(fn: _typing.Callable) -> _typing.Callable:
+    """
+    Wrap a function so that it checks whether the recipe run
+    has been cancelled before each call. Useful for functions
+    called once per row or per batch.
+
+    :param fn: Function to wrap
+    :return: Wrapped function
+    """
+    token = _CURRENT_TOKEN.get()
+    if token is None:
+        return fn
+
+    def wrapper(*args, **kwargs):
+        token.check()
+        return fn(*args, **kwargs)
+    return wrapper
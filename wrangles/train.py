@@ -53,6 +53,7 @@ class train():
                             'json': training_data
                         }
                     )
+            _data.clear_cache(model_id)
         else:
             raise ValueError('Either a name or a model id must be provided')
 
@@ -124,6 +125,7 @@ class train():
                             'json': training_data
                         }
                     )
+            _data.clear_cache(model_id)
         else:
             raise ValueError('Either a name or a model id must be provided')
 
@@ -239,6 +241,7 @@ class train():
                             'json': data
                         }
                     )
+            _data.clear_cache(model_id)
         else:
             raise ValueError('Either a name or a model id must be provided')
 
@@ -274,6 +277,7 @@ class train():
             params={'model_id': model_id},
             headers={'Authorization': f'Bearer {_auth.get_access_token()}'}
         )
+        _data.clear_cache(model_id)
         if not response.ok:
             raise RuntimeError(f"Delete model failed. {response.status_code} : {response.text}")
         return response
@@ -320,6 +324,7 @@ class train():
                             'json': training_data
                         }
                     )
+            _data.clear_cache(model_id)
         else:
             raise ValueError('Either a name or a model id must be provided')
 
@@ -9,10 +9,18 @@ import requests as _requests
 from urllib3.util import Retry as _Retry
 import typing as _typing
 import json as _json
+import os as _os
+import collections as _collections
+import copy as _copy
+import collections.abc as _collections_abc
+import threading as _threading
+import weakref as _weakref
+import http.cookiejar as _cookiejar
 try:
     from yaml import CSafeLoader as _YamlLoader
 except ImportError:
     from yaml import SafeLoader as _YamlLoader
+from . import config as _config
 
 
 def wildcard_expansion_dict(all_columns: list, selected_columns: dict) -> list:
@@ -99,6 +107,73 @@ def wildcard_expansion_dict(all_columns: list, selected_columns: dict) -> list:
     return result_columns
 
 
+class FunctionSpec(_typing.NamedTuple):
+    """
+    The arguments accepted by a function
+    """
+    args: list
+    varkw: _typing.Optional[str]
+    arg_set: frozenset
+    required: tuple
+
+
+# Specs are cached for each function object. Weak references are used
+# so that custom functions defined for a single run can still be freed.
+_FUNCTION_SPECS = _weakref.WeakKeyDictionary()
+_FUNCTION_SPECS_LOCK = _threading.Lock()
+
+# Whether each (module, name) is a public function, module or class
+_STOCK_NAMES = {}
+
+def function_spec(func: _typing.Callable) -> FunctionSpec:
+    """
+    Get the arguments accepted by a function.
+    The result is cached so repeated calls are cheap.
+
+    :param func: Function to inspect
+    :return: FunctionSpec with the args, varkw, a set of the args and the required args
+    """
+    try:
+        spec = _FUNCTION_SPECS.get(func)
+    except TypeError:
+        # Not weak referenceable e.g. some builtins, so not cached
+        spec = None
+        cacheable = False
+    else:
+        cacheable = True
+    if spec is not None:
+        return spec
+
+    argspec = _inspect.getfullargspec(func)
+    spec = FunctionSpec(
+        args=list(argspec.args),
+        varkw=argspec.varkw,
+        arg_set=frozenset(argspec.args),
+        required=tuple(argspec.args[:len(argspec.args) - len(argspec.defaults or [])])
+    )
+    if cacheable:
+        with _FUNCTION_SPECS_LOCK:
+            _FUNCTION_SPECS[func] = spec
+    return spec
+
+
+def _is_stock_function(stock_functions: _types.ModuleType, name: str) -> bool:
+    """
+    Check whether a name is a public function, module or class of a
+    module. The result is cached, and is checked by name so that
+    lazily imported submodules are only imported if requested.
+    """
+    if stock_functions is None or name.startswith("_"):
+        return False
+    key = (stock_functions.__name__, name)
+    if key not in _STOCK_NAMES:
+        _STOCK_NAMES[key] = isinstance(
+            getattr(stock_functions, name, None),
+            (_types.FunctionType, _types.ModuleType, type)
+        )
+    return _STOCK_NAMES[key]
+
+
 def get_nested_function(
     fn_string: str,
     stock_functions: _types.ModuleType = None,
@@ -128,17 +203,14 @@ def get_nested_function(
             fn_list.append(default_stock_functions)
 
         if custom_functions:
-            obj = {
-                name: getattr(stock_functions, name)
-                for name in dir(stock_functions)
-                if isinstance(
-                    getattr(stock_functions, name),
-                    (_types.FunctionType, _types.ModuleType, type)
-                )
-                and not name.startswith("_")
-            }
-
-            obj = {**obj, **custom_functions}
+            # Custom functions take priority over stock
+            # functions with the same name
+            if fn_list[0] in custom_functions:
+                obj = custom_functions
+            elif _is_stock_function(stock_functions, fn_list[0]):
+                obj = stock_functions
+            else:
+                raise ValueError(f'Function {fn_string} not recognized')
         else:
             obj = stock_functions
 
@@ -167,13 +239,11 @@ def validate_function_args(
     :param args: Arguments provided to the function
     :param name: Name of the function
     """
-    argspec = _inspect.getfullargspec(func)
-
     missing_args = [
         x
         for x
-        in argspec.args[:len(argspec.args) - len(argspec.defaults or [])]
-        if x not in args.keys()
+        in function_spec(func).required
+        if x not in args
     ]
 
     if missing_args:
@@ -206,7 +276,7 @@ def add_special_parameters(
     if common_params is None:
         common_params = {}
     # Check args and pass on special parameters if requested
-    argspec = _inspect.getfullargspec(fn).args
+    argspec = function_spec(fn).arg_set
     if ("functions" not in params and "functions" in argspec):
         params['functions'] = functions
     if ("variables" not in params and "variables" in argspec):
@@ -438,6 +508,85 @@ def evaluate_conditional(statement, variables: dict = None):
         raise ValueError(f"An error occurred when trying to evaluate if condition '{statement}'") from None
     
 
+# Connection pools shared by every thread in the process,
+# one for requests with retries and one for those without
+_HTTP_ADAPTERS = {}
+_HTTP_LOCK = _threading.Lock()
+# Sessions hold cookies and other state that
+# isn't safe to share, so each thread has its own
+_HTTP_SESSIONS = _threading.local()
+
+
+def _http_adapter(retries: bool) -> _requests.adapters.HTTPAdapter:
+    adapter = _HTTP_ADAPTERS.get(retries)
+    if adapter is None:
+        with _HTTP_LOCK:
+            adapter = _HTTP_ADAPTERS.get(retries)
+            if adapter is None:
+                adapter = _requests.adapters.HTTPAdapter(
+                    # Number of hosts to keep connections to
+                    pool_connections=32,
+                    # Connections kept per host. One for each thread that may call it.
+                    pool_maxsize=_config.max_threads,
+                    max_retries=_Retry(
+                        total=3,
+                        backoff_factor=0.5,
+                        status_forcelist=[500, 502, 503, 504],
+                        allowed_methods={'GET', 'PUT', 'POST', 'PATCH', 'OPTIONS'},
+                    ) if retries else 0
+                )
+                _HTTP_ADAPTERS[retries] = adapter
+    return adapter
+
+
+def _reset_http() -> None:
+    """
+    Discard connections inherited from a parent process
+    """
+    global _HTTP_LOCK, _HTTP_SESSIONS
+    _HTTP_ADAPTERS.clear()
+    _HTTP_LOCK = _threading.Lock()
+    _HTTP_SESSIONS = _threading.local()
+
+
+if hasattr(_os, 'register_at_fork'):
+    _os.register_at_fork(after_in_child=_reset_http)
+
+
+def http_session(retries: bool = False) -> _requests.Session:
+    """
+    Get a session that reuses pooled, keep-alive connections
+    shared with the rest of the process. Each thread gets its
+    own session, and cookies are not kept between requests,
+    so it behaves the same as calling requests directly.
+
+    :param retries: Retry transient errors for https requests
+    :returns: requests.Session object. This must not be closed.
+    """
+    sessions = _HTTP_SESSIONS.__dict__.setdefault('sessions', {})
+    session = sessions.get(retries)
+    if session is None:
+        session = _requests.Session()
+        session.cookies.set_policy(_cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        session.mount('https://', _http_adapter(retries))
+        session.mount('http://', _http_adapter(False))
+        sessions[retries] = session
+    return session
+
+
+def http_request(method, url, **kwargs):
+    """
+    Make a request using pooled, keep-alive connections.
+    Use in place of requests.request, requests.post etc.
+
+    :param method: Type of request to make (GET, POST, PUT, DELETE, etc)
+    :param url: URL to make the request to
+    :param kwargs: Arguments to pass to requests.request
+    :returns: requests.Response object
+    """
+    return http_session().request(method, url, **kwargs)
+
+
 def request_retries(request_type, url, **kwargs):
     """
     Make a request to the backend with retries for transient errors
@@ -448,25 +597,7 @@ def request_retries(request_type, url, **kwargs):
     :returns: requests.Response object
     """
     _logging.debug(f": HTTP request :: method :: {request_type}, url :: {url}")
-    session = _requests.Session()
-    session.mount(
-        'https://',
-        _requests.adapters.HTTPAdapter(
-            max_retries=_Retry(
-                total=3,
-                backoff_factor=0.5,
-                status_forcelist=[500, 502, 503, 504],
-                allowed_methods={'GET', 'PUT', 'POST', 'PATCH', 'OPTIONS'},
-            )
-        )
-    )
-
-    try:
-        response = session.request(request_type, url, **kwargs)
-    finally:
-        session.close()
-
-    return response
+    return http_session(retries=True).request(request_type, url, **kwargs)
 
 
 def safe_str_transform(value, func, warnings={}, **kwargs):
@@ -516,6 +647,149 @@ def delayed_variable_interpretation(df, variables=None):
     return variables
 
 
+# Pattern matching ${<something here>}
+_VARIABLE_PATTERN = _re.compile(r"\$\{[^\}]+\}")
+
+
+class _EnvironmentVariables(_collections_abc.Mapping):
+    """
+    Read only view of the environment variables that only
+    reads a variable when it is looked up
+    """
+    def __getitem__(self, key):
+        return _os.environ[key]
+
+    def __contains__(self, key):
+        return isinstance(key, str) and key in _os.environ
+
+    def __iter__(self):
+        return iter(_os.environ)
+
+    def __len__(self):
+        return len(_os.environ)
+
+
+_ENVIRONMENT_VARIABLES = _EnvironmentVariables()
+
+
+def _parse_replacement(replacement_value: _typing.Any) -> _typing.Any:
+    """
+    Interpret a variable's value as JSON or YAML if it is a
+    string that looks like it, when it is the whole value
+    """
+    if not isinstance(replacement_value, str) or not replacement_value:
+        return replacement_value
+
+    # Test if replacement is JSON
+    if (
+        replacement_value[0] in ['{', '[']
+        and replacement_value[-1] in ['}', ']']
+    ):
+        try:
+            replacement_value = _json.loads(replacement_value)
+        except:
+            # Replacement wasn't JSON
+            pass
+
+    # Test if replacement is YAML
+    if (
+        isinstance(replacement_value, str) 
+        and ':' in replacement_value 
+        and '\n' in replacement_value
+    ):
+        try:
+            replacement_value = _yaml.load(replacement_value, Loader=_YamlLoader)
+        except:
+            # Replacement wasn't YAML
+            pass
+
+    return replacement_value
+
+
+def _substitute(
+    recipe_object: _typing.Any,
+    scope: _collections.ChainMap,
+    ignore_unknown_variables: bool
+) -> _typing.Any:
+    """
+    Recursive implementation of replace_templated_values
+
+    :param scope: Variables available at this level of the recipe. \
+        Nested variable definitions are added as a new child \
+        rather than copying all of the variables.
+    """
+    if isinstance(recipe_object, str):
+        # Most strings don't contain variables
+        if '${' not in recipe_object:
+            return recipe_object
+
+        # Whole string is a variable
+        if _VARIABLE_PATTERN.fullmatch(recipe_object):
+            try:
+                replacement_value = scope[recipe_object[2:-1]]
+            except KeyError:
+                if ignore_unknown_variables:
+                    return recipe_object
+                raise ValueError(f"Variable {recipe_object} was not found.") from None
+
+            replacement_value = _parse_replacement(replacement_value)
+
+            # If recipe_variables, no need for recursive replacement since these are the base variables
+            if recipe_object == '${recipe_variables}':
+                return replacement_value
+            return _substitute(replacement_value, scope, ignore_unknown_variables)
+
+        # Variable is found within the string e.g. file-${number}.csv
+        # Since this is within a string, the type is forced to also be a string
+        new_recipe_object = recipe_object
+        for var in _VARIABLE_PATTERN.findall(recipe_object):
+            try:
+                replacement_value = scope[var[2:-1]]
+            except KeyError:
+                if ignore_unknown_variables:
+                    replacement_value = var
+                else:
+                    raise ValueError(f"Variable {var} was not found.") from None
+
+            new_recipe_object = new_recipe_object.replace(var, str(replacement_value))
+        return new_recipe_object
+
+    if isinstance(recipe_object, list):
+        # Iterate over all of the elements in a list recursively
+        return [
+            _substitute(element, scope, ignore_unknown_variables)
+            for element in recipe_object
+        ]
+
+    if isinstance(recipe_object, dict):
+        # Nested variable definitions override the outer values from this level down
+        nested_variables = recipe_object.get('variables')
+        if isinstance(nested_variables, dict):
+            overrides = {
+                key: value
+                for key, value in nested_variables.items()
+                if key in scope
+                and not (isinstance(value, str) and value[2:-1] == key)
+            }
+            if overrides:
+                scope = scope.new_child(overrides)
+
+        # Iterate over all of the keys and value in a dictionary recursively
+        new_recipe_object = {}
+        for key, val in recipe_object.items():
+            ignore = ignore_unknown_variables or key == "matrix"
+            if key not in ["if", "python", "log"]:
+                new_recipe_object[_substitute(key, scope, ignore)] = _substitute(val, scope, ignore)
+            else:
+                # Not substituted, but still copied so the result never
+                # shares anything the engine may change with the original
+                new_recipe_object[key] = _copy.deepcopy(val) if isinstance(val, (dict, list)) else val
+        return new_recipe_object
+
+    # Otherwise, just return unchanged
+    return recipe_object
+
+
 def replace_templated_values(
     recipe_object: _typing.Any,
     variables: dict,
@@ -523,7 +797,7 @@ def replace_templated_values(
 ) -> _typing.Any:
     """
     Replace templated values of the format ${} within a recipe.
-    This function can be called recursively to iterate through an arbitrary number of levels within the main object
+    Environment variables are used for any not in variables.
     
     :param recipe_object: Recipe object that may contain values to replace
     :param variables: List of variables that contain any templated values to update
@@ -531,112 +805,86 @@ def replace_templated_values(
         down the stack. e.g. for matrix which uses runtime variables.
     :return: Updated Recipe object with variables replaced by their corresponding values
     """
+    return _substitute(
+        recipe_object,
+        _collections.ChainMap(variables, _ENVIRONMENT_VARIABLES),
+        ignore_unknown_variables
+    )
+
+
+def find_templated_variables(recipe_object: _typing.Any) -> set:
+    """
+    Find the names of all variables referenced as ${} within a recipe
+
+    :param recipe_object: Recipe object that may contain templated values
+    :return: Set of variable names
+    """
     if isinstance(recipe_object, list):
-        # Iterate over all of the elements in a list recursively
-        new_recipe_object = [
-            replace_templated_values(element, variables, ignore_unknown_variables)
-            for element in recipe_object
-        ]
-            
-    elif isinstance(recipe_object, dict):
-        # Use a temporary copy of variables to allow for nested variable definitions
-        temp_vars = variables.copy()
-        if 'variables' in recipe_object and isinstance(recipe_object['variables'], dict):
-            for key in recipe_object['variables'].keys():
-                if key in temp_vars and key != recipe_object['variables'][key][2:-1]:
-                    temp_vars[key] = recipe_object['variables'][key]
-        
-        # Iterate over all of the keys and value in a dictionary recursively
-        new_recipe_object = {
-            replace_templated_values(
-                key,
-                temp_vars,
-                any([ignore_unknown_variables, key in ["matrix"]])
-            )
-            :
-            (
-                replace_templated_values(
-                    val,
-                    temp_vars,
-                    any([ignore_unknown_variables, key in ["matrix"]])
-                )
-                if key not in ["if", "python", "log"]
-                else val
-            )
+        return set().union(*[find_templated_variables(x) for x in recipe_object])
+
+    if isinstance(recipe_object, dict):
+        return set().union(*[
+            find_templated_variables(key) | find_templated_variables(val)
             for key, val in recipe_object.items()
-        }
+        ])
 
-    elif isinstance(recipe_object, str):
-        # Search string for one or more variables to replace
-        new_recipe_object = recipe_object
+    if isinstance(recipe_object, str) and '${' in recipe_object:
+        return {var[2:-1] for var in _VARIABLE_PATTERN.findall(recipe_object)}
 
-        # Pattern matching ${<something here>}
-        variable_pattern = _re.compile(r"\$\{[^\}]+\}")
+    return set()
 
-        # Whole string is a variable
-        if variable_pattern.fullmatch(new_recipe_object):
-            try:
-                replacement_value = variables[new_recipe_object[2:-1]]
-            except:
-                if ignore_unknown_variables:
-                    return new_recipe_object
-                else:
-                    raise ValueError(f"Variable {new_recipe_object} was not found.")
-
-            # Test if replacement is JSON
-            if (
-                isinstance(replacement_value, str)
-                and len(replacement_value) > 0
-                and replacement_value[0] in ['{', '[']
-                and replacement_value[-1] in ['}', ']']
-            ):
-                try:
-                    replacement_value = _json.loads(replacement_value)
-                except:
-                    # Replacement wasn't JSON
-                    pass
-
-            # Test if replacement is YAML
-            if (
-                isinstance(replacement_value, str) 
-                and ':' in replacement_value 
-                and '\n' in replacement_value
-            ):
-                try:
-                    replacement_value = _yaml.load(replacement_value, Loader=_YamlLoader)
-                except:
-                    # Replacement wasn't YAML
-                    pass
 
-            # If recipe_variables, no need for recursive replacement since these are the base variables
-            if recipe_object == '${recipe_variables}':
-                new_recipe_object = replacement_value
-            else:
-                new_recipe_object = replace_templated_values(
-                    replacement_value,
-                    variables,
-                    ignore_unknown_variables
-                )
+_MISSING_VARIABLE = object()
+
+
+def _freeze(value: _typing.Any) -> _typing.Hashable:
+    """
+    Convert a variable value to a hashable equivalent for use in a cache key
+
+    :raises TypeError: If the value cannot be represented
+    """
+    if isinstance(value, dict):
+        return ('dict', tuple((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_freeze(v) for v in value))
+    # Include the type to avoid e.g. True and 1 being treated as equal
+    hash(value)
+    return (type(value).__name__, value)
 
-        # Variable is found within the string e.g. file-${number}.csv
-        # Since this is within a string, the type is forced to also be a string
-        elif variable_pattern.search(new_recipe_object):
-            for var in variable_pattern.findall(new_recipe_object):
-                try:
-                    replacement_value = variables[var[2:-1]]
-                except:
-                    if ignore_unknown_variables:
-                        replacement_value = var
-                    else:
-                        raise ValueError(f"Variable {var} was not found.")
-
-                new_recipe_object = new_recipe_object.replace(var, str(replacement_value))
-
-    # Otherwise, just return unchanged    
-    else:
-        new_recipe_object = recipe_object
 
-    return new_recipe_object
+def variables_cache_key(references: set, variables: dict) -> _typing.Optional[tuple]:
+    """
+    Create a key that identifies the values of the variables referenced by a recipe.
+    Variables referenced by other variables are followed so that changes to them are also detected.
+
+    :param references: Names of the variables referenced by the recipe
+    :param variables: Dictionary of variables
+    :return: Hashable key, or None if any referenced value cannot be hashed
+    """
+    names = set(references)
+    if 'recipe_variables' in names:
+        # The whole set of variables is referenced
+        names.update(variables.keys())
+
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name == 'recipe_variables' or name not in variables:
+            continue
+        for ref in find_templated_variables(variables[name]) - names:
+            names.add(ref)
+            pending.append(ref)
+
+    # recipe_variables is derived from the others
+    names.discard('recipe_variables')
+
+    try:
+        return tuple(
+            (name, _freeze(variables.get(name, _os.environ.get(name, _MISSING_VARIABLE))))
+            for name in sorted(names)
+        )
+    except TypeError:
+        return None
 
         
 class LazyLoader:
@@ -0,0 +1,589 @@
+"""
+Evaluate SQL WHERE criteria directly against a dataframe
+
+Supports the common subset of the SQLite WHERE syntax - comparisons,
+AND/OR/NOT, IN, BETWEEN, LIKE, IS NULL and parameters - and mirrors how
+SQLite would compare the values once the dataframe is written to a table.
+Anything outside that subset returns None so that the caller can fall
+back to evaluating the criteria with SQLite.
+"""
+import re as _re
+import typing as _typing
+import numpy as _np
+import pandas as _pd
+
+
+class _Unsupported(Exception):
+    """
+    Raised when criteria can't be evaluated natively
+    """
+
+
+_TOKEN_PATTERN = _re.compile(r"""
+    (?P<space>\s+)
+    |(?P<string>'(?:[^']|'')*')
+    |(?P<quoted>"(?:[^"]|"")*"|\[[^\]]*\]|`(?:[^`]|``)*`)
+    |(?P<number>(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?(?![A-Za-z_]))
+    |(?P<param>\?(?!\d)|[:@$][A-Za-z_][A-Za-z0-9_]*)
+    |(?P<operator><=|>=|<>|!=|==|=|<|>|\(|\)|,|-|\+)
+    |(?P<word>[A-Za-z_][A-Za-z0-9_$]*)
+""", _re.VERBOSE)
+
+_KEYWORDS = {
+    'AND', 'OR', 'NOT', 'IN', 'BETWEEN', 'LIKE', 'IS', 'NULL', 'TRUE', 'FALSE',
+    'ESCAPE', 'GLOB', 'REGEXP', 'MATCH', 'COLLATE', 'CASE', 'WHEN', 'THEN',
+    'ELSE', 'END', 'EXISTS', 'SELECT', 'CAST', 'ISNULL', 'NOTNULL'
+}
+
+# SQLite converts text to a number if it is a well formed number
+_NUMERIC_TEXT = _re.compile(r"[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?")
+
+# Integers beyond this can't be compared exactly as floats
+_MAX_EXACT_INT = 2 ** 53
+
+
+def _tokenize(where: str) -> list:
+    tokens = []
+    position = 0
+    while position < len(where):
+        match = _TOKEN_PATTERN.match(where, position)
+        if not match:
+            raise _Unsupported(where[position:])
+        position = match.end()
+        kind = match.lastgroup
+        if kind == 'space':
+            continue
+        value = match.group()
+        if kind == 'word' and value.upper() in _KEYWORDS:
+            kind, value = 'keyword', value.upper()
+        tokens.append((kind, value))
+    return tokens
+
+
+class _Parser:
+    """
+    Recursive descent parser producing a tree of tuples
+    """
+    def __init__(self, tokens: list, params):
+        self.tokens = tokens
+        self.position = 0
+        self.params = params
+        self.positional_count = 0
+
+    def peek(self, offset: int = 0):
+        if self.position + offset < len(self.tokens):
+            return self.tokens[self.position + offset]
+        return (None, None)
+
+    def next(self):
+        token = self.peek()
+        if token[0] is None:
+            raise _Unsupported('Unexpected end of criteria')
+        self.position += 1
+        return token
+
+    def accept(self, kind: str, value: str = None) -> bool:
+        token = self.peek()
+        if token[0] == kind and (value is None or token[1] == value):
+            self.position += 1
+            return True
+        return False
+
+    def expect(self, kind: str, value: str = None):
+        if not self.accept(kind, value):
+            raise _Unsupported(f'Expected {value or kind}')
+
+    def parse(self):
+        node = self.parse_or()
+        if self.peek()[0] is not None:
+            raise _Unsupported('Unexpected trailing criteria')
+        if isinstance(self.params, (list, tuple)) and self.positional_count != len(self.params):
+            raise _Unsupported('Incorrect number of parameters')
+        return node
+
+    def parse_or(self):
+        node = self.parse_and()
+        while self.accept('keyword', 'OR'):
+            node = ('or', node, self.parse_and())
+        return node
+
+    def parse_and(self):
+        node = self.parse_not()
+        while self.accept('keyword', 'AND'):
+            node = ('and', node, self.parse_not())
+        return node
+
+    def parse_not(self):
+        if self.accept('keyword', 'NOT'):
+            return ('not', self.parse_not())
+        return self.parse_predicate()
+
+    def parse_predicate(self):
+        if self.accept('operator', '('):
+            node = self.parse_or()
+            self.expect('operator', ')')
+            if self.peek()[1] in (
+                '=', '==', '!=', '<>', '<', '<=', '>', '>=',
+                'IN', 'NOT', 'BETWEEN', 'LIKE', 'IS'
+            ):
+                raise _Unsupported('Parenthesized operands are not supported')
+            return node
+
+        left = self.parse_operand()
+        kind, value = self.peek()
+
+        if kind == 'operator' and value in ('=', '==', '!=', '<>', '<', '<=', '>', '>='):
+            self.next()
+            op = {'==': '=', '<>': '!='}.get(value, value)
+            return ('cmp', op, left, self.parse_operand())
+
+        negated = self.accept('keyword', 'NOT')
+        kind, value = self.peek()
+
+        if (kind, value) == ('keyword', 'IN'):
+            self.next()
+            self.expect('operator', '(')
+            values = [self.parse_operand()]
+            while self.accept('operator', ','):
+                values.append(self.parse_operand())
+            self.expect('operator', ')')
+            node = ('in', left, values)
+
+        elif (kind, value) == ('keyword', 'BETWEEN'):
+            self.next()
+            low = self.parse_operand()
+            self.expect('keyword', 'AND')
+            high = self.parse_operand()
+            node = ('and', ('cmp', '>=', left, low), ('cmp', '<=', left, high))
+
+        elif (kind, value) == ('keyword', 'LIKE'):
+            self.next()
+            node = ('like', left, self.parse_operand())
+            if self.peek() == ('keyword', 'ESCAPE'):
+                raise _Unsupported('LIKE ESCAPE is not supported')
+
+        elif (kind, value) == ('keyword', 'IS') and not negated:
+            self.next()
+            is_not = self.accept('keyword', 'NOT')
+            self.expect('keyword', 'NULL')
+            node = ('isnull', left)
+            return ('not', node) if is_not else node
+
+        else:
+            raise _Unsupported(f'Unsupported criteria near {value}')
+
+        return ('not', node) if negated else node
+
+    def parse_operand(self):
+        kind, value = self.next()
+
+        if kind == 'operator' and value in ('-', '+'):
+            number_kind, number = self.next()
+            if number_kind != 'number':
+                raise _Unsupported('Unary operators are only supported for numbers')
+            literal = self._number(number)
+            return ('lit', -literal if value == '-' else literal)
+
+        if kind == 'number':
+            return ('lit', self._number(value))
+
+        if kind == 'string':
+            return ('lit', value[1:-1].replace("''", "'"))
+
+        if kind == 'quoted':
+            if value[0] == '[':
+                return ('col', value[1:-1])
+            return ('col', value[1:-1].replace(value[0] * 2, value[0]))
+
+        if kind == 'word':
+            if self.peek() == ('operator', '('):
+                raise _Unsupported('Functions are not supported')
+            return ('col', value)
+
+        if kind == 'keyword' and value in ('NULL', 'TRUE', 'FALSE'):
+            return ('lit', {'NULL': None, 'TRUE': 1, 'FALSE': 0}[value])
+
+        if kind == 'param':
+            return ('lit', self._param(value))
+
+        raise _Unsupported(f'Unsupported operand {value}')
+
+    @staticmethod
+    def _number(value: str):
+        if _re.fullmatch(r"\d+", value):
+            number = int(value)
+            if number > _MAX_EXACT_INT:
+                raise _Unsupported('Integer is too large')
+            return number
+        return float(value)
+
+    def _param(self, placeholder: str):
+        if placeholder == '?':
+            if not isinstance(self.params, (list, tuple)):
+                raise _Unsupported('Positional parameters require a list')
+            if self.positional_count >= len(self.params):
+                raise _Unsupported('Incorrect number of parameters')
+            value = self.params[self.positional_count]
+            self.positional_count += 1
+        else:
+            if not isinstance(self.params, dict) or placeholder[1:] not in self.params:
+                raise _Unsupported('Named parameter not provided')
+            value = self.params[placeholder[1:]]
+
+        if isinstance(value, bool):
+            return int(value)
+        if value is None or isinstance(value, (str, int, float)):
+            if isinstance(value, int) and abs(value) > _MAX_EXACT_INT:
+                raise _Unsupported('Integer is too large')
+            return value
+        raise _Unsupported('Unsupported parameter type')
+
+
+class _Column:
+    """
+    Values of a column as SQLite would see them once written with to_sql.
+    kind is 'text' or 'num'.
+    """
+    def __init__(self, kind: str, values: _np.ndarray, null: _np.ndarray):
+        self.kind = kind
+        self.values = values
+        self.null = null
+
+
+def _load_column(series: _pd.Series) -> _Column:
+    dtype = series.dtype
+
+    if _pd.api.types.is_bool_dtype(dtype) or (
+        _pd.api.types.is_numeric_dtype(dtype) and
+        not _pd.api.types.is_complex_dtype(dtype)
+    ):
+        values = series.to_numpy(dtype=float, na_value=_np.nan)
+        if (
+            _pd.api.types.is_integer_dtype(dtype) and
+            len(values) and
+            _np.nanmax(_np.abs(values), initial=0) > _MAX_EXACT_INT
+        ):
+            raise _Unsupported('Integers are too large')
+        return _Column('num', values, _np.isnan(values))
+
+    if not (
+        _pd.api.types.is_object_dtype(dtype) or
+        _pd.api.types.is_string_dtype(dtype)
+    ):
+        # e.g. datetimes and categoricals
+        raise _Unsupported(f'Unsupported dtype {dtype}')
+
+    null = series.isna().to_numpy()
+    inferred = _pd.api.types.infer_dtype(series, skipna=True)
+
+    if inferred in ('integer', 'floating', 'boolean'):
+        values = _np.full(len(series), _np.nan)
+        for i, value in enumerate(series.to_numpy(dtype=object)):
+            if null[i]:
+                continue
+            if isinstance(value, (int, _np.integer)) and abs(int(value)) > _MAX_EXACT_INT:
+                raise _Unsupported('Integers are too large')
+            values[i] = float(value)
+        return _Column('num', values, null)
+
+    values = series.to_numpy(dtype=object)
+    if inferred in ('string', 'empty'):
+        return _Column('text', values, null)
+
+    if inferred in ('mixed-integer', 'mixed'):
+        # Integers are stored as text within a text column
+        values = values.copy()
+        for i, value in enumerate(values):
+            if null[i] or isinstance(value, str):
+                continue
+            if isinstance(value, (bool, _np.bool_)):
+                values[i] = str(int(value))
+            elif isinstance(value, (int, _np.integer)):
+                values[i] = str(int(value))
+            else:
+                raise _Unsupported('Mixed data types are not supported')
+        return _Column('text', values, null)
+
+    raise _Unsupported(f'Unsupported data {inferred}')
+
+
+def _as_text(value) -> str:
+    """
+    Convert a literal to text as SQLite would when comparing with a text column
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, int):
+        return str(value)
+    text = repr(float(value))
+    if 'e' in text or 'n' in text or len(text.replace('-', '').replace('.', '').lstrip('0')) > 15:
+        raise _Unsupported('Float formatting may differ from SQLite')
+    return text
+
+
+def _as_number(value) -> float:
+    """
+    Convert a literal to a number as SQLite would when comparing with a numeric column
+    """
+    if isinstance(value, str):
+        if not _NUMERIC_TEXT.fullmatch(value):
+            raise _Unsupported('Comparing text to a numeric column')
+        value = int(value) if _re.fullmatch(r"[+-]?\d+", value) else float(value)
+        if isinstance(value, int) and abs(value) > _MAX_EXACT_INT:
+            raise _Unsupported('Integer is too large')
+    return float(value)
+
+
+_OPERATORS = {
+    '=': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+}
+
+_SWAPPED = {'=': '=', '!=': '!=', '<': '>', '<=': '>=', '>': '<', '>=': '<='}
+
+
+class _Evaluator:
+    """
+    Evaluate a parsed tree using SQL three-valued logic.
+    Each node evaluates to a pair of masks (true, false)
+    where rows in neither are NULL.
+    """
+    def __init__(self, df: _pd.DataFrame):
+        self.df = df
+        self.size = len(df)
+        self.columns = {}
+        self.lower_names = {}
+        for name in df.columns:
+            self.lower_names.setdefault(str(name).lower(), []).append(name)
+
+    def column(self, name: str) -> _Column:
+        matches = self.lower_names.get(name.lower(), [])
+        if len(matches) != 1:
+            raise _Unsupported(f'Column {name} not found')
+        name = matches[0]
+        if name not in self.columns:
+            self.columns[name] = _load_column(self.df[name])
+        return self.columns[name]
+
+    def constant(self, value: _typing.Optional[bool]):
+        if value is None:
+            return _np.zeros(self.size, bool), _np.zeros(self.size, bool)
+        return _np.full(self.size, value), _np.full(self.size, not value)
+
+    def evaluate(self, node):
+        kind = node[0]
+        if kind == 'or':
+            a_true, a_false = self.evaluate(node[1])
+            b_true, b_false = self.evaluate(node[2])
+            return a_true | b_true, a_false & b_false
+        if kind == 'and':
+            a_true, a_false = self.evaluate(node[1])
+            b_true, b_false = self.evaluate(node[2])
+            return a_true & b_true, a_false | b_false
+        if kind == 'not':
+            true, false = self.evaluate(node[1])
+            return false, true
+        return getattr(self, '_' + kind)(*node[1:])
+
+    def _isnull(self, operand):
+        if operand[0] == 'lit':
+            return self.constant(operand[1] is None)
+        null = self.column(operand[1]).null
+        return null.copy(), ~null
+
+    def _cmp(self, op, left, right):
+        if left[0] == 'lit' and right[0] == 'col':
+            op, left, right = _SWAPPED[op], right, left
+
+        if left[0] == 'lit':
+            a, b = left[1], right[1]
+            if a is None or b is None:
+                return self.constant(None)
+            if isinstance(a, str) != isinstance(b, str):
+                raise _Unsupported('Comparing text to a number')
+            return self.constant(bool(_OPERATORS[op](a, b)))
+
+        column = self.column(left[1])
+
+        if right[0] == 'col':
+            other = self.column(right[1])
+            if column.kind != other.kind:
+                raise _Unsupported('Comparing columns of different types')
+            valid = ~(column.null | other.null)
+            result = _np.zeros(self.size, bool)
+            result[valid] = _np.asarray(
+                _OPERATORS[op](column.values[valid], other.values[valid]),
+                dtype=bool
+            )
+            return result, valid & ~result
+
+        if right[1] is None:
+            return self.constant(None)
+
+        value = _as_text(right[1]) if column.kind == 'text' else _as_number(right[1])
+        valid = ~column.null
+        result = _np.zeros(self.size, bool)
+        result[valid] = _np.asarray(
+            _OPERATORS[op](column.values[valid], value),
+            dtype=bool
+        )
+        return result, valid & ~result
+
+    def _in(self, operand, values):
+        if operand[0] != 'col' or any(value[0] != 'lit' for value in values):
+            raise _Unsupported('IN is only supported for a column and a list of values')
+
+        column = self.column(operand[1])
+        convert = _as_text if column.kind == 'text' else _as_number
+        has_null = any(value[1] is None for value in values)
+        options = [convert(value[1]) for value in values if value[1] is not None]
+
+        valid = ~column.null
+        result = _np.zeros(self.size, bool)
+        result[valid] = _pd.Series(column.values[valid]).isin(options).to_numpy()
+        if has_null:
+            return result, _np.zeros(self.size, bool)
+        return result, valid & ~result
+
+    def _like(self, operand, pattern):
+        if operand[0] != 'col' or pattern[0] != 'lit':
+            raise _Unsupported('LIKE is only supported for a column and a pattern')
+        if pattern[1] is None:
+            return self.constant(None)
+        if not isinstance(pattern[1], str):
+            raise _Unsupported('LIKE pattern must be text')
+
+        column = self.column(operand[1])
+        if column.kind != 'text':
+            raise _Unsupported('LIKE is only supported for text columns')
+
+        # % and _ are wildcards. SQLite is only case insensitive for ASCII characters
+        regex = _re.compile(
+            ''.join(
+                '.*' if char == '%' else '.' if char == '_' else _re.escape(char)
+                for char in pattern[1]
+            ),
+            _re.IGNORECASE | _re.ASCII | _re.DOTALL
+        )
+        valid = ~column.null
+        result = _np.zeros(self.size, bool)
+        result[valid] = [
+            regex.fullmatch(value) is not None
+            for value in column.values[valid]
+        ]
+        return result, valid & ~result
+
+
+def mask(
+    df: _pd.DataFrame,
+    where: str,
+    params: _typing.Union[list, dict] = None
+) -> _typing.Optional[_np.ndarray]:
+    """
+    Evaluate SQL WHERE criteria against a dataframe
+
+    :param df: Dataframe to evaluate the criteria against
+    :param where: SQL WHERE criteria e.g. column1 = 123 OR column2 LIKE 'abc%'
+    :param params: (Optional) Parameters referenced by the criteria as ? or :name
+    :return: Boolean numpy array of the rows matching the criteria, \
+        or None if the criteria is not supported and should be evaluated using SQLite
+    """
+    if not isinstance(where, str) or not df.columns.is_unique:
+        return None
+
+    try:
+        tree = _Parser(_tokenize(where), params).parse()
+        return _Evaluator(df).evaluate(tree)[0]
+    except _Unsupported:
+        return None
+
+
+def columns(
+    where: str,
+    params: _typing.Union[list, dict] = None
+) -> _typing.Optional[set]:
+    """
+    Get the names of the columns referenced by SQL WHERE criteria
+
+    :param where: SQL WHERE criteria e.g. column1 = 123 OR column2 LIKE 'abc%'
+    :param params: (Optional) Parameters referenced by the criteria as ? or :name
+    :return: Set of column names, or None if the criteria is not supported
+    """
+    if not isinstance(where, str):
+        return None
+
+    try:
+        tree = _Parser(_tokenize(where), params).parse()
+    except _Unsupported:
+        return None
+
+    names = set()
+    nodes = [tree]
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, tuple) and node and node[0] == 'col':
+            names.add(node[1])
+        elif isinstance(node, tuple) and node and node[0] == 'lit':
+            continue
+        elif isinstance(node, (tuple, list)):
+            nodes.extend(x for x in node if isinstance(x, (tuple, list)))
+    return names
+
+
+def _filter_value(value) -> bool:
+    """
+    Whether a literal can be used in a filter pushed down to a source.
+    Empty strings and NULL are excluded as empty values are read as ''.
+    """
+    return isinstance(value, (str, int, float)) and not isinstance(value, bool) and value != ''
+
+
+def row_filters(
+    where: str,
+    params: _typing.Union[list, dict] = None
+) -> list:
+    """
+    Get simple filters implied by SQL WHERE criteria that a data source
+    can apply before the data is read. Only equality and IN conditions
+    that must be true for a row to match are included, so rows
+    matching the filters are a superset of rows matching the criteria.
+
+    >>> row_filters("a = 1 AND b IN ('x', 'y') AND c > 2")
+    [('a', 'in', [1]), ('b', 'in', ['x', 'y'])]
+
+    :param where: SQL WHERE criteria
+    :param params: (Optional) Parameters referenced by the criteria as ? or :name
+    :return: List of (column, 'in', values)
+    """
+    if not isinstance(where, str):
+        return []
+
+    try:
+        tree = _Parser(_tokenize(where), params).parse()
+    except _Unsupported:
+        return []
+
+    filters = []
+    nodes = [tree]
+    while nodes:
+        node = nodes.pop(0)
+        if node[0] == 'and':
+            nodes[:0] = [node[1], node[2]]
+        elif node[0] == 'cmp' and node[1] == '=':
+            left, right = node[2], node[3]
+            if left[0] == 'lit':
+                left, right = right, left
+            if left[0] == 'col' and right[0] == 'lit' and _filter_value(right[1]):
+                filters.append((left[1], 'in', [right[1]]))
+        elif node[0] == 'in':
+            operand, values = node[1], node[2]
+            if (
+                operand[0] == 'col' and
+                all(x[0] == 'lit' and _filter_value(x[1]) for x in values)
+            ):
+                filters.append((operand[1], 'in', [x[1] for x in values]))
+    return filters
@@ -0,0 +1,277 @@
+"""
+Run recipes from a long running worker process
+
+Starting a new process for each recipe repeats the import of wrangles,
+authentication and fetching of models. A worker keeps these warm,
+along with compiled recipes and connections, and runs recipes sent
+to it over HTTP on a TCP port or a Unix socket.
+
+>>> wrangles.worker.serve(port=8080)
+
+or from the command line
+
+>>> wrangles.worker --port 8080 --functions custom_functions.py
+
+Endpoints:
+- GET /health - Check the worker is running
+- POST /run - Run a recipe. The body is JSON with the keys:
+    - recipe: YAML recipe, path to a YAML file or model ID
+    - variables: (Optional) Dictionary of variables
+    - data: (Optional) Input data as {"columns": [...], "data": [[...], ...]}
+    - timeout: (Optional) Timeout for the recipe in seconds
+
+  The response is the resulting data in the same format as the input data.
+
+Recipes can run any code, including custom functions and the python
+wrangle, so the worker must only be reachable by trusted clients.
+By default it only listens on localhost.
+"""
+import collections as _collections
+import http.server as _http_server
+import json as _json
+import logging as _logging
+import os as _os
+import socketserver as _socketserver
+import threading as _threading
+import time as _time
+import types as _types
+from typing import Union as _Union
+
+import pandas as _pd
+
+from . import auth as _auth
+from . import config as _config
+from . import recipe as _recipe
+
+
+class WorkerBusyError(RuntimeError):
+    """
+    Raised when all of the worker's job slots are in use
+    """
+    pass
+
+
+class InvalidJobError(ValueError):
+    """
+    Raised when a request to run a recipe is not valid
+    """
+    pass
+
+
+class Worker:
+    """
+    Runs recipes, keeping compiled recipes warm between runs
+    """
+    def __init__(
+        self,
+        functions: _Union[_types.FunctionType, list, dict, str] = None,
+        max_jobs: int = None,
+        queue_seconds: float = 30,
+        cache_size: int = 64,
+        cache_seconds: float = 300
+    ):
+        """
+        :param functions: (Optional) Custom functions available to every recipe. \
+            A function, list of functions, dict of named functions or file path.
+        :param max_jobs: (Optional) Maximum number of recipes to run at once. Default the number of CPUs.
+        :param queue_seconds: Seconds a request waits for a free job slot before being rejected
+        :param cache_size: Number of compiled recipes to keep
+        :param cache_seconds: Seconds to keep a compiled recipe before compiling it again, \
+            e.g. to pick up new versions of a model
+        """
+        self.functions = _recipe._load_functions(functions)
+        self.max_jobs = max_jobs or _os.cpu_count() or 4
+        self.queue_seconds = queue_seconds
+        self.cache_size = cache_size
+        self.cache_seconds = cache_seconds
+        self._slots = _threading.BoundedSemaphore(self.max_jobs)
+        self._cache = _collections.OrderedDict()
+        self._lock = _threading.Lock()
+        self.jobs_run = 0
+
+    def warm(self) -> None:
+        """
+        Do the work shared by all recipes ahead of the first request.
+        The recipe engine is already imported, so this authenticates
+        if credentials are set.
+        """
+        if (_config.api_user and _config.api_password) or _auth.refresh_token:
+            try:
+                _auth.get_access_token()
+            except Exception as e:
+                _logging.warning(f": Worker :: Unable to authenticate :: {e}")
+
+    def compiled(self, recipe: _Union[str, dict]) -> _recipe.CompiledRecipe:
+        """
+        Get a compiled recipe, reusing one compiled recently
+
+        :param recipe: YAML recipe, path to a YAML file, model ID or recipe object
+        :return: CompiledRecipe
+        """
+        key = recipe if isinstance(recipe, str) else _json.dumps(recipe, sort_keys=True, default=str)
+        now = _time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and now - cached[0] < self.cache_seconds:
+                self._cache.move_to_end(key)
+                return cached[1]
+
+        compiled = _recipe.compile(recipe, self.functions)
+        with self._lock:
+            self._cache[key] = (now, compiled)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return compiled
+
+    def run(self, job: dict) -> _pd.DataFrame:
+        """
+        Run a recipe
+
+        :param job: Dictionary with the recipe and optional variables, data and timeout
+        :return: The result dataframe
+        """
+        if not isinstance(job, dict) or not job.get('recipe'):
+            raise InvalidJobError('A recipe is required')
+
+        data = job.get('data')
+        dataframe = None
+        if data is not None:
+            if not isinstance(data, dict) or 'columns' not in data or 'data' not in data:
+                raise InvalidJobError('data must be in the format {"columns": [...], "data": [[...], ...]}')
+            dataframe = _pd.DataFrame(data['data'], columns=data['columns'])
+
+        if not self._slots.acquire(timeout=self.queue_seconds):
+            raise WorkerBusyError(f'All {self.max_jobs} job slots are in use')
+        try:
+            df = self.compiled(job['recipe']).run(
+                dataframe=dataframe,
+                variables=job.get('variables'),
+                timeout=job.get('timeout')
+            )
+        finally:
+            self._slots.release()
+            with self._lock:
+                self.jobs_run += 1
+
+        if not isinstance(df, _pd.DataFrame):
+            df = _pd.DataFrame()
+        return df
+
+
+class _Handler(_http_server.BaseHTTPRequestHandler):
+    """
+    HTTP requests for a worker
+    """
+    worker: Worker = None
+
+    def _respond(self, status: int, body: str) -> None:
+        payload = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        if status == 503:
+            self.send_header('Retry-After', '1')
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _error(self, status: int, error: Exception) -> None:
+        self._respond(status, _json.dumps({'error': str(error), 'type': type(error).__name__}))
+
+    def do_GET(self):
+        if self.path.rstrip('/') != '/health':
+            return self._error(404, ValueError(f'Unknown path {self.path}'))
+        self._respond(200, _json.dumps({
+            'status': 'ok',
+            'max_jobs': self.worker.max_jobs,
+            'jobs_run': self.worker.jobs_run
+        }))
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/run':
+            return self._error(404, ValueError(f'Unknown path {self.path}'))
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            job = _json.loads(self.rfile.read(length) or b'{}')
+        except ValueError as e:
+            return self._error(400, e)
+
+        try:
+            df = self.worker.run(job)
+        except WorkerBusyError as e:
+            return self._error(503, e)
+        except InvalidJobError as e:
+            return self._error(400, e)
+        except TimeoutError as e:
+            return self._error(504, e)
+        except Exception as e:
+            _logging.exception(': Worker :: Recipe failed')
+            return self._error(500, e)
+
+        self._respond(200, df.to_json(orient='split', index=False, date_format='iso'))
+
+    def address_string(self):
+        # Unix sockets don't have a client address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format, *args):
+        _logging.info(f": Worker :: {self.address_string()} :: {format % args}")
+
+
+if hasattr(_socketserver, 'UnixStreamServer'):
+    # Unix sockets aren't available on Windows
+    class _ThreadingUnixHTTPServer(_socketserver.ThreadingMixIn, _socketserver.UnixStreamServer):
+        daemon_threads = True
+
+
+def server(
+    worker: Worker = None,
+    host: str = '127.0.0.1',
+    port: int = 8080,
+    socket_path: str = None
+) -> _socketserver.BaseServer:
+    """
+    Create a server for a worker without starting it
+
+    :param worker: (Optional) Worker to serve. Default a new Worker.
+    :param host: Host to listen on. Default localhost only.
+    :param port: Port to listen on. Use 0 to pick a free port.
+    :param socket_path: (Optional) Listen on this Unix socket instead of a TCP port
+    :return: Server. Call serve_forever() to start and shutdown() to stop.
+    """
+    handler = type('Handler', (_Handler,), {'worker': worker or Worker()})
+    if socket_path:
+        if not hasattr(_socketserver, 'UnixStreamServer'):
+            raise NotImplementedError('Unix sockets are not supported on this platform. Use a TCP port instead.')
+        if _os.path.exists(socket_path):
+            _os.remove(socket_path)
+        return _ThreadingUnixHTTPServer(socket_path, handler)
+    return _http_server.ThreadingHTTPServer((host, port), handler)
+
+
+def serve(
+    host: str = '127.0.0.1',
+    port: int = 8080,
+    socket_path: str = None,
+    functions: _Union[_types.FunctionType, list, dict, str] = None,
+    max_jobs: int = None
+) -> None:
+    """
+    Run a worker until interrupted
+
+    >>> wrangles.worker.serve(port=8080)
+
+    :param host: Host to listen on. Default localhost only.
+    :param port: Port to listen on
+    :param socket_path: (Optional) Listen on this Unix socket instead of a TCP port
+    :param functions: (Optional) Custom functions available to every recipe
+    :param max_jobs: (Optional) Maximum number of recipes to run at once. Default the number of CPUs.
+    """
+    worker = Worker(functions, max_jobs)
+    worker.warm()
+    with server(worker, host, port, socket_path) as httpd:
+        _logging.info(f": Worker :: Listening on {socket_path or f'{host}:{port}'}")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass